@@ -3,12 +3,180 @@ from copy import deepcopy
 from InputData import InputData
 from OutputData import Solution
 
+class RouteSchedule:
+    ''' Cached schedule of one route: arrival and departure times of every position and the forward time slack
+        The positions are padded with the depot, position k is the arrival at route[k] (k = len(route) is the return to the depot)
+        and departure k is the departure from the node before position k (departure 0 is the start at the depot)
+        A delay of the arrival at position k is feasible as long as it does not exceed the slack up to the next main task start or the maxRouteDuration
+    '''
+
+    def __init__(self, route:list[int], distances, serviceTimes:list[int], startTimes:list[int], maxRouteDuration:int):
+        self.Route = route
+        self._distances = distances
+        self._serviceTimes = serviceTimes
+
+        n = len(route)
+        arrivals = [0] * (n + 1)
+        departures = [0] * (n + 1)
+        checkpoints = [n] * (n + 1)
+        slacks = [0] * (n + 1)
+
+        # Forward pass: the time is reset to the start time at every main task
+        time = 0
+        previous_task = 0
+        for k, task in enumerate(route):
+            time += distances[previous_task][task]
+            arrivals[k] = time
+            if task > 1000:
+                time = max(time, startTimes[task])
+            time += serviceTimes[task]
+            departures[k + 1] = time
+            previous_task = task
+        arrivals[n] = time + distances[previous_task][0]
+
+        # Backward pass: slack and index of the next checkpoint (main task or return to the depot)
+        slack = maxRouteDuration - arrivals[n]
+        checkpoint = n
+        for k in range(n - 1, -1, -1):
+            if route[k] > 1000:
+                slack = startTimes[route[k]] - arrivals[k]
+                checkpoint = k
+            slacks[k] = slack
+            checkpoints[k] = checkpoint
+        slacks[n] = maxRouteDuration - arrivals[n]
+
+        self._arrivals = arrivals
+        self._departures = departures
+        self._checkpoints = checkpoints
+        self._slacks = slacks
+        self._feasible = min(slacks) >= 0
+
+    @property
+    def Feasible(self) -> bool:
+        return self._feasible
+
+    @property
+    def Arrivals(self) -> list[int]:
+        return self._arrivals
+
+    @property
+    def Slacks(self) -> list[int]:
+        return self._slacks
+
+    def _Node(self, k:int) -> int:
+        ''' Returns the task at position k, the depot before the first and after the last task'''
+        return self.Route[k] if 0 <= k < len(self.Route) else 0
+
+    def InsertFeasible(self, index:int, task:int) -> bool:
+        ''' Checks in O(1) if the optional task can be inserted at index'''
+        distances = self._distances
+        predecessor, successor = self._Node(index - 1), self._Node(index)
+
+        delay = (self._departures[index] + distances[predecessor][task] + self._serviceTimes[task]
+                 + distances[task][successor] - self._arrivals[index])
+
+        return delay <= self._slacks[index]
+
+    def ReplaceFeasible(self, index:int, task:int) -> bool:
+        ''' Checks in O(1) if the optional task at index can be replaced by the optional task'''
+        distances = self._distances
+        predecessor, successor = self._Node(index - 1), self._Node(index + 1)
+
+        delay = (self._departures[index] + distances[predecessor][task] + self._serviceTimes[task]
+                 + distances[task][successor] - self._arrivals[index + 1])
+
+        return delay <= self._slacks[index + 1]
+
+    def RemoveFeasible(self, index:int, end:int = None) -> bool:
+        ''' Checks in O(1) if the optional task at index (or the optional tasks index..end) can be removed from the route'''
+        end = index if end is None else end
+        predecessor, successor = self._Node(index - 1), self._Node(end + 1)
+
+        delay = self._departures[index] + self._distances[predecessor][successor] - self._arrivals[end + 1]
+
+        return delay <= self._slacks[end + 1]
+
+    def InsertSegmentFeasible(self, index:int, segment:list[int]) -> bool:
+        ''' Checks if the short segment of optional tasks can be inserted at index, O(1) for the segments of the Or-opt moves'''
+        distances = self._distances
+        predecessor, successor = self._Node(index - 1), self._Node(index)
+
+        time = self._departures[index]
+        for task in segment:
+            time += distances[predecessor][task] + self._serviceTimes[task]
+            predecessor = task
+
+        delay = time + distances[predecessor][successor] - self._arrivals[index]
+
+        return delay <= self._slacks[index]
+
+    def RearrangeFeasible(self, start:int, end:int, delay:int) -> bool:
+        ''' Checks in O(1) if the positions start..end without main tasks can be rearranged, delay is the change of the travel time'''
+        return delay <= self._slacks[end + 1]
+
+    def TailExchangeFeasible(self, index:int, other, otherIndex:int) -> bool:
+        ''' Checks in O(1) if the tail of the route from position index can be replaced by the tail of the other route from otherIndex
+            Both tails contain no main tasks, so only the return to the depot has to be checked
+        '''
+        n, m = len(self.Route), len(other.Route)
+        predecessor, head = self._Node(index - 1), other._Node(otherIndex)
+
+        end = self._departures[index] + self._distances[predecessor][head] + other._arrivals[m] - other._arrivals[otherIndex]
+
+        return end - self._arrivals[n] <= self._slacks[n]
+
+    def ContainsMainTask(self, start:int, end:int) -> bool:
+        ''' Checks if there is a main task between the positions start and end (both included)'''
+        return self._checkpoints[start] <= end
+
+    def ReverseFeasible(self, start:int, end:int, delay:int) -> bool:
+        ''' Checks in O(1) if the segment start..end without main tasks can be reversed, delay is the change of the travel time'''
+        return delay <= self._slacks[end + 1]
+
+    def SwapFeasible(self, indexA:int, indexB:int) -> bool:
+        ''' Checks in O(1) if the optional tasks at indexA and indexB can be swapped'''
+        distances = self._distances
+        service_times = self._serviceTimes
+        i, j = min(indexA, indexB), max(indexA, indexB)
+        task_i, task_j = self.Route[i], self.Route[j]
+        predecessor = self._Node(i - 1)
+        successor = self._Node(j + 1)
+
+        if j == i + 1:
+            # Adjacent tasks: both are exchanged as one block
+            delay = (self._departures[i] + distances[predecessor][task_j] + service_times[task_j] + distances[task_j][task_i]
+                     + service_times[task_i] + distances[task_i][successor] - self._arrivals[j + 1])
+            return delay <= self._slacks[j + 1]
+
+        delay_i = (self._departures[i] + distances[predecessor][task_j] + service_times[task_j]
+                   + distances[task_j][self.Route[i + 1]] - self._arrivals[i + 1])
+        delay_j = (self._departures[j] + distances[self.Route[j - 1]][task_i] + service_times[task_i]
+                   + distances[task_i][successor] - self._arrivals[j + 1])
+
+        # Without a main task in between both delays add up until the same checkpoint
+        if self._checkpoints[i + 1] == self._checkpoints[j + 1]:
+            return delay_i + delay_j <= self._slacks[j + 1]
+
+        return delay_i <= self._slacks[i + 1] and delay_j <= self._slacks[j + 1]
+
+
 class EvaluationLogic:
     ''' Evalution Objects to calculate objectives of the given solutions'''
 
     def __init__(self, inputData:InputData):
         ''' Initialize by addinbg data'''
-        self._data = inputData      
+        self._data = inputData
+
+        # List views of the task table, scalar lookups in lists are faster than property calls or numpy arrays
+        self._profits = inputData.taskTable.profit.tolist()
+        self._serviceTimes = inputData.taskTable.service_time.tolist()
+        self._startTimes = inputData.taskTable.start_time.tolist()
+
+        # Dense matrix for the vectorized delta kernels (None in sparse mode)
+        self._distanceMatrix = inputData.distanceMatrix
+
+        # Euclidean travel times are symmetric, the check is done once by the InputData (or taken from the shared handle)
+        self._symmetricDistances = inputData.symmetricDistances
 
 
     def evaluateSolution(self, currentSolution:Solution) -> None:
@@ -17,26 +185,83 @@ class EvaluationLogic:
         sum_profit = 0
         sum_tasks = 0
 
-        all_Tasks = self._data.allTasks
+        currentSolution.InvalidateRouteCaches()
+
+        profits = self._profits
+        route_profits = currentSolution.RouteProfits
+        route_tasks = currentSolution.RouteTasks
 
         for day in range(self._data.days):
             for cohort in range(self._data.cohort_no):
-                sum_tasks += len(currentSolution.RoutePlan[day][cohort])
+                route_profit = 0
                 for task_no in currentSolution.RoutePlan[day][cohort]:
-                    sum_profit += all_Tasks[task_no].profit
+                    route_profit += profits[task_no]
+
+                # Store the values of every route for the incremental evaluation
+                route_profits[day, cohort] = route_profit
+                route_tasks[day, cohort] = len(currentSolution.RoutePlan[day][cohort])
+
+                sum_profit += route_profit
+                sum_tasks += len(currentSolution.RoutePlan[day][cohort])
 
         currentSolution.setTotalProfit(sum_profit) 
         currentSolution.setTotalTasks(sum_tasks)
 
         self.calculateWaitingTime(currentSolution)
 
+    def evaluateRoutes(self, currentSolution:Solution, routeKeys:list[tuple[int, int]], previousSolution:Solution = None) -> None:
+        ''' Incremental evaluation: only re-scores the changed (day, cohort) routes and updates the totals by difference
+            The other routes are taken from the previous solution, or from the current solution itself if it was changed in place
+        '''
+
+        if previousSolution is not None and previousSolution is not currentSolution:
+            currentSolution.copyEvaluation(previousSolution)
+
+        # The routes have changed, the start and end times are recalculated on the next access
+        currentSolution.InvalidateRouteCaches()
+
+        # Fall back to the full evaluation for solutions that were never evaluated
+        if currentSolution.TotalProfit == -1:
+            self.evaluateSolution(currentSolution)
+            return None
+
+        profits = self._profits
+        route_profits = currentSolution.RouteProfits
+        route_tasks = currentSolution.RouteTasks
+        waiting_times = currentSolution.WaitingTimes
+
+        sum_profit = currentSolution.TotalProfit
+        sum_tasks = currentSolution.TotalTasks
+        total_waiting_time = currentSolution.WaitingTime
+
+        for day, cohort in set(routeKeys):
+            route = currentSolution.RoutePlan[day][cohort]
+
+            route_profit = 0
+            for task_no in route:
+                route_profit += profits[task_no]
+            route_waiting_time = self.WaitingTimeOneRoute(route)
+
+            # Update the totals by the difference to the old values of the route
+            sum_profit += route_profit - int(route_profits[day, cohort])
+            sum_tasks += len(route) - int(route_tasks[day, cohort])
+            total_waiting_time += route_waiting_time - waiting_times[day, cohort]
+
+            route_profits[day, cohort] = route_profit
+            route_tasks[day, cohort] = len(route)
+            waiting_times[day, cohort] = route_waiting_time
+
+        currentSolution.setTotalProfit(sum_profit)
+        currentSolution.setTotalTasks(sum_tasks)
+        currentSolution.setWaitingTime(total_waiting_time)
+
     def calculateWaitingTime(self, currentSolution: Solution) -> None:
         """Calculates the waiting time of the given solution"""
         
         # Cache commonly accessed attributes
         max_route_duration = self._data.maxRouteDuration
         distances = self._data.distances
-        all_tasks = self._data.allTasks
+        service_times = self._serviceTimes
         route_plan = currentSolution.RoutePlan
         waiting_times = currentSolution.WaitingTimes
 
@@ -50,7 +275,7 @@ class EvaluationLogic:
                 # Loop through tasks in the current route
                 for task_i in current_route:
                     route_time -= distances[previous_task][task_i]  # Subtract travel time
-                    route_time -= all_tasks[task_i].service_time  # Subtract service time
+                    route_time -= service_times[task_i]  # Subtract service time
                     previous_task = task_i
 
                 # Subtract return distance to the start point
@@ -65,13 +290,17 @@ class EvaluationLogic:
         # Set the waiting time in the solution
         currentSolution.setWaitingTime(total_waiting_time)
 
+    def CreateRouteSchedule(self, route:list[int]) -> RouteSchedule:
+        ''' Creates the cached schedule with arrival times and forward slack of one route'''
+        return RouteSchedule(route, self._data.distances, self._serviceTimes, self._startTimes, self._data.maxRouteDuration)
+
     def WaitingTimeOneRoute(self, RouteDayCohort: list[int]) -> int:
         """Calculates the Waiting Time for one route."""
 
         # Cache commonly used attributes
         max_route_duration = self._data.maxRouteDuration
         distances = self._data.distances
-        all_tasks = self._data.allTasks
+        service_times = self._serviceTimes
 
         # Initialize route time and previous task
         route_time = max_route_duration
@@ -80,7 +309,7 @@ class EvaluationLogic:
         # Loop through each task in the route
         for task_i in RouteDayCohort:
             # Subtract travel time and service time in one step
-            route_time -= distances[previous_task][task_i] + all_tasks[task_i].service_time
+            route_time -= distances[previous_task][task_i] + service_times[task_i]
             previous_task = task_i
 
         # Subtract return distance to the start (task 0)
@@ -91,17 +320,32 @@ class EvaluationLogic:
     def WaitingTimeDifferenceOneRoute(self, move) -> int:
         ''' Calculates the Difference of the Waiting Time for old and new Two Edge Exchange Route'''
 
-        difference = move.OldWaitingTime - self.WaitingTimeOneRoute(move.RouteDayCohort)
+        # Only the edges from the predecessor to the successor of the reversed segment change, the service times stay the same
+        distances = self._data.distances
+        route = move.Route
+        start, end = min(move.indexA, move.indexB), max(move.indexA, move.indexB)
+        precessor = route[start - 1] if start > 0 else 0
+        successor = route[end + 1] if end + 1 < len(route) else 0
+
+        distance_old = distances[precessor][route[start]] + distances[route[end]][successor]
+        distance_new = distances[precessor][route[end]] + distances[route[start]][successor]
+        for k in range(start, end):
+            distance_old += distances[route[k]][route[k + 1]]
+            distance_new += distances[route[k + 1]][route[k]]
+
+        difference = distance_new - distance_old
 
         return difference
 
     def CalculateDistanceSubtractionTwoEdge(self, move, successor_list, precessor_list):
-        """Calculates the distance subtraction for two edges"""
+        """Calculates the distance subtraction for two edges
+            precessor_list[0] is the predecessor of the first and successor_list[1] the successor of the last task of the reversed segment
+        """
 
-        # Cache distances and tasks for efficiency
+        # Cache distances and tasks for efficiency, taskA is the first and taskB the last task of the segment
         distances = self._data.distances
-        taskA = move.TaskA
-        taskB = move.TaskB
+        taskA = move.Route[min(move.indexA, move.indexB)]
+        taskB = move.Route[max(move.indexA, move.indexB)]
 
         # Precompute the old distances
         distance_old = distances[precessor_list[0]][taskA] + distances[taskB][successor_list[1]]
@@ -180,19 +424,103 @@ class EvaluationLogic:
     def CalculateSwapIntraRouteDelta(self, move): 
         '''Calculates the delta of the given swap move'''
 
-        # Retrieve the route for the given day and cohort
-        precessors, successors = self.get_predecessors_and_successors(route=move.RouteDayCohort, indexes=[move.indexA, move.indexB])
+        # Retrieve the unchanged route for the given day and cohort
+        return self.SwapIntraRouteDelta(move.Route, move.indexA, move.indexB)
 
-        # Calculate the delta using the distance subtraction method
-        delta = self.CalculateDistanceSubtraction(move, successors, precessors)
+    def SwapIntraRouteDelta(self, route:list[int], indexA:int, indexB:int) -> int:
+        '''Calculates the delta of swapping the tasks at two positions of a route without creating a move'''
 
-        return delta
+        distances = self._data.distances
+        if indexA > indexB:
+            indexA, indexB = indexB, indexA
+        taskA, taskB = route[indexA], route[indexB]
+        precessorA = route[indexA - 1] if indexA > 0 else 0
+        successorB = route[indexB + 1] if indexB < len(route) - 1 else 0
+
+        if indexB - indexA == 1:
+            # Adjacent tasks share one edge, only the two outer edges and the shared edge change
+            distance_old = distances[precessorA][taskA] + distances[taskA][taskB] + distances[taskB][successorB]
+            distance_new = distances[precessorA][taskB] + distances[taskB][taskA] + distances[taskA][successorB]
+
+            return distance_new - distance_old
+
+        successorA, precessorB = route[indexA + 1], route[indexB - 1]
+
+        # Both tasks get the predecessor and successor of the other task
+        distance_old = distances[precessorA][taskA] + distances[taskA][successorA] + distances[precessorB][taskB] + distances[taskB][successorB]
+        distance_new = distances[precessorA][taskB] + distances[taskB][successorA] + distances[precessorB][taskA] + distances[taskA][successorB]
+
+        return distance_new - distance_old
     
+    @property
+    def SymmetricDistances(self) -> bool:
+        ''' Reversing a segment does not change its travel time for symmetric travel times'''
+        return self._symmetricDistances
+
+    @property
+    def SupportsVectorizedDeltas(self) -> bool:
+        ''' The vectorized delta kernels need the dense distance matrix'''
+        return self._distanceMatrix is not None
+
+    def _PaddedRouteAndPositions(self, route:list[int]):
+        ''' Returns the route padded with the depot on both sides and the padded positions of all optional tasks'''
+
+        padded = numpy.array([0] + list(route) + [0], dtype=numpy.int64)
+        positions = numpy.flatnonzero(padded[1:-1] <= 1000) + 1
+
+        return padded, positions
+
+    def CalculateSwapIntraRouteDeltas(self, route:list[int]):
+        ''' Calculates the deltas of all swaps of two optional tasks of one route at once with NumPy fancy indexing
+            Returns the index arrays (i < j) of the swapped positions in the route and the delta of every pair
+        '''
+
+        distances = self._distanceMatrix
+        padded, positions = self._PaddedRouteAndPositions(route)
+        first, second = numpy.triu_indices(len(positions), k=1)
+        i, j = positions[first], positions[second]
+
+        task_i, task_j = padded[i], padded[j]
+        precessor_i, successor_i = padded[i - 1], padded[i + 1]
+        precessor_j, successor_j = padded[j - 1], padded[j + 1]
+
+        # Non adjacent tasks: both tasks get new predecessors and successors
+        distance_old = distances[precessor_i, task_i] + distances[task_i, successor_i] + distances[precessor_j, task_j] + distances[task_j, successor_j]
+        distance_new = distances[precessor_i, task_j] + distances[task_j, successor_i] + distances[precessor_j, task_i] + distances[task_i, successor_j]
+
+        # Adjacent tasks share one edge which is reversed
+        distance_old_adjacent = distances[precessor_i, task_i] + distances[task_i, task_j] + distances[task_j, successor_j]
+        distance_new_adjacent = distances[precessor_i, task_j] + distances[task_j, task_i] + distances[task_i, successor_j]
+
+        deltas = numpy.where(j == i + 1, distance_new_adjacent - distance_old_adjacent, distance_new - distance_old)
+
+        return i - 1, j - 1, deltas
+
+    def CalculateTwoEdgeExchangeDeltas(self, route:list[int]):
+        ''' Calculates the deltas of all 2-opt moves (reversal of the segment i..j) between two optional tasks of one route at once
+            The internal edges of the segment are summed with prefix sums, so asymmetric travel times are handled exactly
+        '''
+
+        distances = self._distanceMatrix
+        padded, positions = self._PaddedRouteAndPositions(route)
+        first, second = numpy.triu_indices(len(positions), k=1)
+        i, j = positions[first], positions[second]
+
+        # Prefix sums of the edges padded[k] -> padded[k+1] in forward and in reversed direction
+        forward = numpy.concatenate(([0], numpy.cumsum(distances[padded[:-1], padded[1:]], dtype=numpy.int64)))
+        backward = numpy.concatenate(([0], numpy.cumsum(distances[padded[1:], padded[:-1]], dtype=numpy.int64)))
+
+        precessor, successor = padded[i - 1], padded[j + 1]
+        distance_old = distances[precessor, padded[i]] + distances[padded[j], successor] + (forward[j] - forward[i])
+        distance_new = distances[precessor, padded[j]] + distances[padded[i], successor] + (backward[j] - backward[i])
+
+        return i - 1, j - 1, distance_new - distance_old
+
     def CalculateSwapInterRouteDelta(self, move): 
         '''Calculates the delta of the given swap move'''
 
-        predA, succA = self.get_predecessor_and_succesor(move.RouteDayCohortA, move.indexA)
-        predB, succB = self.get_predecessor_and_succesor(move.RouteDayCohortB, move.indexB)
+        predA, succA = self.get_predecessor_and_succesor(move.RouteA, move.indexA)
+        predB, succB = self.get_predecessor_and_succesor(move.RouteB, move.indexB)
 
 
         # Calculate the delta using the distance subtraction method
@@ -203,10 +531,12 @@ class EvaluationLogic:
 
 
     def CalculateTwoEdgeExchangeDelta(self, move):
-        '''Calculates the delta of the given two edge exchange move'''
+        '''Calculates the delta of the given two edge exchange move in O(1)
+            Only the two outer edges change, this is only exact for symmetric travel times (see SymmetricDistances)
+        '''
 
-        # Retrieve the route for the given day and cohort
-        precessors, successors = self.get_predecessors_and_successors(route=move.RouteDayCohort, indexes=[move.indexA, move.indexB])
+        # Retrieve the route for the given day and cohort, ordered by the start and the end of the reversed segment
+        precessors, successors = self.get_predecessors_and_successors(route=move.Route, indexes=sorted((move.indexA, move.indexB)))
 
         # Calculate the delta using the distance subtraction method
         delta = self.CalculateDistanceSubtractionTwoEdge(move, successors, precessors)
@@ -218,12 +548,12 @@ class EvaluationLogic:
 
         # Cache commonly used data
         distances = self._data.distances
-        all_tasks = self._data.allTasks
+        service_times = self._serviceTimes
         task_in_route = move.TaskInRoute
         unused_task = move.UnusedTask
 
         # Get predecessor and successor for the current task in the route
-        precessor, successor = self.get_predecessor_and_succesor(move.RouteDayCohort, move.indexInRoute)
+        precessor, successor = self.get_predecessor_and_succesor(move.Route, move.indexInRoute)
 
         # Calculate the old distances for the task being replaced
         distance_old = distances[precessor][task_in_route] + distances[task_in_route][successor]
@@ -232,8 +562,8 @@ class EvaluationLogic:
         distance_new = distances[precessor][unused_task] + distances[unused_task][successor]
 
         # Get service times for the old and new tasks
-        service_time_old = all_tasks[task_in_route].service_time
-        service_time_new = all_tasks[unused_task].service_time
+        service_time_old = service_times[task_in_route]
+        service_time_new = service_times[unused_task]
 
         # Calculate the delta
         delta = (distance_new + service_time_new) - (distance_old + service_time_old)
@@ -241,16 +571,84 @@ class EvaluationLogic:
         return delta
 
 
+    def CalculateRemovalDelta(self, route:list[int], index:int) -> int:
+        '''Calculates the change of the travel time if the task at index is removed from the route'''
+
+        distances = self._data.distances
+        task = route[index]
+        precessor, successor = self.get_predecessor_and_succesor(route, index)
+
+        return distances[precessor][successor] - distances[precessor][task] - distances[task][successor]
+
+    def CalculateInsertionDelta(self, route:list[int], index:int, task:int) -> int:
+        '''Calculates the change of the travel time if the task is inserted between route[index - 1] and route[index]'''
+
+        distances = self._data.distances
+        precessor = route[index - 1] if index > 0 else 0
+        successor = route[index] if index < len(route) else 0
+
+        return distances[precessor][task] + distances[task][successor] - distances[precessor][successor]
+
+    def CalculateRelocateInterRouteDelta(self, move) -> int:
+        '''Calculates the delta of moving a task from route A to route B, the service times stay the same'''
+
+        return self.CalculateRemovalDelta(move.RouteA, move.indexA) + self.CalculateInsertionDelta(move.RouteB, move.indexB, move.Task)
+
+    def CalculateOrOptDelta(self, move) -> int:
+        '''Calculates the delta of moving the segment of the Or-opt move, O(1) for segments of at most three tasks
+            The removed and inserted edges never overlap, since the segment is not inserted next to its old position
+        '''
+
+        distances = self._data.distances
+        routeA, routeB, segment = move.RouteA, move.RouteB, move.Segment
+        start, end = move.indexA, move.indexA + len(segment) - 1
+
+        # Removal of the segment from route A
+        precessor = routeA[start - 1] if start > 0 else 0
+        successor = routeA[end + 1] if end + 1 < len(routeA) else 0
+        delta = distances[precessor][successor] - distances[precessor][segment[0]] - distances[segment[-1]][successor]
+
+        # Insertion between routeB[indexB - 1] and routeB[indexB], a reversed segment is entered at its last task
+        head, tail = (segment[-1], segment[0]) if move.Reverse else (segment[0], segment[-1])
+        precessor = routeB[move.indexB - 1] if move.indexB > 0 else 0
+        successor = routeB[move.indexB] if move.indexB < len(routeB) else 0
+        delta += distances[precessor][head] + distances[tail][successor] - distances[precessor][successor]
+
+        # The internal edges only change for reversed segments with asymmetric travel times
+        if move.Reverse and not self._symmetricDistances:
+            for k in range(len(segment) - 1):
+                delta += distances[segment[k + 1]][segment[k]] - distances[segment[k]][segment[k + 1]]
+
+        return delta
+
+    def CalculateTwoOptStarDelta(self, move) -> int:
+        '''Calculates the delta of exchanging the tails of two routes, only the two edges at the cuts change'''
+
+        distances = self._data.distances
+        routeA, routeB, indexA, indexB = move.RouteA, move.RouteB, move.indexA, move.indexB
+
+        precessorA = routeA[indexA - 1] if indexA > 0 else 0
+        successorA = routeA[indexA] if indexA < len(routeA) else 0
+        precessorB = routeB[indexB - 1] if indexB > 0 else 0
+        successorB = routeB[indexB] if indexB < len(routeB) else 0
+
+        distance_old = distances[precessorA][successorA] + distances[precessorB][successorB]
+        distance_new = distances[precessorA][successorB] + distances[precessorB][successorA]
+
+        return distance_new - distance_old
+
     def CalculateInsertExtraTime(self, move):
         """Calculates the delta of the given insert move"""
 
         # Cache data access to minimize repeated lookups
         distances = self._data.distances
-        all_tasks = self._data.allTasks
+        service_times = self._serviceTimes
         task = move.Task
 
-        # Retrieve predecessor and successor once
-        precessor, successor = self.get_predecessor_and_succesor(move.RouteDayCohort, move.Index)
+        # Retrieve predecessor and successor once, the task is inserted between route[Index - 1] and route[Index]
+        route = move.Route
+        precessor = route[move.Index - 1] if move.Index > 0 else 0
+        successor = route[move.Index] if move.Index < len(route) else 0
 
         # Calculate old distance
         distance_old = distances[precessor][successor]
@@ -259,7 +657,7 @@ class EvaluationLogic:
         distance_new = distances[precessor][task] + distances[task][successor]
 
         # Fetch the service time for the task being inserted
-        service_time = all_tasks[task].service_time
+        service_time = service_times[task]
 
         # Calculate the extra time
         extra_time = distance_new + service_time - distance_old
@@ -35,6 +35,8 @@ class ImprovementAlgorithm:
             return SwapIntraRouteNeighborhood(self.InputData, self.EvaluationLogic, self.SolutionPool, self.RNG)
         elif neighborhoodType == 'SwapInterRoute':
             return SwapInterRouteNeighborhood(self.InputData, self.EvaluationLogic, self.SolutionPool, self.RNG)
+        elif neighborhoodType == 'SwapInterRouteExhaustive':
+            return SwapInterRouteNeighborhood(self.InputData, self.EvaluationLogic, self.SolutionPool, self.RNG, exhaustive = True)
         elif neighborhoodType == 'TwoEdgeExchange':
             return TwoEdgeExchangeNeighborhood(self.InputData , self.EvaluationLogic, self.SolutionPool, self.RNG)
         elif neighborhoodType == 'Insert':
@@ -43,6 +45,12 @@ class ImprovementAlgorithm:
             return ReplaceProfitNeighborhood(self.InputData, self.EvaluationLogic, self.SolutionPool, self.RNG)
         elif neighborhoodType == 'ReplaceDelta':
             return ReplaceDeltaNeighborhood(self.InputData, self.EvaluationLogic, self.SolutionPool, self.RNG)
+        elif neighborhoodType == 'RelocateInterRoute':
+            return RelocateInterRouteNeighborhood(self.InputData, self.EvaluationLogic, self.SolutionPool, self.RNG)
+        elif neighborhoodType == 'OrOpt':
+            return OrOptNeighborhood(self.InputData, self.EvaluationLogic, self.SolutionPool, self.RNG)
+        elif neighborhoodType == 'TwoOptStar':
+            return TwoOptStarNeighborhood(self.InputData, self.EvaluationLogic, self.SolutionPool, self.RNG)
         else:
             raise Exception(f"Neighborhood type {neighborhoodType} not defined.")
 
@@ -258,13 +266,17 @@ class IteratedLocalSearch(ImprovementAlgorithm):
         elif type == 'shake': # random removal of consectitive jobs
         '''
             
-        newRoutePlan = deepcopy(solution.RoutePlan)
+        # Only the spine is copied, the selected routes are replaced by changed copies below
+        newRoutePlan = CopyRoutePlan(solution.RoutePlan)
 
-        all_sublists = [(key, sublist) for key, sublists in newRoutePlan.items() for sublist in sublists]
+        all_sublists = [(key, sublist_idx) for key, sublists in newRoutePlan.items() for sublist_idx in range(len(sublists))]
         indices = self.RNG.choice(len(all_sublists), min(sublists_to_modify, len(all_sublists)), replace=False)
         selected_sublists = [all_sublists[i] for i in indices]  # Select sublists using the chosen indices
 
-        for key, sublist in selected_sublists:
+        for key, sublist_idx in selected_sublists:
+            sublist = newRoutePlan[key][sublist_idx].copy()
+            newRoutePlan[key][sublist_idx] = sublist
+
             valid_positions = [i for i in range(len(sublist) - consective_to_remove + 1)
                                 if all(sublist[i + j] <= 1000 for j in range(consective_to_remove))]
 
@@ -517,7 +529,7 @@ class SAILS(IteratedLocalSearch):
                 if currentSolution.TotalProfit > lineSolution.TotalProfit:
                     lineSolution = currentSolution
                     if currentSolution.TotalProfit > bestSolution.TotalProfit:
-                        bestSolution = deepcopy(currentSolution)
+                        bestSolution = currentSolution.Snapshot()
                         iterationsWithoutImprovement = 0
                         bestIteration = iteration
                     else:
@@ -682,7 +694,7 @@ class Adaptive_SAILS(IteratedLocalSearch):
                 if currentSolution.TotalProfit > lineSolution.TotalProfit:
                     lineSolution = currentSolution
                     if currentSolution.TotalProfit > bestSolution.TotalProfit:
-                        bestSolution = deepcopy(currentSolution)
+                        bestSolution = currentSolution.Snapshot()
                         iterationsWithoutImprovement = 0
                         bestIteration = iteration
                     else:
@@ -781,6 +793,9 @@ class SimulatedAnnealingLocalSearch(ImprovementAlgorithm):
             print(f'\nRunning Simulated Annealing for Delta neighborhoods')
             temperature = self.startTemperature
 
+            # The moves are applied to an own snapshot, so solutions in the solution pool stay unchanged
+            currentSolution = currentSolution.Snapshot()
+
             while temperature > self.minTemp:
           
                 delta_neighborhood = self.RNG.choice(list(self.DeltaNeighborhoods.values()), p = probabilities)
@@ -789,30 +804,23 @@ class SimulatedAnnealingLocalSearch(ImprovementAlgorithm):
 
                 if move is not None: #Break MakeOneMove, when Iterations is about 10000
                     if move.Delta < 0:
-                        completeRouteplan = delta_neighborhood.constructCompleteRoute(move,currentSolution)
-                        
-                        currentSolution.setRoutePlan(completeRouteplan, self.InputData)
-                        if delta_neighborhood.Type == "ReplaceDelta":
-                            currentSolution.remove_unused_Task(move.UnusedTask)
-                        self.EvaluationLogic.evaluateSolution(currentSolution)
+                        # Apply the move to the route plan, only the changed routes are copied
+                        move.Apply(currentSolution)
+                        self.EvaluationLogic.evaluateRoutes(currentSolution, move.ChangedRoutes())
                 
                         if currentSolution.WaitingTime > bestSolutionWaitingTime:
                             
                             #Create Best Known Solution
                             bestLoop = innerLoop
-                            bestKnownSolution = Solution(deepcopy(completeRouteplan), self.InputData)
-                            self.EvaluationLogic.evaluateSolution(bestKnownSolution) #Evaluate Sol
+                            bestKnownSolution = currentSolution.Snapshot() # shares the routes, evaluation is copied
                             #self.SolutionPool.AddSolution(bestKnownSolution)
                             #Schauen ob die vorhergehenden Lösungen gleich bleiben -> Debug Modus 
                             bestSolutionWaitingTime = bestKnownSolution.WaitingTime
                     else:
                         random_number = self.RNG.random()
                         if random_number < math.exp(-move.Delta / (temperature)):
-                            completeRouteplan = delta_neighborhood.constructCompleteRoute(move,currentSolution)
-                            currentSolution.setRoutePlan(completeRouteplan, self.InputData)
-                            if delta_neighborhood.Type == "ReplaceDelta":
-                                currentSolution.remove_unused_Task(move.UnusedTask)
-                            self.EvaluationLogic.evaluateSolution(currentSolution)
+                            move.Apply(currentSolution)
+                            self.EvaluationLogic.evaluateRoutes(currentSolution, move.ChangedRoutes())
                 
 
                 temperature = temperature * self.tempDecreaseFactor
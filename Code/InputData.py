@@ -1,8 +1,61 @@
 import json
 import csv
 import math
+import os
+import hashlib
+import functools
+import numpy
+from multiprocessing import shared_memory
 from pathlib import Path
 
+# Conversion factor from euclidean coordinate distance to travel time in seconds
+TRAVEL_TIME_FACTOR = 17100
+
+
+def calculate_travel_times(tasks_from: list, tasks_to: list) -> numpy.ndarray:
+    ''' Calculate an int32 array with the travel times from every task in tasks_from to every task in tasks_to
+        in one broadcasted pass, numpy.rint rounds half to even like round() in InputData._CalculateDistance
+    '''
+
+    latitudes_from = numpy.array([task.latitude for task in tasks_from], dtype=numpy.float64)
+    longitudes_from = numpy.array([task.longitude for task in tasks_from], dtype=numpy.float64)
+    latitudes_to = numpy.array([task.latitude for task in tasks_to], dtype=numpy.float64)
+    longitudes_to = numpy.array([task.longitude for task in tasks_to], dtype=numpy.float64)
+
+    delta_latitude = latitudes_from[:, None] - latitudes_to[None, :]
+    delta_longitude = longitudes_from[:, None] - longitudes_to[None, :]
+    distance = numpy.sqrt(delta_latitude**2 + delta_longitude**2)
+
+    return numpy.rint(distance * TRAVEL_TIME_FACTOR).astype(numpy.int32) # time in seconds
+
+
+def hash_files(paths: list) -> str:
+    ''' Hash the content of the files and the travel time factor, used as key of the distance cache'''
+
+    hasher = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as file:
+            hasher.update(file.read())
+    hasher.update(str(TRAVEL_TIME_FACTOR).encode())
+
+    return hasher.hexdigest()[:32]
+
+
+def load_cached_array(cache_file: Path, create) -> numpy.ndarray:
+    ''' Memory-map the array from the cache file or create it with create() and store it there first
+        The key in the file name changes whenever one of the source files changes, so stale arrays are never read
+    '''
+
+    if not cache_file.exists():
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first, so parallel workers never map a half written array
+        tmp_file = cache_file.with_name(f"{cache_file.stem}_{os.getpid()}.tmp")
+        with open(tmp_file, 'wb') as file:
+            numpy.save(file, create())
+        os.replace(tmp_file, cache_file)
+
+    return numpy.load(cache_file, mmap_mode='r')
+
 class MainTask:
     ''' Class for the attributes of a main task '''
 
@@ -187,34 +240,279 @@ class OptionalTask:
         return self._profit
 
 
+class SparseDistanceRow:
+    ''' One row of the sparse travel times, supports the same row[j] access as a row of the dense list'''
+
+    def __init__(self, sparseDistances, task_no: int, neighbor_times: dict[int, int]) -> None:
+        self._sparseDistances = sparseDistances
+        self._task_no = task_no
+        self._neighbor_times = neighbor_times
+
+    def __getitem__(self, other_task_no: int) -> int:
+        ''' Return the travel time to another task, pairs outside the nearest neighbors are calculated on demand'''
+
+        time = self._neighbor_times.get(other_task_no)
+        if time is None:
+            time = self._sparseDistances.CalculateTravelTime(self._task_no, other_task_no)
+
+        return time
+
+    def __len__(self) -> int:
+        return len(self._sparseDistances)
+
+
+class SparseDistances:
+    ''' Sparse travel times for large task catalogs: Only the k nearest neighbors of every task are stored,
+        all other pairs are calculated from the coordinates on demand and kept in a small LRU cache
+    '''
+
+    def __init__(self, tasks: list, k_neighbors: int = 50, cache_size: int = 100000, chunk_size: int = 256) -> None:
+        '''
+        Find the k nearest neighbors of every task, the full matrix is only ever built in chunks of rows.
+
+        :param tasks: List of all tasks, ordered by their number
+        :param k_neighbors: Number of nearest neighbors stored per task
+        :param cache_size: Maximum number of task pairs outside the neighbors kept in the LRU cache
+        :param chunk_size: Number of rows calculated at once to find the nearest neighbors
+        '''
+
+        self._latitudes = numpy.array([task.latitude for task in tasks], dtype=numpy.float64)
+        self._longitudes = numpy.array([task.longitude for task in tasks], dtype=numpy.float64)
+
+        number_tasks = len(tasks)
+        k_neighbors = min(k_neighbors, number_tasks - 1)
+
+        self._neighbors = numpy.empty((number_tasks, k_neighbors), dtype=numpy.int32)
+        self._neighborTimes = numpy.empty((number_tasks, k_neighbors), dtype=numpy.int32)
+
+        for start in range(0, number_tasks, chunk_size):
+            end = min(start + chunk_size, number_tasks)
+            times = calculate_travel_times(tasks[start:end], tasks)
+            rows = numpy.arange(end - start)
+            times[rows, rows + start] = numpy.iinfo(numpy.int32).max # A task is not its own neighbor
+
+            # Select the k nearest tasks of every row and sort them by travel time
+            nearest = numpy.argpartition(times, k_neighbors - 1, axis=1)[:, :k_neighbors]
+            nearest_times = numpy.take_along_axis(times, nearest, axis=1)
+            order = numpy.argsort(nearest_times, axis=1, kind='stable')
+            self._neighbors[start:end] = numpy.take_along_axis(nearest, order, axis=1)
+            self._neighborTimes[start:end] = numpy.take_along_axis(nearest_times, order, axis=1)
+
+        self._rows = []
+        for task_no, (neighbors, neighbor_times) in enumerate(zip(self._neighbors.tolist(), self._neighborTimes.tolist())):
+            neighbor_dict = dict(zip(neighbors, neighbor_times))
+            neighbor_dict[task_no] = 0
+            self._rows.append(SparseDistanceRow(self, task_no, neighbor_dict))
+
+        self._CachedTravelTime = functools.lru_cache(maxsize=cache_size)(self._CalculatePairTravelTime)
+
+    def _CalculatePairTravelTime(self, task_1: int, task_2: int) -> int:
+        ''' Calculate the travel time between two tasks, same formula as InputData._CalculateDistance'''
+
+        distance = math.sqrt((self._latitudes[task_1] - self._latitudes[task_2])**2 + (self._longitudes[task_1] - self._longitudes[task_2])**2)
+
+        return int(round(float(distance) * TRAVEL_TIME_FACTOR)) # time in seconds
+
+    def CalculateTravelTime(self, task_1: int, task_2: int) -> int:
+        ''' Return the travel time between two tasks from the LRU cache, the pair is ordered to use the symmetry'''
+
+        if task_1 > task_2:
+            task_1, task_2 = task_2, task_1
+
+        return self._CachedTravelTime(task_1, task_2)
+
+    def __getitem__(self, task_no: int) -> SparseDistanceRow:
+        return self._rows[task_no]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    @property
+    def neighbors(self) -> numpy.ndarray:
+        ''' Get the k nearest neighbors of every task, sorted by travel time'''
+        return self._neighbors
+
+    @property
+    def neighborTimes(self) -> numpy.ndarray:
+        ''' Get the travel times to the k nearest neighbors of every task'''
+        return self._neighborTimes
+
+
+class SpatialGrid:
+    ''' Uniform grid over the latitude/longitude coordinates of tasks to find all tasks within a radius quickly'''
+
+    def __init__(self, tasks: list, cell_size: float) -> None:
+        '''
+        Sort the tasks into quadratic cells, the edge length is the search radius in coordinate units.
+
+        :param tasks: Tasks with latitude, longitude and number in the list of all tasks
+        :param cell_size: Search radius in coordinate units (travel time divided by TRAVEL_TIME_FACTOR)
+        '''
+
+        self._cell_size = cell_size
+        self._cells = dict()
+
+        for task in tasks:
+            self._cells.setdefault(self._Cell(task), []).append(task.no)
+
+        # Sort every cell once, so the neighbors are returned in the order of the task numbers
+        for cell in self._cells.values():
+            cell.sort()
+
+    def _Cell(self, task) -> tuple[int, int]:
+        ''' Return the grid cell of a task'''
+        return (math.floor(task.latitude / self._cell_size), math.floor(task.longitude / self._cell_size))
+
+    def Neighbors(self, task) -> list[int]:
+        ''' Return the numbers of all tasks in the cell of the task and the eight surrounding cells
+            Superset of all tasks closer than the cell size, the exact distance still needs to be checked
+        '''
+
+        row, column = self._Cell(task)
+        neighbors = []
+        for i in (row - 1, row, row + 1):
+            for j in (column - 1, column, column + 1):
+                neighbors.extend(self._cells.get((i, j), ()))
+
+        return sorted(neighbors)
+
+
+class TaskTable:
+    ''' Struct of arrays with the attributes of all tasks, indexed by the number of the task'''
+
+    ARRAY_NAMES = ('profit', 'service_time', 'start_time', 'end_time', 'day', 'is_main')
+
+    def __init__(self, tasks: list, number_optional_tasks: int, arrays: dict[str, numpy.ndarray] = None) -> None:
+        '''
+        Copy the attributes of the task objects into contiguous numpy arrays.
+
+        :param tasks: List of all tasks, ordered by their number
+        :param number_optional_tasks: Number of optional tasks, all tasks behind them are main tasks
+        :param arrays: Already existing arrays (e.g. in shared memory) with the names in ARRAY_NAMES, used without copies
+        '''
+
+        if arrays is not None:
+            for name in self.ARRAY_NAMES:
+                setattr(self, '_' + name, arrays[name])
+            return
+
+        self._profit = numpy.array([task.profit for task in tasks], dtype=numpy.int32)
+        self._service_time = numpy.array([task.service_time for task in tasks], dtype=numpy.int32)
+        self._start_time = numpy.array([task.start_time for task in tasks], dtype=numpy.int32)
+        self._end_time = numpy.array([task.end_time for task in tasks], dtype=numpy.int32)
+        self._day = numpy.array([task.day if isinstance(task, MainTask) else 0 for task in tasks], dtype=numpy.int32)
+        self._is_main = numpy.arange(len(tasks)) >= number_optional_tasks
+
+    @property
+    def profit(self) -> numpy.ndarray:
+        ''' Return Profits '''
+        return self._profit
+
+    @property
+    def service_time(self) -> numpy.ndarray:
+        ''' Return Service Times '''
+        return self._service_time
+
+    @property
+    def start_time(self) -> numpy.ndarray:
+        ''' Return Start Times (0 for optional tasks) '''
+        return self._start_time
+
+    @property
+    def end_time(self) -> numpy.ndarray:
+        ''' Return End Times (maximum route duration for optional tasks) '''
+        return self._end_time
+
+    @property
+    def day(self) -> numpy.ndarray:
+        ''' Return Day Numbers (0 for optional tasks) '''
+        return self._day
+
+    @property
+    def is_main(self) -> numpy.ndarray:
+        ''' Return boolean mask of the main tasks '''
+        return self._is_main
+
+    @property
+    def arrays(self) -> dict[str, numpy.ndarray]:
+        ''' Return all arrays by their name '''
+        return {name: getattr(self, '_' + name) for name in self.ARRAY_NAMES}
+
+
 class InputData:
     '''Class for creating Data objects based on formatted Json Files containing the information of the regarding jobs and machines'''
 
-    def __init__(self, instance_filename: str, optional_tasks_path: str = str((Path.cwd().parent /  "Data" / "OptionalTasks.csv").resolve())) -> None: # Changed default path to relative path
+    def __init__(self, instance_filename: str, optional_tasks_path: str = str((Path.cwd().parent /  "Data" / "OptionalTasks.csv").resolve()), # Changed default path to relative path
+                 distance_cache_path: str = str((Path.cwd().parent / "Data" / "DistanceCache").resolve()),
+                 instance_family = None, sparse_neighbors: int = None, candidate_neighbors: int = 30,
+                 shared_memory_handle: dict = None) -> None:
         '''
         Initialize the InputData object with paths to the optional tasks and main tasks files.
 
         :param optional_tasks_path: Path to the CSV file containing optional tasks
         :param main_tasks_path: Path to the JSON file containing main tasks
+        :param distance_cache_path: Directory for the cached distance matrices, None disables the cache
+        :param instance_family: InstanceFamily that shares the optional task distances between instances
+        :param sparse_neighbors: Store only this many nearest neighbors per task instead of the dense matrix (large catalogs)
+        :param candidate_neighbors: Length of the candidate lists for the granular neighborhoods, None disables them
+        :param shared_memory_handle: Handle of a SharedInputData, the arrays are attached instead of created
         '''
 
         print(Path.cwd().parent)
         self._main_tasks_path = str((Path.cwd().parent / "Data" / "Instanzen" / instance_filename).resolve())
         self._optional_tasks_path = optional_tasks_path
-
-    
-
-        # Load and create task objects from file paths
-        self._Load_MainTasks()
-        self._Load_OptionalTasks()
-
-        self._AddNumbersToList(self._mainTasks, len(self._optionalTasks))
+        self._distance_cache_path = distance_cache_path
+        self._instance_family = instance_family
+        self._sparse_neighbors = sparse_neighbors
+        self._candidate_neighbors = candidate_neighbors
+        self._shared_memory_handle = shared_memory_handle
+        self._sharedBlocks = [] # Keeps the attached shared memory blocks open
+        self._symmetricDistances = None # only checked on first access
+
+        if self._shared_memory_handle is not None:
+            # Worker processes take the already numbered tasks from the handle instead of parsing the files again
+            self._Load_SharedTasks()
+        else:
+            # Load and create task objects from file paths
+            self._Load_MainTasks()
+            self._Load_OptionalTasks()
+
+            self._AddNumbersToList(self._mainTasks, len(self._optionalTasks))
 
         # Create List with all Tasks
         self._allTasks = self._optionalTasks + self._mainTasks
 
-        # Create list with distances
-        self._distances = self._CreateDistances()
+        # Create struct of arrays with the attributes of all tasks
+        if self._shared_memory_handle is not None:
+            sharedArrays = {name: self._AttachSharedArray(name) for name in TaskTable.ARRAY_NAMES}
+            self._taskTable = TaskTable(self._allTasks, len(self._optionalTasks), sharedArrays)
+        else:
+            self._taskTable = TaskTable(self._allTasks, len(self._optionalTasks))
+
+        # Create matrix with distances and row views of it for the scalar lookups in the heuristics
+        if self._shared_memory_handle is not None:
+            # Zero copy: the row views point into the shared array
+            self._distanceMatrix = self._AttachSharedArray('distances')
+            self._distances = self._CreateDistances()
+            self._symmetricDistances = self._shared_memory_handle['symmetric_distances']
+        elif self._sparse_neighbors is None:
+            self._distanceMatrix = self._LoadDistanceMatrix()
+            self._distances = self._CreateDistances()
+        else:
+            # Sparse mode for large catalogs, there is no dense matrix but distances[i][j] still works
+            self._distanceMatrix = None
+            self._distances = SparseDistances(self._allTasks, self._sparse_neighbors)
+
+        # Create candidate lists with the nearest tasks for the granular neighborhoods
+        if self._shared_memory_handle is not None and self._candidate_neighbors is not None:
+            self._candidateNeighbors = self._AttachSharedArray('candidates')
+        else:
+            self._candidateNeighbors = self._CreateCandidateNeighbors()
+
+        self._candidateLists = [set(row) for row in self._candidateNeighbors.tolist()] if self._candidateNeighbors is not None else None
 
         # Create list with score for attractiveness
         #self._scoreboard = self._CreateScoreboard()
@@ -239,6 +537,18 @@ class InputData:
                 self._optionalTasks.append(task)
                 number += 1
 
+    def _Load_SharedTasks(self) -> None:
+        ''' Take the instance attributes and the numbered task objects from the handle of a SharedInputData'''
+
+        instance = self._shared_memory_handle['instance']
+        self._instance_ID = instance['ID']
+        self._cohort_no = instance['Cohorts']
+        self._days = instance['Days']
+        self._maxRouteDuration = instance['MaxRouteDuration']
+
+        self._optionalTasks = self._shared_memory_handle['optional_tasks']
+        self._mainTasks = self._shared_memory_handle['main_tasks']
+
     def _Load_MainTasks(self) -> None:
         ''' Initialize the creation of a list of main tasks based on the JSON file path'''
 
@@ -266,52 +576,110 @@ class InputData:
 
         distance = math.sqrt((task_1.latitude - task_2.latitude)**2 + (task_1.longitude - task_2.longitude)**2)
 
-        time = int(round(distance * 17100)) # time in seconds
+        time = int(round(distance * TRAVEL_TIME_FACTOR)) # time in seconds
 
         return time
 
-    def _CreateDistances(self) -> list[list[int]]:
-        ''' Create a two-dimensional list with distances between all tasks '''
+    def _CreateDistanceMatrix(self) -> numpy.ndarray:
+        ''' Create a two-dimensional int32 array with the travel times between all tasks in one broadcasted pass'''
+
+        if self._instance_family is not None:
+            return self._instance_family.CreateDistanceMatrix(self._optionalTasks, self._mainTasks)
+
+        return calculate_travel_times(self._allTasks, self._allTasks)
+
+    def _DistanceCacheKey(self) -> str:
+        ''' Hash the content of the optional tasks file, the main tasks file and the travel time factor'''
+
+        return hash_files([self._optional_tasks_path, self._main_tasks_path])
+
+    def _LoadDistanceMatrix(self) -> numpy.ndarray:
+        ''' Memory-map the distance matrix from the cache directory or create and store it there first
+            On a cache miss the instance family (if any) only speeds up the creation of the matrix
+        '''
+
+        if self._distance_cache_path is None:
+            return self._CreateDistanceMatrix()
 
-        # Calculate the distances between all tasks
-        distances = [[0 for i in range(len(self._allTasks))] for j in range(len(self._allTasks))]
+        cache_file = Path(self._distance_cache_path) / f"distances_{self._DistanceCacheKey()}.npy"
 
-        for task_i_id in range(len(self._allTasks)):
-            for task_j_id in range(task_i_id): 
-                # Calculate the distance between the two tasks
-                    distances[task_i_id][task_j_id] = distances[task_j_id][task_i_id] = self._CalculateDistance(self._allTasks[task_i_id], self._allTasks[task_j_id])
+        return load_cached_array(cache_file, self._CreateDistanceMatrix)
 
-        return distances
+    def _AttachSharedArray(self, name: str) -> numpy.ndarray:
+        ''' Attach to one array published by SharedInputData without copying it'''
+
+        block_name, shape, dtype = self._shared_memory_handle['arrays'][name]
+        block = shared_memory.SharedMemory(name=block_name)
+        self._sharedBlocks.append(block)
+
+        array = numpy.ndarray(shape, dtype=numpy.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+
+        return array
+
+    def _CreateDistances(self) -> list[memoryview]:
+        ''' Create one memoryview per row of the distance matrix, the travel times are not copied
+            Scalar lookups like distances[i][j] return Python ints and are faster than on lists or numpy arrays,
+            a memory-mapped matrix is still only read page by page
+        '''
+
+        return [memoryview(row) for row in self._distanceMatrix]
     
-    def _CalculateScore(self, currentTask) -> int:
-        ''' Calculate Score for every task'''
+    def _CalculateScore(self, currentTask, spatialGrid, radius:int = 180, min_profit:int = 3) -> list[int]:
+        ''' Calculate Score for every task --> List of close tasks with high profit, only the grid cells around the task are searched'''
 
         listOfCloseHighProfit = list()
-        for task in self.optionalTasks:
-            if task.profit == 3 and task != currentTask:
-                taskIndex = task.no
-                currentTaskIndex = self.optionalTasks.index(currentTask)
+        currentTaskIndex = currentTask.no
+        for taskIndex in spatialGrid.Neighbors(currentTask):
+            if taskIndex != currentTaskIndex and self.optionalTasks[taskIndex].profit >= min_profit:
                 distanceToTask = self.distances[taskIndex][currentTaskIndex]
-                if distanceToTask < 180: # Distance needs to be lower than 180 seconds to be included as a point
-                    taskIndex = task.no
+                if distanceToTask < radius: # Distance needs to be lower than the radius (180 seconds) to be included as a point
                     listOfCloseHighProfit.append(taskIndex)
         
         return listOfCloseHighProfit
     
 
-    def _CreateScoreboard(self) -> list[int]:
-        ''' Create Score System for Nodes that have a good Position in the Network --> Close to 3 Profit Tasks'''
+    def _CreateScoreboard(self, radius:int = 180, min_profit:int = 3) -> dict[int, list[int]]:
+        ''' Create Score System for Nodes that have a good Position in the Network --> Close to 3 Profit Tasks
+            radius is the travel time in seconds and min_profit the lowest profit a close task needs to count
+        '''
         
         scoreboard = dict()
+        spatialGrid = SpatialGrid(self.optionalTasks, radius / TRAVEL_TIME_FACTOR)
 
         for task in self.optionalTasks:
             taskIndex = task.no
-            scoreboard[taskIndex] = self._CalculateScore(task)
+            scoreboard[taskIndex] = self._CalculateScore(task, spatialGrid, radius, min_profit)
 
         self._scoreboard = scoreboard
 
         return scoreboard
     
+    def _CreateCandidateNeighbors(self, chunk_size: int = 256) -> numpy.ndarray:
+        ''' Create an int32 array with the k nearest tasks by travel time in every row (unordered)
+            Only chunks of rows are copied, the cached matrix is read only
+        '''
+
+        if self._candidate_neighbors is None:
+            return None
+
+        number_tasks = len(self._allTasks)
+        k_neighbors = min(self._candidate_neighbors, number_tasks - 1)
+
+        if self._distanceMatrix is None:
+            # Sparse mode: the nearest neighbors are already sorted by travel time
+            return numpy.ascontiguousarray(self._distances.neighbors[:, :k_neighbors])
+
+        neighbors = numpy.empty((number_tasks, k_neighbors), dtype=numpy.int32)
+        for start in range(0, number_tasks, chunk_size):
+            end = min(start + chunk_size, number_tasks)
+            times = numpy.array(self._distanceMatrix[start:end], dtype=numpy.int32)
+            rows = numpy.arange(end - start)
+            times[rows, rows + start] = numpy.iinfo(numpy.int32).max # A task is not its own candidate
+            neighbors[start:end] = numpy.argpartition(times, k_neighbors - 1, axis=1)[:, :k_neighbors]
+
+        return neighbors
+
     def _AddNumbersToList(self, task_list, start_number) -> None:
         ''' Add the number of the task in the list to the task object'''
 
@@ -336,9 +704,41 @@ class InputData:
         return self._mainTasks
     
     @property
-    def distances(self) -> list[list[int]]:
-        ''' Get Two dimensional list with distances between all tasks'''
+    def distances(self) -> list[memoryview] | SparseDistances:
+        ''' Get rows with the distances between all tasks, distances[i][j] is a Python int (SparseDistances in sparse mode)'''
         return self._distances
+
+    @property
+    def taskTable(self) -> TaskTable:
+        ''' Get struct of arrays with profit, service time, start time, end time, day and is_main of all tasks'''
+        return self._taskTable
+
+    @property
+    def distanceMatrix(self) -> numpy.ndarray:
+        ''' Get Two dimensional int32 array with distances between all tasks (None in sparse mode)'''
+        return self._distanceMatrix
+
+    @property
+    def candidate_neighbors(self) -> int:
+        ''' Property to get the length of the candidate lists '''
+        return self._candidate_neighbors
+
+    @property
+    def candidateNeighbors(self) -> numpy.ndarray:
+        ''' Get the int32 array with the nearest tasks in every row (None if disabled)'''
+        return self._candidateNeighbors
+
+    @property
+    def symmetricDistances(self) -> bool:
+        ''' Get whether the travel times are symmetric, checked on first access (always true in sparse mode)'''
+        if self._symmetricDistances is None:
+            self._symmetricDistances = self._distanceMatrix is None or bool(numpy.array_equal(self._distanceMatrix, self._distanceMatrix.T))
+        return self._symmetricDistances
+
+    @property
+    def candidateLists(self) -> list[set[int]]:
+        ''' Get the set of the nearest tasks for every task (None if disabled)'''
+        return self._candidateLists
     
     @property
     def scoreboard(self) -> list[int]:
@@ -374,3 +774,133 @@ class InputData:
     def maxRouteDuration(self) -> int:
         ''' Property to get the maximum route duration '''
         return self._maxRouteDuration
+
+
+class InstanceFamily:
+    ''' Class for loading several instances that share the same optional tasks file
+        The optional-to-optional block of the distance matrix is calculated once and reused for every instance
+    '''
+
+    def __init__(self, optional_tasks_path: str = str((Path.cwd().parent /  "Data" / "OptionalTasks.csv").resolve()),
+                 distance_cache_path: str = str((Path.cwd().parent / "Data" / "DistanceCache").resolve())) -> None:
+        '''
+        Initialize the InstanceFamily object with the path to the shared optional tasks file.
+
+        :param optional_tasks_path: Path to the CSV file containing optional tasks
+        :param distance_cache_path: Directory for the cached distance matrices and the optional task block, None disables the cache
+        '''
+
+        self._optional_tasks_path = optional_tasks_path
+        self._distance_cache_path = distance_cache_path
+        self._optionalDistanceMatrix = None
+
+    def LoadInstance(self, instance_filename: str) -> InputData:
+        ''' Create the InputData object of one instance of the family, the instance matrix uses the same disk cache as InputData'''
+
+        return InputData(instance_filename, self._optional_tasks_path, distance_cache_path = self._distance_cache_path, instance_family = self)
+
+    def _LoadOptionalDistanceMatrix(self, optionalTasks: list[OptionalTask]) -> numpy.ndarray:
+        ''' Memory-map the optional task block from the cache directory or create and store it there first
+            The block only depends on the optional tasks file, so all instances and processes share one file
+        '''
+
+        if self._distance_cache_path is None:
+            return calculate_travel_times(optionalTasks, optionalTasks)
+
+        cache_file = Path(self._distance_cache_path) / f"optional_distances_{hash_files([self._optional_tasks_path])}.npy"
+
+        return load_cached_array(cache_file, lambda: calculate_travel_times(optionalTasks, optionalTasks))
+
+    def CreateDistanceMatrix(self, optionalTasks: list[OptionalTask], mainTasks: list[MainTask]) -> numpy.ndarray:
+        ''' Append the main task rows and columns of one instance to the shared optional task block'''
+
+        if self._optionalDistanceMatrix is None:
+            self._optionalDistanceMatrix = self._LoadOptionalDistanceMatrix(optionalTasks)
+
+        number_optional = len(optionalTasks)
+        number_all = number_optional + len(mainTasks)
+
+        if self._optionalDistanceMatrix.shape[0] != number_optional:
+            raise Exception(f'Instance has {number_optional} optional tasks, but the family block has {self._optionalDistanceMatrix.shape[0]}.')
+
+        # Travel times are symmetric, so the main task rows are the transposed main task columns
+        distance_matrix = numpy.empty((number_all, number_all), dtype=numpy.int32)
+        distance_matrix[:number_optional, :number_optional] = self._optionalDistanceMatrix
+        distance_matrix[:number_optional, number_optional:] = calculate_travel_times(optionalTasks, mainTasks)
+        distance_matrix[number_optional:, :number_optional] = distance_matrix[:number_optional, number_optional:].T
+        distance_matrix[number_optional:, number_optional:] = calculate_travel_times(mainTasks, mainTasks)
+
+        return distance_matrix
+
+    @property
+    def optional_tasks_path(self) -> str:
+        ''' Property to get the path to the optional tasks file '''
+        return self._optional_tasks_path
+
+
+class SharedInputData:
+    ''' Class for publishing the distance matrix and the task arrays of an InputData object in shared memory
+        Worker processes attach to them without copies instead of loading and calculating their own InputData
+    '''
+
+    def __init__(self, inputData: InputData) -> None:
+        '''
+        Copy the arrays of the InputData object into new shared memory blocks.
+        The handle also carries the task objects, the instance attributes and the symmetry of the distances,
+        so the workers neither read the files nor calculate anything that the publishing process already has.
+
+        :param inputData: InputData object with a dense distance matrix
+        '''
+
+        if inputData.distanceMatrix is None:
+            raise Exception('SharedInputData needs a dense distance matrix, sparse mode is not supported.')
+
+        self._blocks = []
+        self._handle = {'main_tasks_path': inputData.main_tasks_path,
+                        'optional_tasks_path': inputData.optional_tasks_path,
+                        'candidate_neighbors': inputData.candidate_neighbors,
+                        'symmetric_distances': inputData.symmetricDistances,
+                        'instance': {'ID': inputData.instance_ID,
+                                     'Cohorts': inputData.cohort_no,
+                                     'Days': inputData.days,
+                                     'MaxRouteDuration': inputData.maxRouteDuration},
+                        'optional_tasks': inputData.optionalTasks,
+                        'main_tasks': inputData.mainTasks,
+                        'arrays': {}}
+
+        arrays = dict(inputData.taskTable.arrays)
+        arrays['distances'] = inputData.distanceMatrix
+        if inputData.candidateNeighbors is not None:
+            arrays['candidates'] = inputData.candidateNeighbors
+
+        for name, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            self._blocks.append(block)
+            numpy.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            self._handle['arrays'][name] = (block.name, array.shape, array.dtype.str)
+
+    @staticmethod
+    def Attach(handle: dict) -> InputData:
+        ''' Create the InputData object of a worker process from the handle of the publishing process'''
+
+        return InputData(handle['main_tasks_path'], handle['optional_tasks_path'], distance_cache_path = None,
+                         candidate_neighbors = handle['candidate_neighbors'], shared_memory_handle = handle)
+
+    def Close(self) -> None:
+        ''' Release the shared memory blocks, call this after all workers are finished'''
+
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.Close()
+
+    @property
+    def handle(self) -> dict:
+        ''' Picklable handle that is passed to the worker processes'''
+        return self._handle
@@ -1,18 +1,49 @@
 from OutputData import Solution
 from OutputData import *
 import itertools        
+import bisect
+import math
+import numpy
 from EvaluationLogic import EvaluationLogic
 import concurrent.futures  # For parallelism
 
 # Dummy class to have one class where all Moves are inheriting --> Potential to implement more funtionalities here! 
 class BaseMove: 
-    ''' Base Move Class, that all specific Move classes can inherit from! '''
+    ''' Base Move Class, that all specific Move classes can inherit from! 
+        Moves only store the route they are based on, indices and task numbers, __slots__ keep them compact
+    '''
+
+    __slots__ = ('Delta', 'ExtraTime', 'Route', 'Day', 'Cohort', '_routeDayCohort')
 
     def __init__(self):
         self.Delta = None
-        self.RouteDayCohort = None
+        self.Route = None
         self.Day = None
         self.Cohort = None
+        self._routeDayCohort = None
+
+    @property
+    def RouteDayCohort(self) -> list[int]:
+        ''' Changed copy of the route, it is only built on first access (accepted move or full feasibility check)'''
+        if self._routeDayCohort is None:
+            self._routeDayCohort = self.BuildRoute()
+        return self._routeDayCohort
+
+    def BuildRoute(self) -> list[int]:
+        ''' Builds the changed copy of the route'''
+        raise Exception('BuildRoute() is not implemented for the abstract BaseMove class.')
+
+    def Apply(self, solution:Solution) -> None:
+        ''' Applies the move to the route plan of the solution, only the changed routes are copied'''
+        raise Exception('Apply() is not implemented for the abstract BaseMove class.')
+
+    def ReplaceRoute(self, solution:Solution, day:int, cohort:int) -> list[int]:
+        ''' Replaces the route in the route plan of the solution by a copy and returns the copy
+            Routes may be shared with snapshots of other solutions and are never changed in place
+        '''
+        route = solution.RoutePlan[day][cohort].copy()
+        solution.RoutePlan[day][cohort] = route
+        return route
 
     def setDelta(self,delta:int) -> None: 
         ''' Set the Delta of the Move'''
@@ -22,6 +53,14 @@ class BaseMove:
         ''' Set the ExtraTime of the Move'''
         self.ExtraTime = extraTime
 
+    def ChangedRoutes(self) -> list[tuple[int, int]]:
+        ''' Returns the (day, cohort) keys of the routes changed by the move'''
+        return [(self.Day, self.Cohort)]
+
+    def UpdateUnusedTasks(self, unusedTasks) -> None:
+        ''' Changes the unused tasks (UnusedTaskSet) like the move, only moves which add or remove tasks change them'''
+        pass
+
 class BaseNeighborhood:
     ''' Framework for generally needed neighborhood functionalities'''
 
@@ -32,6 +71,14 @@ class BaseNeighborhood:
         self.SolutionPool = solutionPool
         self.RNG = rng
 
+        # List views of the task table, scalar lookups in lists are faster than property calls or numpy arrays
+        self.Profits = inputData.taskTable.profit.tolist()
+        self.ServiceTimes = inputData.taskTable.service_time.tolist()
+        self.StartTimes = inputData.taskTable.start_time.tolist()
+
+        # Cached schedules of the routes for the O(1) feasibility checks
+        self.RouteSchedules = {}
+
         # Create empty lists for discovering different moves
         self.Moves = []
         self.MoveSolutions = []
@@ -43,6 +90,44 @@ class BaseNeighborhood:
         '''
         raise Exception('DiscoverMoves() is not implemented for the abstract BaseNeighborhood class.')
 
+    def RandomOrder(self, n:int):
+        ''' Lazily enumerates range(n) in a uniformly random order with an incremental Fisher-Yates shuffle
+            Only the displaced positions are stored, so stopping after k elements costs O(k) time and memory
+            The random numbers are drawn in batches that double in size
+        '''
+
+        displaced = {}
+        batch = 16
+        i = 0
+        while i < n:
+            for r in self.RNG.random(min(batch, n - i)).tolist():
+                j = i + int(r * (n - i)) # random position of the not yet enumerated rest
+                value = displaced.pop(i, i)
+                if j != i:
+                    displaced[j], value = value, displaced.get(j, j)
+
+                yield value
+                i += 1
+
+            batch *= 2
+
+    def RandomPairs(self, sizes:list[int]):
+        ''' Lazily enumerates all pairs (i, j) with i < j < sizes[block] of all blocks in a random order'''
+
+        for block, position in self.RandomPositions([size * (size - 1) // 2 for size in sizes]):
+            j = (1 + math.isqrt(1 + 8 * position)) // 2
+            yield block, position - j * (j - 1) // 2, j
+
+    def RandomPositions(self, sizes:list[int]):
+        ''' Lazily enumerates all (block, position) pairs of consecutive blocks with the given sizes in a random order'''
+
+        cumulated = list(itertools.accumulate(sizes))
+        total = cumulated[-1] if cumulated else 0
+
+        for g in self.RandomOrder(total):
+            block = bisect.bisect_right(cumulated, g)
+            yield block, g - (cumulated[block] - sizes[block])
+
     def EvaluateMoves(self, evaluationStrategy: str) -> None:
         ''' Define a strategy for the local search of the neighborhood and "activate" it'''
 
@@ -73,8 +158,9 @@ class BaseNeighborhood:
 
     def Update(self, new_routeplan) -> None:
         ''' Updates the actual permutation and deletes all saved Moves and Move Solutions'''
-        self.Moves.clear()
+        self.Moves = []
         self.MoveSolutions.clear()
+        self.RouteSchedules.clear()
         self.RoutePlan = new_routeplan
 
     def LocalSearch(self, neighborhoodEvaluationStrategy: str, solution: Solution) -> None:
@@ -88,7 +174,8 @@ class BaseNeighborhood:
     def constructCompleteRoute(self, move:BaseMove, solution=None) -> dict: 
         ''' Constructs the comlete Route from the Move and the BaseMove'''
 
-        adapted_Route_Plan = solution.RoutePlan if solution else self.RoutePlan
+        # Only the spine is copied, the previous solution keeps its route plan
+        adapted_Route_Plan = CopyRoutePlan(solution.RoutePlan if solution else self.RoutePlan)
 
         adapted_Route_Plan[move.Day][move.Cohort] = move.RouteDayCohort
 
@@ -102,9 +189,6 @@ class BaseNeighborhood:
         -----------
         route : list[int]
             A list of task IDs representing the sequence of tasks in the route. Task IDs greater than 1000 are considered main tasks.
-        
-        inputData : InputData
-            An object containing necessary input data such as distances, task details, and constraints.
 
         Returns:
         --------
@@ -112,67 +196,102 @@ class BaseNeighborhood:
             Returns True if the route is feasible, otherwise returns False.
         """
 
-        feasible = True
-        serviceDuration = 0
-        previousTask = 0  # Start at depot
-        mainTasks = [task for task in route if task > 1000]  # Identify all main tasks in the route
-        
         #Cache
         distances = self.InputData.distances
-        allTasks = self.InputData.allTasks
-        maxRouteDuration = self.InputData.maxRouteDuration
+        serviceTimes = self.ServiceTimes
+        startTimes = self.StartTimes
 
-        if mainTasks:
-            mainIndices = [i for i, task in enumerate(route) if task in mainTasks]  # Find the indices of all main tasks
-            previousTask = 0  # Reset to depot at the start
-            current_index = 0
-            for mainIndex in mainIndices:
-                tasksBeforeMain = route[:(mainIndex - current_index)]  # Get all tasks before the current main task
-                mainTask = route[(mainIndex - current_index)]
-                tasksAfterMain = route[(mainIndex - current_index)+1:]  # Get all tasks after the current main task
-
-                # Process tasks before the main task
-                for task in tasksBeforeMain:
-                    serviceDuration += distances[previousTask][task] + allTasks[task].service_time
-                    previousTask = task
+        serviceDuration = 0
+        previousTask = 0  # Start at depot
 
-                serviceDuration += distances[previousTask][mainTask]  # Add travel time to main task
+        for task in route:
+            serviceDuration += distances[previousTask][task]
 
+            if task > 1000:
                 # Check if the main task can be started at the earliest start time
-                if serviceDuration > allTasks[mainTask].start_time:
+                if serviceDuration > startTimes[task]:
                     return False
+                # Reset the service duration to the main task's start time
+                serviceDuration = startTimes[task]
 
-                # Reset the service duration to the main task's start time and process the main task
-                serviceDuration = allTasks[mainTask].start_time + allTasks[mainTask].service_time
-                previousTask = mainTask
+            serviceDuration += serviceTimes[task]
+            previousTask = task
 
-                # Process tasks after the main task
-                route = tasksAfterMain
-                current_index += (mainIndex + 1) 
+        serviceDuration += distances[previousTask][0]  # Add travel time to depot
 
-            # Process remaining tasks after the last main task
-            for task in route:
-                serviceDuration += distances[previousTask][task] + allTasks[task].service_time
-                previousTask = task
+        return serviceDuration <= self.InputData.maxRouteDuration
 
-            serviceDuration += distances[previousTask][0]  # Add travel time to depot
+    def GetRouteSchedule(self, day:int, cohort:int, routePlan:dict = None):
+        ''' Returns the cached schedule of the route, it is rebuilt as soon as the route has changed
+            Routes are never changed in place, a changed route is always a new list and is detected by identity
+        '''
 
-            if serviceDuration > maxRouteDuration:
-                return False
+        route = (routePlan if routePlan is not None else self.RoutePlan)[day][cohort]
+        schedule = self.RouteSchedules.get((day, cohort))
 
-        else:  # Route consists of optional tasks only
-            for task in route:
-                serviceDuration += distances[previousTask][task] + allTasks[task].service_time
-                previousTask = task
+        if schedule is None or schedule.Route is not route:
+            schedule = self.EvaluationLogic.CreateRouteSchedule(route)
+            self.RouteSchedules[(day, cohort)] = schedule
 
-            serviceDuration += distances[previousTask][0]  # Add travel time to depot
-            
-            if serviceDuration > maxRouteDuration:
-                return  False
+        return schedule
 
-        return feasible
+    def MoveFeasibilityCheck(self, move:BaseMove, routePlan:dict = None) -> bool:
+        ''' Checks the feasibility of the route changed by the move, overwritten by neighborhoods with an O(1) check'''
+        return self.SingleRouteFeasibilityCheck(move.RouteDayCohort)
+
+    def GenerateReplaceMoves(self, actual_Solution:Solution, allowEqualProfit:bool, sample:set[int] = None):
+        ''' Yields the replace moves of all (routed task, unused task) pairs in a random order, shared by the ReplaceDelta and ReplaceProfit neighborhoods
+            The matching unused tasks of every routed task are found with binary searches in the profit buckets of the solution
+            If a sample of the unused tasks is given, only the sample is indexed, so the searches never visit the other unused tasks
+        '''
+
+        candidateLists = self.InputData.candidateLists
+        unusedTasks = actual_Solution.UnusedTaskSet if sample is None else UnusedTaskSet(list(sample), self.InputData)
+
+        # Positions of all routed optional tasks
+        positions = []
+        for day in range(len(self.RoutePlan)):
+            for cohort in range(len(self.RoutePlan[day])):
+                waiting_time = actual_Solution.WaitingTimes[day, cohort]
+                route = self.RoutePlan[day][cohort]
+                for indexInRoute, taskInRoute in enumerate(route):
+                    if taskInRoute > 1000:
+                        continue
+                    predecessor, successor = self.EvaluationLogic.get_predecessor_and_succesor(route, indexInRoute)
+                    positions.append((day, cohort, route, indexInRoute, taskInRoute, waiting_time, predecessor, successor))
+
+        profits = self.Profits
+        service_times = self.ServiceTimes
+
+        # The positions are visited in a random order, the unused tasks of each position are filtered at once
+        for p in self.RandomOrder(len(positions)):
+            day, cohort, route, indexInRoute, taskInRoute, waiting_time, predecessor, successor = positions[p]
+
+            # Unused tasks with a matching profit which fit into the waiting time of the route
+            route_task_profit = profits[taskInRoute] if allowEqualProfit else profits[taskInRoute] + 1
+            max_service_time = waiting_time + service_times[taskInRoute]
+            candidates = unusedTasks.Within(route_task_profit, max_service_time)
+
+            # Granular neighborhood: the unused task needs to be close to its new predecessor or successor
+            if candidateLists is not None:
+                candidates = [unusedTask for unusedTask in candidates
+                              if predecessor in candidateLists[unusedTask] or successor in candidateLists[unusedTask]]
+
+            for c in self.RandomOrder(len(candidates)):
+                unusedTask = candidates[c]
+                # If profit matches, create a swap move
+                delta_profit = profits[unusedTask]-profits[taskInRoute]
+                yield ReplaceMove(route, day, cohort, taskInRoute, unusedTask, delta_profit, indexInRoute)
+
+    def ReplaceFeasibilityCheck(self, move:BaseMove, routePlan:dict = None) -> bool:
+        ''' O(1) feasibility check of a replace move, shared by the ReplaceDelta and ReplaceProfit neighborhoods'''
+
+        schedule = self.GetRouteSchedule(move.Day, move.Cohort, routePlan)
+        if not schedule.Feasible or move.TaskInRoute > 1000 or move.UnusedTask > 1000:
+            return self.SingleRouteFeasibilityCheck(move.RouteDayCohort)
+
+        return schedule.ReplaceFeasible(move.indexInRoute, move.UnusedTask)
 
-        
     def SingleMove(self, solution: Solution, maxAttempts) -> Solution:
         ''' Overwritten to avoid comparisons of strings'''
         
@@ -183,7 +302,7 @@ class BaseNeighborhood:
 
         while not feasible and attempt < MAX_ATTEMPTS:
             move = self.MakeOneMove(solution)
-            feasible = self.SingleRouteFeasibilityCheck(move.RouteDayCohort)
+            feasible = self.MoveFeasibilityCheck(move, solution.RoutePlan)
             attempt += 1
 
         # If a feasible move is found, evaluate and return it
@@ -213,7 +332,7 @@ class ProfitNeighborhood(BaseNeighborhood):
         
         for move_solution in self.MoveSolutions:
 
-            if self.SingleRouteFeasibilityCheck(move_solution.RouteDayCohort): 
+            if self.MoveFeasibilityCheck(move_solution): 
                 return move_solution
                     
         return None
@@ -229,7 +348,7 @@ class ProfitNeighborhood(BaseNeighborhood):
             self.EvaluateMove(move)
 
             ### NEED OF FEASIBILITY CHECK!! 
-            if self.SingleRouteFeasibilityCheck(move.RouteDayCohort):
+            if self.MoveFeasibilityCheck(move):
                 self.MoveSolutions.append(move)
                 return None
         
@@ -240,7 +359,7 @@ class ProfitNeighborhood(BaseNeighborhood):
         ''' Tries to find a better solution from the start solution by searching the neighborhod'''
 
         hasSolutionImproved = True
-        bestNeighborhoodSolution = Solution(solution.RoutePlan, self.InputData)
+        bestNeighborhoodSolution = Solution(CopyRoutePlan(solution.RoutePlan), self.InputData, solution.ReleaseUnusedTasks())
         self.EvaluationLogic.evaluateSolution(bestNeighborhoodSolution)
 
         while hasSolutionImproved:
@@ -255,9 +374,15 @@ class ProfitNeighborhood(BaseNeighborhood):
 
             if bestNeighborhoodMove is not None:
 
+                previousSolution = bestNeighborhoodSolution
+
+                # The unused tasks are handed over and only changed by the move instead of being rebuilt
+                unusedTasks = previousSolution.ReleaseUnusedTasks()
+                bestNeighborhoodMove.UpdateUnusedTasks(unusedTasks)
+
                 completeRoute = self.constructCompleteRoute(bestNeighborhoodMove)
-                bestNeighborhoodSolution = Solution(completeRoute, self.InputData)
-                self.EvaluationLogic.evaluateSolution(bestNeighborhoodSolution)
+                bestNeighborhoodSolution = Solution(completeRoute, self.InputData, unusedTasks)
+                self.EvaluationLogic.evaluateRoutes(bestNeighborhoodSolution, bestNeighborhoodMove.ChangedRoutes(), previousSolution)
 
                 self.SolutionPool.AddSolution(bestNeighborhoodSolution)
 
@@ -281,7 +406,7 @@ class DeltaNeighborhood(BaseNeighborhood):
  
         for move_solution in self.MoveSolutions:
 
-            if self.SingleRouteFeasibilityCheck(move_solution.RouteDayCohort): 
+            if self.MoveFeasibilityCheck(move_solution): 
                 return move_solution
                     
         return None
@@ -296,7 +421,7 @@ class DeltaNeighborhood(BaseNeighborhood):
 
             if move.Delta < 0:
                 
-                if self.SingleRouteFeasibilityCheck(move.RouteDayCohort):
+                if self.MoveFeasibilityCheck(move):
                     
                     self.MoveSolutions.append(move)
                     # abort neighborhood evaluation because an improvement has been found
@@ -309,7 +434,7 @@ class DeltaNeighborhood(BaseNeighborhood):
 
         hasSolutionImproved = True
 
-        bestNeighborhoodSolution = Solution(solution.RoutePlan, self.InputData)
+        bestNeighborhoodSolution = Solution(CopyRoutePlan(solution.RoutePlan), self.InputData, solution.ReleaseUnusedTasks())
         self.EvaluationLogic.evaluateSolution(bestNeighborhoodSolution)
 
         while hasSolutionImproved:
@@ -322,9 +447,15 @@ class DeltaNeighborhood(BaseNeighborhood):
 
             if bestNeighborhoodMove is not None and bestNeighborhoodMove.Delta < 0:
               
+                previousSolution = bestNeighborhoodSolution
+              
+                # The unused tasks are handed over and only changed by the move instead of being rebuilt
+                unusedTasks = previousSolution.ReleaseUnusedTasks()
+                bestNeighborhoodMove.UpdateUnusedTasks(unusedTasks)
+
                 completeRoute = self.constructCompleteRoute(bestNeighborhoodMove)
-                bestNeighborhoodSolution = Solution(completeRoute, self.InputData)
-                self.EvaluationLogic.evaluateSolution(bestNeighborhoodSolution)
+                bestNeighborhoodSolution = Solution(completeRoute, self.InputData, unusedTasks)
+                self.EvaluationLogic.evaluateRoutes(bestNeighborhoodSolution, bestNeighborhoodMove.ChangedRoutes(), previousSolution)
             
                 self.SolutionPool.AddSolution(bestNeighborhoodSolution)
             else:
@@ -339,9 +470,13 @@ class DeltaNeighborhood(BaseNeighborhood):
 class SwapIntraRouteMove(BaseMove):
     """ Represents the swap of the element at IndexA with the element at IndexB for a given permutation (= solution). """
 
+    __slots__ = ('TaskA', 'TaskB', 'indexA', 'indexB')
+
     def __init__(self, initialRoutePlan:list, day:int, cohort:int, taskA:int, taskB:int, indexA:int, indexB:int):
 
-        self.RouteDayCohort = initialRoutePlan.copy() # create a copy of the permutation
+        self.Route = initialRoutePlan # no copy, the swapped route is built lazily
+        self._routeDayCohort = None
+        self.Delta = None # may already be known from the pruning during the discovery
         self.TaskA = taskA
         self.TaskB = taskB
         self.Day = day
@@ -349,8 +484,17 @@ class SwapIntraRouteMove(BaseMove):
         self.indexA = indexA
         self.indexB = indexB
 
+    def BuildRoute(self) -> list[int]:
+        route = self.Route.copy() # create a copy of the permutation
+
         #Swap Tasks 
-        self.RouteDayCohort[self.indexA], self.RouteDayCohort[self.indexB] = self.TaskB, self.TaskA
+        route[self.indexA], route[self.indexB] = self.TaskB, self.TaskA
+
+        return route
+
+    def Apply(self, solution:Solution) -> None:
+        route = self.ReplaceRoute(solution, self.Day, self.Cohort)
+        route[self.indexA], route[self.indexB] = self.TaskB, self.TaskA
 
 class SwapIntraRouteNeighborhood(DeltaNeighborhood):
     """ Contains all $n choose 2$ swap moves for a given permutation (= solution). """
@@ -362,30 +506,75 @@ class SwapIntraRouteNeighborhood(DeltaNeighborhood):
 
 
     def DiscoverMoves(self):
-        """ Generate all $n choose 2$ moves and shuffle them """
+        """ Lazily generate all $n choose 2$ moves in a random order """
 
+        self.Moves = self.GenerateMoves()
+
+    def GenerateMoves(self):
+        """ Yields the swap moves one by one, the move objects are only created when they are examined
+            A swap which adds more travel time than the route has waiting time can never be feasible and is skipped
+        """
+
+        routes = []
         for day in range(len(self.RoutePlan)):
             for cohort in range(len(self.RoutePlan[day])):
-                # Get the cohort once and pre-filter tasks <= 1000
+                # Get the cohort once and pre-filter the positions of tasks <= 1000
                 cohort_tasks = self.RoutePlan[day][cohort]
-                valid_tasks = {task for task in cohort_tasks if task <= 1000}
+                valid_indices = [index for index, task in enumerate(cohort_tasks) if task <= 1000]
+                waiting_time = self.EvaluationLogic.WaitingTimeOneRoute(cohort_tasks)
+                routes.append((day, cohort, cohort_tasks, valid_indices, waiting_time))
+
+        for r, i, j in self.RandomPairs([len(route[3]) for route in routes]):
+            day, cohort, cohort_tasks, valid_indices, waiting_time = routes[r]
+            index_i, index_j = valid_indices[i], valid_indices[j]
+
+            # O(1) delta on the positions, the route duration can never be shorter than its travel and service times
+            delta = self.EvaluationLogic.SwapIntraRouteDelta(cohort_tasks, index_i, index_j)
+            if delta > waiting_time:
+                continue
 
-                # Generate combinations of two distinct tasks
-                for task_i, task_j in itertools.combinations(valid_tasks, 2):
-                    index_i = cohort_tasks.index(task_i)
-                    index_j = cohort_tasks.index(task_j)
-                    # Create Swap Move Objects with different permutations
-                    self.Moves.append(SwapIntraRouteMove(cohort_tasks, day, cohort, task_i, task_j, index_i, index_j))
+            # Create Swap Move Objects with different permutations
+            move = SwapIntraRouteMove(cohort_tasks, day, cohort, cohort_tasks[index_i], cohort_tasks[index_j], index_i, index_j)
+            move.setDelta(delta)
+            yield move
 
-        # Shuffle the Moves at the end
-        self.RNG.shuffle(self.Moves)
 
+    def EvaluateMovesBestImprovement(self) -> None:
+        """ Calculates the deltas of all swaps of a route at once and only keeps the improving moves """
+
+        if not self.EvaluationLogic.SupportsVectorizedDeltas:
+            return super().EvaluateMovesBestImprovement()
+
+        for day in range(len(self.RoutePlan)):
+            for cohort in range(len(self.RoutePlan[day])):
+                cohort_tasks = self.RoutePlan[day][cohort]
+                indicesA, indicesB, deltas = self.EvaluationLogic.CalculateSwapIntraRouteDeltas(cohort_tasks)
+
+                # Only improving moves can be chosen by the local search, the others are never created
+                for k in numpy.flatnonzero(deltas < 0):
+                    index_i, index_j = int(indicesA[k]), int(indicesB[k])
+                    move = SwapIntraRouteMove(cohort_tasks, day, cohort, cohort_tasks[index_i], cohort_tasks[index_j], index_i, index_j)
+                    move.setDelta(int(deltas[k]))
+                    self.MoveSolutions.append(move)
+
+        # Random order of moves with the same delta, like the shuffled move list
+        self.RNG.shuffle(self.MoveSolutions)
 
     def EvaluateMove(self, move:SwapIntraRouteMove) -> None:
         ''' Calculates the MakeSpan of thr certain move - adds to recent Solution'''
 
-        #Update the Delta of the Move
-        move.setDelta(self.EvaluationLogic.CalculateSwapIntraRouteDelta(move))
+        #Update the Delta of the Move, unless it is already known from the discovery
+        if move.Delta is None:
+            move.setDelta(self.EvaluationLogic.CalculateSwapIntraRouteDelta(move))
+
+    def MoveFeasibilityCheck(self, move:SwapIntraRouteMove, routePlan:dict = None) -> bool:
+        ''' O(1) feasibility check with the forward slack of the route'''
+
+        schedule = self.GetRouteSchedule(move.Day, move.Cohort, routePlan)
+        if not schedule.Feasible:
+            return self.SingleRouteFeasibilityCheck(move.RouteDayCohort)
+
+        return schedule.SwapFeasible(move.indexA, move.indexB)
     
     def MakeOneMove(self, solution: Solution) -> SwapIntraRouteMove:  
         # Randomly select a day and cohort
@@ -395,22 +584,26 @@ class SwapIntraRouteNeighborhood(DeltaNeighborhood):
         # Get the cohort once to avoid redundant lookups
         cohort_tasks = solution.RoutePlan[day][cohort]
 
-        validTasks = {task for task in solution.RoutePlan[day][cohort] if task <= 1000}
-
-        # Randomly select two distinct indices in one step
-        task_i, task_j = self.RNG.choice(list(validTasks), size=2, replace=False)
+        valid_indices = [index for index, task in enumerate(cohort_tasks) if task <= 1000]
 
-        index_i, index_j = cohort_tasks.index(task_i), cohort_tasks.index(task_j)
+        # Randomly select two distinct positions in one step
+        index_i, index_j = self.RNG.choice(valid_indices, size=2, replace=False)
+        index_i, index_j = int(index_i), int(index_j)
 
         # Create and return the move
-        return SwapIntraRouteMove(cohort_tasks, day, cohort, task_i, task_j, index_i, index_j)
+        return SwapIntraRouteMove(cohort_tasks, day, cohort, cohort_tasks[index_i], cohort_tasks[index_j], index_i, index_j)
        
 class SwapInterRouteMove(BaseMove):
     """ Represents the swap of tasks between different routes possibly on the same or different days. """
 
-    def __init__(self, initialRoutePlan, dayA:int, cohortA:int, taskA:int, dayB:int, cohortB:int, taskB:int):
-        self.RouteDayCohortA = initialRoutePlan[dayA][cohortA].copy() 
-        self.RouteDayCohortB = initialRoutePlan[dayB][cohortB].copy() # create a copy of the route plan
+    __slots__ = ('RouteA', 'RouteB', '_routeDayCohortA', '_routeDayCohortB', 'TaskA', 'TaskB',
+                 'DayA', 'CohortA', 'DayB', 'CohortB', 'indexA', 'indexB')
+
+    def __init__(self, initialRoutePlan, dayA:int, cohortA:int, taskA:int, dayB:int, cohortB:int, taskB:int, indexA:int = None, indexB:int = None):
+        self.RouteA = initialRoutePlan[dayA][cohortA]
+        self.RouteB = initialRoutePlan[dayB][cohortB] # no copies, the swapped routes are built lazily
+        self._routeDayCohortA = None
+        self._routeDayCohortB = None
         self.TaskA = taskA
         self.TaskB = taskB
         self.DayA = dayA
@@ -419,23 +612,51 @@ class SwapInterRouteMove(BaseMove):
         self.CohortB = cohortB
 
         # Get the indices
-        self.indexA = self.RouteDayCohortA.index(self.TaskA)
-        self.indexB = self.RouteDayCohortB.index(self.TaskB)
-
-        # Swap the tasks between routes
-        self.RouteDayCohortA[self.indexA], self.RouteDayCohortB[self.indexB] = self.TaskB, self.TaskA
+        self.indexA = indexA if indexA is not None else self.RouteA.index(self.TaskA)
+        self.indexB = indexB if indexB is not None else self.RouteB.index(self.TaskB)
+
+    @property
+    def RouteDayCohortA(self) -> list[int]:
+        ''' Copy of route A with task B swapped in, built on first access'''
+        if self._routeDayCohortA is None:
+            self._routeDayCohortA = self.RouteA.copy()
+            self._routeDayCohortA[self.indexA] = self.TaskB
+        return self._routeDayCohortA
+
+    @property
+    def RouteDayCohortB(self) -> list[int]:
+        ''' Copy of route B with task A swapped in, built on first access'''
+        if self._routeDayCohortB is None:
+            self._routeDayCohortB = self.RouteB.copy()
+            self._routeDayCohortB[self.indexB] = self.TaskA
+        return self._routeDayCohortB
+
+    def ChangedRoutes(self) -> list[tuple[int, int]]:
+        ''' Returns the (day, cohort) keys of both changed routes'''
+        return [(self.DayA, self.CohortA), (self.DayB, self.CohortB)]
+
+    def Apply(self, solution:Solution) -> None:
+        self.ReplaceRoute(solution, self.DayA, self.CohortA)[self.indexA] = self.TaskB
+        self.ReplaceRoute(solution, self.DayB, self.CohortB)[self.indexB] = self.TaskA
 
 class SwapInterRouteNeighborhood(DeltaNeighborhood):
     """ Contains all moves for swapping tasks between different routes possibly on the same or different days. """
 
-    def __init__(self, inputData:InputData, evaluationLogic:EvaluationLogic, solutionPool:SolutionPool, rng):
+    def __init__(self, inputData:InputData, evaluationLogic:EvaluationLogic, solutionPool:SolutionPool, rng, exhaustive:bool = False):
         super().__init__(inputData, evaluationLogic, solutionPool, rng)
-        self.Type = 'SwapInterRoute'
+        self.Type = 'SwapInterRouteExhaustive' if exhaustive else 'SwapInterRoute'
+
+        # Scan all route pairs (pruned by the candidate lists) instead of sampling days and cohorts
+        self.Exhaustive = exhaustive
 
     def DiscoverMoves(self, actual_Solution:Solution):
     #def DiscoverMoves(self, actualSolution:Solution):
         """ Generate all possible swaps between tasks in different routes (days and different cohorts). """
 
+        if self.Exhaustive:
+            self.Moves = self.GenerateAllMoves(actual_Solution)
+            return
+
         # Choose 2 random days to include in the neighborhood
 
         days = self.RNG.choice(range(len(self.RoutePlan)), 2)
@@ -446,45 +667,85 @@ class SwapInterRouteNeighborhood(DeltaNeighborhood):
         #cohorts = range(len(self.RoutePlan[0]))
 
 
-        # Pre-filter tasks to only include those that meet the condition task <= 1000
-        valid_tasks_by_day_and_cohort = {
-            (day, cohort): {task for task in self.RoutePlan[day][cohort] if task <= 1000}
+        self.Moves = self.GenerateMoves(actual_Solution, days, cohorts)
+
+    def GenerateMoves(self, actual_Solution:Solution, days, cohorts):
+        """ Yields the swap moves one by one in a random order, the move objects are only created when they are examined """
+
+        # Pre-filter the positions of tasks that meet the condition task <= 1000
+        valid_indices_by_day_and_cohort = {
+            (day, cohort): [index for index, task in enumerate(self.RoutePlan[day][cohort]) if task <= 1000]
             for day in days
             for cohort in cohorts
         }
 
-        # Generate valid task pairs across different routes (days) and ensure different cohorts
-        for (dayA, cohortA), (dayB, cohortB) in itertools.combinations(valid_tasks_by_day_and_cohort.keys(), 2):
+        # Valid pairs of routes across different routes (days) and ensure different cohorts
+        route_pairs = [((dayA, cohortA), (dayB, cohortB))
+                       for (dayA, cohortA), (dayB, cohortB) in itertools.combinations(valid_indices_by_day_and_cohort.keys(), 2)
+                       if not (dayA == dayB and cohortA == cohortB)]
+        sizes = [len(valid_indices_by_day_and_cohort[keyA]) * len(valid_indices_by_day_and_cohort[keyB]) for keyA, keyB in route_pairs]
+        waiting_times = {key: actual_Solution.WaitingTimes[key] for key in valid_indices_by_day_and_cohort}
+
+        for pair, position in self.RandomPositions(sizes):
+            (dayA, cohortA), (dayB, cohortB) = route_pairs[pair]
+            indicesB = valid_indices_by_day_and_cohort[(dayB, cohortB)]
+            indexA = valid_indices_by_day_and_cohort[(dayA, cohortA)][position // len(indicesB)]
+            indexB = indicesB[position % len(indicesB)]
+
+            taskA = self.RoutePlan[dayA][cohortA][indexA]
+            taskB = self.RoutePlan[dayB][cohortB][indexB]
+            service_time_A = self.ServiceTimes[taskA]
+            service_time_B = self.ServiceTimes[taskB]
+
+            if waiting_times[(dayA, cohortA)] < service_time_B - service_time_A:
+                continue
+            if waiting_times[(dayB, cohortB)] < service_time_A - service_time_B:
+                continue
+            # Create the move object for swapping tasks between dayA and dayB, different cohorts
+            yield SwapInterRouteMove(self.RoutePlan, dayA, cohortA, taskA, dayB, cohortB, taskB, indexA, indexB)
+
+    def GenerateAllMoves(self, actual_Solution:Solution):
+        """ Yields the swap moves of all route pairs in a random order
+            Granular neighborhood: task B is only swapped into the position of task A if it is a candidate of the predecessor or successor of task A
+            A pair is kept if one of both tasks fits the position of the other one, so only plausible pairs are evaluated
+        """
 
-            # Ensure that day and cohort are nrever the same
-            if dayA == dayB and cohortA == cohortB:
-                continue  # Skip if cohorts are the same
-            
-            tasksA = valid_tasks_by_day_and_cohort[(dayA, cohortA)]
-            tasksB = valid_tasks_by_day_and_cohort[(dayB, cohortB)]
-            waiting_timeA = actual_Solution.WaitingTimes[dayA, cohortA]
-            waiting_timeB = actual_Solution.WaitingTimes[dayB, cohortB]
-
-            # Precompute service times for tasks in tasksA and tasksB
-            #TODO: Test the speed here! 
-            service_times_A = {task: self.InputData.allTasks[task].service_time for task in tasksA}
-            service_times_B = {task: self.InputData.allTasks[task].service_time for task in tasksB}
-
-
-            for taskA in tasksA:
-                service_time_A = service_times_A[taskA]  # Precomputed service time for taskA
-                for taskB in tasksB:
-                    service_time_B = service_times_B[taskB]  # Precomputed service time for taskB
-                    if waiting_timeA < service_time_B - service_time_A:
-                        continue
-                    if waiting_timeB < service_time_A - service_time_B:
-                        continue
-                    # Create the move object for swapping tasks between dayA and dayB, different cohorts
-                    self.Moves.append(SwapInterRouteMove(self.RoutePlan, dayA, cohortA, taskA, dayB, cohortB, taskB))
-                   
+        candidateLists = self.InputData.candidateLists
+        if candidateLists is None:
+            yield from self.GenerateMoves(actual_Solution, range(len(self.RoutePlan)), range(len(self.RoutePlan[0])))
+            return
 
-        # Shuffle the generated moves
-        self.RNG.shuffle(self.Moves)
+        # Position (day, cohort, index) of every routed optional task
+        positions = {}
+        for day in range(len(self.RoutePlan)):
+            for cohort in range(len(self.RoutePlan[day])):
+                for index, task in enumerate(self.RoutePlan[day][cohort]):
+                    if task <= 1000:
+                        positions[task] = (day, cohort, index)
+
+        pairs = set()
+        for taskA, (dayA, cohortA, indexA) in positions.items():
+            predecessor, successor = self.EvaluationLogic.get_predecessor_and_succesor(self.RoutePlan[dayA][cohortA], indexA)
+            for taskB in candidateLists[predecessor] | candidateLists[successor]:
+                positionB = positions.get(taskB)
+                if positionB is None or (positionB[0] == dayA and positionB[1] == cohortA):
+                    continue
+                pairs.add((taskA, taskB) if taskA < taskB else (taskB, taskA))
+        pairs = sorted(pairs)
+
+        waiting_times = actual_Solution.WaitingTimes
+        for p in self.RandomOrder(len(pairs)):
+            taskA, taskB = pairs[p]
+            dayA, cohortA, indexA = positions[taskA]
+            dayB, cohortB, indexB = positions[taskB]
+            service_time_A = self.ServiceTimes[taskA]
+            service_time_B = self.ServiceTimes[taskB]
+
+            if waiting_times[dayA, cohortA] < service_time_B - service_time_A:
+                continue
+            if waiting_times[dayB, cohortB] < service_time_A - service_time_B:
+                continue
+            yield SwapInterRouteMove(self.RoutePlan, dayA, cohortA, taskA, dayB, cohortB, taskB, indexA, indexB)
 
     
     def SingleMove(self, solution: Solution, maxAttempts) -> Solution:
@@ -498,7 +759,7 @@ class SwapInterRouteNeighborhood(DeltaNeighborhood):
 
         while not feasible and attempt < MAX_ATTEMPTS:
             move = self.MakeOneMove(solution)
-            feasible = self.SingleRouteFeasibilityCheck(move.RouteDayCohortA) and self.SingleRouteFeasibilityCheck(move.RouteDayCohortB)
+            feasible = self.MoveFeasibilityCheck(move, solution.RoutePlan)
             attempt += 1
 
         # If a feasible move is found, evaluate and return it
@@ -512,7 +773,7 @@ class SwapInterRouteNeighborhood(DeltaNeighborhood):
     
     def constructCompleteRoute(self, move:SwapInterRouteMove, solution = None) -> dict: 
         ''' Constructs the comlete Route from the Move and the BaseMove'''
-        adapted_Route_Plan = solution.RoutePlan if solution else self.RoutePlan
+        adapted_Route_Plan = CopyRoutePlan(solution.RoutePlan if solution else self.RoutePlan)
 
         adapted_Route_Plan[move.DayA][move.CohortA] = move.RouteDayCohortA
         adapted_Route_Plan[move.DayB][move.CohortB] = move.RouteDayCohortB
@@ -531,7 +792,7 @@ class SwapInterRouteNeighborhood(DeltaNeighborhood):
 
             if move.Delta < 0:
                 
-                if self.SingleRouteFeasibilityCheck(move.RouteDayCohortA) and self.SingleRouteFeasibilityCheck(move.RouteDayCohortB):
+                if self.MoveFeasibilityCheck(move):
                     
                     self.MoveSolutions.append(move)
                     # abort neighborhood evaluation because an improvement has been found
@@ -545,7 +806,7 @@ class SwapInterRouteNeighborhood(DeltaNeighborhood):
 
         for move_solution in self.MoveSolutions:
 
-            if self.SingleRouteFeasibilityCheck(move_solution.RouteDayCohortA) and self.SingleRouteFeasibilityCheck(move_solution.RouteDayCohortB): 
+            if self.MoveFeasibilityCheck(move_solution): 
                 return move_solution
                     
         return None
@@ -555,6 +816,16 @@ class SwapInterRouteNeighborhood(DeltaNeighborhood):
 
         #Update the Delta of the Move
         move.setDelta(self.EvaluationLogic.CalculateSwapInterRouteDelta(move))
+
+    def MoveFeasibilityCheck(self, move:SwapInterRouteMove, routePlan:dict = None) -> bool:
+        ''' O(1) feasibility check with the forward slack of both routes, each route gets one task replaced'''
+
+        scheduleA = self.GetRouteSchedule(move.DayA, move.CohortA, routePlan)
+        scheduleB = self.GetRouteSchedule(move.DayB, move.CohortB, routePlan)
+        if not (scheduleA.Feasible and scheduleB.Feasible):
+            return self.SingleRouteFeasibilityCheck(move.RouteDayCohortA) and self.SingleRouteFeasibilityCheck(move.RouteDayCohortB)
+
+        return scheduleA.ReplaceFeasible(move.indexA, move.TaskB) and scheduleB.ReplaceFeasible(move.indexB, move.TaskA)
     
     def MakeOneMove(self, solution:Solution) -> SwapInterRouteMove:
 
@@ -577,7 +848,7 @@ class SwapInterRouteNeighborhood(DeltaNeighborhood):
         ''' Own Definition to avoid string comparisons'''
 
         hasSolutionImproved = True
-        bestNeighborhoodSolution = Solution(solution.RoutePlan, self.InputData)
+        bestNeighborhoodSolution = Solution(CopyRoutePlan(solution.RoutePlan), self.InputData, solution.ReleaseUnusedTasks())
         self.EvaluationLogic.evaluateSolution(bestNeighborhoodSolution)
 
         while hasSolutionImproved:
@@ -590,9 +861,15 @@ class SwapInterRouteNeighborhood(DeltaNeighborhood):
 
             if bestNeighborhoodMove is not None and bestNeighborhoodMove.Delta < 0:
 
+                previousSolution = bestNeighborhoodSolution
+
+                # The unused tasks are handed over and only changed by the move instead of being rebuilt
+                unusedTasks = previousSolution.ReleaseUnusedTasks()
+                bestNeighborhoodMove.UpdateUnusedTasks(unusedTasks)
+
                 completeRoute = self.constructCompleteRoute(bestNeighborhoodMove)
-                bestNeighborhoodSolution = Solution(completeRoute, self.InputData)
-                self.EvaluationLogic.evaluateSolution(bestNeighborhoodSolution)
+                bestNeighborhoodSolution = Solution(completeRoute, self.InputData, unusedTasks)
+                self.EvaluationLogic.evaluateRoutes(bestNeighborhoodSolution, bestNeighborhoodMove.ChangedRoutes(), previousSolution)
 
                 self.SolutionPool.AddSolution(bestNeighborhoodSolution)
             else:
@@ -600,12 +877,477 @@ class SwapInterRouteNeighborhood(DeltaNeighborhood):
                 hasSolutionImproved = False
 
         return bestNeighborhoodSolution
+
+class RelocateInterRouteMove(BaseMove):
+    """ Represents the relocation of the optional task at IndexA of route A to the position IndexB of route B (different route, possibly on another day). """
+
+    __slots__ = ('RouteA', 'RouteB', '_routeDayCohortA', '_routeDayCohortB', 'Task',
+                 'DayA', 'CohortA', 'DayB', 'CohortB', 'indexA', 'indexB')
+
+    def __init__(self, initialRoutePlan, dayA:int, cohortA:int, indexA:int, dayB:int, cohortB:int, indexB:int):
+        self.RouteA = initialRoutePlan[dayA][cohortA]
+        self.RouteB = initialRoutePlan[dayB][cohortB] # no copies, the changed routes are built lazily
+        self._routeDayCohortA = None
+        self._routeDayCohortB = None
+        self.DayA = dayA
+        self.CohortA = cohortA
+        self.DayB = dayB
+        self.CohortB = cohortB
+        self.indexA = indexA # position of the task in route A
+        self.indexB = indexB # the task is inserted between RouteB[indexB - 1] and RouteB[indexB]
+        self.Task = self.RouteA[indexA]
+
+    @property
+    def RouteDayCohortA(self) -> list[int]:
+        ''' Copy of route A without the task, built on first access'''
+        if self._routeDayCohortA is None:
+            self._routeDayCohortA = self.RouteA[:self.indexA] + self.RouteA[self.indexA + 1:]
+        return self._routeDayCohortA
+
+    @property
+    def RouteDayCohortB(self) -> list[int]:
+        ''' Copy of route B with the inserted task, built on first access'''
+        if self._routeDayCohortB is None:
+            self._routeDayCohortB = self.RouteB[:self.indexB] + [self.Task] + self.RouteB[self.indexB:]
+        return self._routeDayCohortB
+
+    def ChangedRoutes(self) -> list[tuple[int, int]]:
+        ''' Returns the (day, cohort) keys of both changed routes'''
+        return [(self.DayA, self.CohortA), (self.DayB, self.CohortB)]
+
+    def Apply(self, solution:Solution) -> None:
+        del self.ReplaceRoute(solution, self.DayA, self.CohortA)[self.indexA]
+        self.ReplaceRoute(solution, self.DayB, self.CohortB).insert(self.indexB, self.Task)
+
+class RelocateInterRouteNeighborhood(DeltaNeighborhood):
+    """ Contains all moves relocating one optional task to another route possibly on another day.
+        The travel time freed on one route can be used by the Insert neighborhood to add profit.
+    """
+
+    def __init__(self, inputData:InputData, evaluationLogic:EvaluationLogic, solutionPool:SolutionPool, rng):
+        super().__init__(inputData, evaluationLogic, solutionPool, rng)
+        self.Type = 'RelocateInterRoute'
+
+    def DiscoverMoves(self):
+        """ Lazily generate all relocations in a random order """
+
+        self.Moves = self.GenerateMoves()
+
+    def GenerateMoves(self):
+        """ Yields the relocate moves of all (task, target route, position) combinations in a random order """
+
+        candidateLists = self.InputData.candidateLists
+
+        # All routes with their insertion positions (index, predecessor, successor)
+        routes = []
+        for day in range(len(self.RoutePlan)):
+            for cohort in range(len(self.RoutePlan[day])):
+                route = self.RoutePlan[day][cohort]
+                positions = [(index, route[index - 1] if index > 0 else 0, route[index] if index < len(route) else 0)
+                             for index in range(len(route) + 1)]
+                routes.append((day, cohort, route, self.EvaluationLogic.WaitingTimeOneRoute(route), positions))
+
+        # Positions of all optional tasks that can be relocated
+        sources = [(r, index) for r, (day, cohort, route, waiting_time, positions) in enumerate(routes)
+                   for index, task in enumerate(route) if task <= 1000]
+
+        # The (task, target route) pairs are visited in a random order, the positions of each pair are filtered at once
+        number_routes = len(routes)
+        for g in self.RandomOrder(len(sources) * number_routes):
+            source, indexA = sources[g // number_routes]
+            target = g % number_routes
+            if source == target:
+                continue
+
+            dayA, cohortA, routeA, _, _ = routes[source]
+            dayB, cohortB, routeB, waiting_time, positions = routes[target]
+            task = routeA[indexA]
+
+            # The target route needs at least the service time of the task as waiting time
+            if self.ServiceTimes[task] > waiting_time:
+                continue
+
+            indices = [index for index, predecessor, successor in positions]
+            # Granular neighborhood: only insert the task next to one of its candidates
+            if candidateLists is not None:
+                candidates = candidateLists[task]
+                indices = [index for index, predecessor, successor in positions if predecessor in candidates or successor in candidates]
+
+            for i in self.RandomOrder(len(indices)):
+                yield RelocateInterRouteMove(self.RoutePlan, dayA, cohortA, indexA, dayB, cohortB, indices[i])
+
+    def constructCompleteRoute(self, move:RelocateInterRouteMove, solution = None) -> dict: 
+        ''' Constructs the comlete Route from the Move and the BaseMove'''
+        adapted_Route_Plan = CopyRoutePlan(solution.RoutePlan if solution else self.RoutePlan)
+
+        adapted_Route_Plan[move.DayA][move.CohortA] = move.RouteDayCohortA
+        adapted_Route_Plan[move.DayB][move.CohortB] = move.RouteDayCohortB
+
+        return adapted_Route_Plan
+
+    def EvaluateMove(self, move:RelocateInterRouteMove) -> None:
+
+        #Update the Delta of the Move
+        move.setDelta(self.EvaluationLogic.CalculateRelocateInterRouteDelta(move))
+
+    def MoveFeasibilityCheck(self, move:RelocateInterRouteMove, routePlan:dict = None) -> bool:
+        ''' O(1) feasibility check with the forward slack of both routes, one task is removed from route A and inserted into route B'''
+
+        scheduleA = self.GetRouteSchedule(move.DayA, move.CohortA, routePlan)
+        scheduleB = self.GetRouteSchedule(move.DayB, move.CohortB, routePlan)
+        if not (scheduleA.Feasible and scheduleB.Feasible):
+            return self.SingleRouteFeasibilityCheck(move.RouteDayCohortA) and self.SingleRouteFeasibilityCheck(move.RouteDayCohortB)
+
+        return scheduleA.RemoveFeasible(move.indexA) and scheduleB.InsertFeasible(move.indexB, move.Task)
+
+    def MakeOneMove(self, solution:Solution) -> RelocateInterRouteMove:
+
+        # Route A needs an optional task, route B is any other route
+        routeKeys = [(day, cohort) for day in range(len(solution.RoutePlan)) for cohort in range(len(solution.RoutePlan[day]))]
+        sourceKeys = [key for key in routeKeys if any(task <= 1000 for task in solution.RoutePlan[key[0]][key[1]])]
+
+        dayA, cohortA = sourceKeys[self.RNG.integers(len(sourceKeys))]
+        dayB, cohortB = dayA, cohortA
+        while (dayB, cohortB) == (dayA, cohortA):
+            dayB, cohortB = routeKeys[self.RNG.integers(len(routeKeys))]
+
+        routeA = solution.RoutePlan[dayA][cohortA]
+        indexA = int(self.RNG.choice([index for index, task in enumerate(routeA) if task <= 1000]))
+        indexB = int(self.RNG.integers(len(solution.RoutePlan[dayB][cohortB]) + 1))
+
+        return RelocateInterRouteMove(solution.RoutePlan, dayA, cohortA, indexA, dayB, cohortB, indexB)
+
+class OrOptMove(BaseMove):
+    """ Represents the move of a segment of 1-3 consecutive optional tasks starting at IndexA of route A to the position IndexB of route B.
+        Route B can be route A itself, IndexB then refers to the unchanged route and lies outside of the segment.
+        The segment can be inserted in reversed order.
+    """
+
+    __slots__ = ('RouteA', 'RouteB', '_routeDayCohortA', '_routeDayCohortB', 'Segment', 'Reverse',
+                 'DayA', 'CohortA', 'DayB', 'CohortB', 'indexA', 'indexB')
+
+    def __init__(self, initialRoutePlan, dayA:int, cohortA:int, indexA:int, length:int, dayB:int, cohortB:int, indexB:int, reverse:bool = False):
+        self.RouteA = initialRoutePlan[dayA][cohortA]
+        self.RouteB = initialRoutePlan[dayB][cohortB] # no copies, the changed routes are built lazily
+        self._routeDayCohortA = None
+        self._routeDayCohortB = None
+        self.DayA = dayA
+        self.CohortA = cohortA
+        self.DayB = dayB
+        self.CohortB = cohortB
+        self.indexA = indexA # position of the first task of the segment in route A
+        self.indexB = indexB # the segment is inserted between RouteB[indexB - 1] and RouteB[indexB]
+        self.Segment = self.RouteA[indexA:indexA + length]
+        self.Reverse = reverse
+
+    @property
+    def IntraRoute(self) -> bool:
+        return self.DayA == self.DayB and self.CohortA == self.CohortB
+
+    def InsertedSegment(self) -> list[int]:
+        return self.Segment[::-1] if self.Reverse else self.Segment
+
+    def _BuildRoutes(self) -> None:
+        ''' Builds the copies of both changed routes, route A and route B are the same list for an intra route move'''
+        routeA, segment, length = self.RouteA, self.InsertedSegment(), len(self.Segment)
+        start, index = self.indexA, self.indexB
+
+        if not self.IntraRoute:
+            self._routeDayCohortA = routeA[:start] + routeA[start + length:]
+            self._routeDayCohortB = self.RouteB[:index] + segment + self.RouteB[index:]
+        elif index < start:
+            self._routeDayCohortA = self._routeDayCohortB = routeA[:index] + segment + routeA[index:start] + routeA[start + length:]
+        else:
+            self._routeDayCohortA = self._routeDayCohortB = routeA[:start] + routeA[start + length:index] + segment + routeA[index:]
+
+    @property
+    def RouteDayCohortA(self) -> list[int]:
+        ''' Copy of route A without the segment (with the moved segment for an intra route move), built on first access'''
+        if self._routeDayCohortA is None:
+            self._BuildRoutes()
+        return self._routeDayCohortA
+
+    @property
+    def RouteDayCohortB(self) -> list[int]:
+        ''' Copy of route B with the inserted segment, built on first access'''
+        if self._routeDayCohortB is None:
+            self._BuildRoutes()
+        return self._routeDayCohortB
+
+    def ChangedRoutes(self) -> list[tuple[int, int]]:
+        ''' Returns the (day, cohort) keys of the changed routes'''
+        if self.IntraRoute:
+            return [(self.DayA, self.CohortA)]
+        return [(self.DayA, self.CohortA), (self.DayB, self.CohortB)]
+
+    def _InsertPosition(self) -> int:
+        ''' Position of the segment in route B after the segment has been removed'''
+        if self.IntraRoute and self.indexB > self.indexA:
+            return self.indexB - len(self.Segment)
+        return self.indexB
+
+    def Apply(self, solution:Solution) -> None:
+        position = self._InsertPosition()
+        del self.ReplaceRoute(solution, self.DayA, self.CohortA)[self.indexA:self.indexA + len(self.Segment)]
+        self.ReplaceRoute(solution, self.DayB, self.CohortB)[position:position] = self.InsertedSegment()
+
+class OrOptNeighborhood(DeltaNeighborhood):
+    """ Contains all moves of segments of 1-3 consecutive optional tasks to another position of the same or another route, optionally reversed. """
+
+    def __init__(self, inputData:InputData, evaluationLogic:EvaluationLogic, solutionPool:SolutionPool, rng):
+        super().__init__(inputData, evaluationLogic, solutionPool, rng)
+        self.Type = 'OrOpt'
+        self.MaxSegmentLength = 3
+
+    def DiscoverMoves(self):
+        """ Lazily generate all Or-opt moves in a random order """
+
+        self.Moves = self.GenerateMoves()
+
+    def GenerateMoves(self):
+        """ Yields the Or-opt moves of all (segment, target route, position, orientation) combinations in a random order """
+
+        candidateLists = self.InputData.candidateLists
+
+        # All routes with their insertion positions (index, predecessor, successor)
+        routes = []
+        for day in range(len(self.RoutePlan)):
+            for cohort in range(len(self.RoutePlan[day])):
+                route = self.RoutePlan[day][cohort]
+                positions = [(index, route[index - 1] if index > 0 else 0, route[index] if index < len(route) else 0)
+                             for index in range(len(route) + 1)]
+                routes.append((day, cohort, route, self.EvaluationLogic.WaitingTimeOneRoute(route), positions))
+
+        # All segments of consecutive optional tasks (route, start, length)
+        segments = []
+        for r, (day, cohort, route, waiting_time, positions) in enumerate(routes):
+            for start in range(len(route)):
+                for length in range(1, self.MaxSegmentLength + 1):
+                    if start + length > len(route) or route[start + length - 1] > 1000:
+                        break
+                    segments.append((r, start, length))
+
+        # The (segment, target route) pairs are visited in a random order, the positions of each pair are filtered at once
+        number_routes = len(routes)
+        for g in self.RandomOrder(len(segments) * number_routes):
+            source, start, length = segments[g // number_routes]
+            target = g % number_routes
+
+            dayA, cohortA, routeA, _, _ = routes[source]
+            dayB, cohortB, routeB, waiting_time, positions = routes[target]
+            first, last = routeA[start], routeA[start + length - 1]
+
+            if source == target:
+                # Inserting the segment directly before or after itself does not change the route
+                positions = [position for position in positions if not start <= position[0] <= start + length]
+            elif sum(self.ServiceTimes[task] for task in routeA[start:start + length]) > waiting_time:
+                # The target route needs at least the service time of the segment as waiting time
+                continue
+
+            # Granular neighborhood: the segment needs to be close to its new predecessor or successor in one of its orientations
+            orientations = (False, True) if length > 1 else (False,)
+            if candidateLists is not None:
+                options = [(index, reverse) for index, predecessor, successor in positions for reverse in orientations
+                           if predecessor in candidateLists[last if reverse else first] or successor in candidateLists[first if reverse else last]]
+            else:
+                options = [(index, reverse) for index, predecessor, successor in positions for reverse in orientations]
+
+            for i in self.RandomOrder(len(options)):
+                index, reverse = options[i]
+                yield OrOptMove(self.RoutePlan, dayA, cohortA, start, length, dayB, cohortB, index, reverse)
+
+    def constructCompleteRoute(self, move:OrOptMove, solution = None) -> dict: 
+        ''' Constructs the comlete Route from the Move and the BaseMove'''
+        adapted_Route_Plan = CopyRoutePlan(solution.RoutePlan if solution else self.RoutePlan)
+
+        adapted_Route_Plan[move.DayA][move.CohortA] = move.RouteDayCohortA
+        adapted_Route_Plan[move.DayB][move.CohortB] = move.RouteDayCohortB
+
+        return adapted_Route_Plan
+
+    def EvaluateMove(self, move:OrOptMove) -> None:
+
+        #Update the Delta of the Move
+        move.setDelta(self.EvaluationLogic.CalculateOrOptDelta(move))
+
+    def MoveFeasibilityCheck(self, move:OrOptMove, routePlan:dict = None) -> bool:
+        ''' O(1) feasibility check with the forward slack of the routes
+            An intra route move with a main task between the old and the new position of the segment is checked on the complete route
+        '''
+
+        scheduleA = self.GetRouteSchedule(move.DayA, move.CohortA, routePlan)
+        end = move.indexA + len(move.Segment) - 1
+
+        if move.IntraRoute:
+            # Only the positions between the old and the new position of the segment are rearranged
+            start, stop = (move.indexB, end) if move.indexB < move.indexA else (move.indexA, move.indexB - 1)
+            if not scheduleA.Feasible or scheduleA.ContainsMainTask(start, stop):
+                return self.SingleRouteFeasibilityCheck(move.RouteDayCohortA)
+
+            return scheduleA.RearrangeFeasible(start, stop, self.EvaluationLogic.CalculateOrOptDelta(move))
+
+        scheduleB = self.GetRouteSchedule(move.DayB, move.CohortB, routePlan)
+        if not (scheduleA.Feasible and scheduleB.Feasible):
+            return self.SingleRouteFeasibilityCheck(move.RouteDayCohortA) and self.SingleRouteFeasibilityCheck(move.RouteDayCohortB)
+
+        return scheduleA.RemoveFeasible(move.indexA, end) and scheduleB.InsertSegmentFeasible(move.indexB, move.InsertedSegment())
+
+    def MakeOneMove(self, solution:Solution) -> OrOptMove:
+
+        # Route A needs an optional task, route B is any route including route A
+        routeKeys = [(day, cohort) for day in range(len(solution.RoutePlan)) for cohort in range(len(solution.RoutePlan[day]))]
+        sourceKeys = [key for key in routeKeys if any(task <= 1000 for task in solution.RoutePlan[key[0]][key[1]])]
+
+        dayA, cohortA = sourceKeys[self.RNG.integers(len(sourceKeys))]
+        routeA = solution.RoutePlan[dayA][cohortA]
+        start = int(self.RNG.choice([index for index, task in enumerate(routeA) if task <= 1000]))
+
+        # The segment ends at the next main task or the end of the route
+        length = int(self.RNG.integers(1, self.MaxSegmentLength + 1))
+        for k in range(1, length):
+            if start + k >= len(routeA) or routeA[start + k] > 1000:
+                length = k
+                break
+
+        while True:
+            dayB, cohortB = routeKeys[self.RNG.integers(len(routeKeys))]
+            routeB = solution.RoutePlan[dayB][cohortB]
+            indexB = int(self.RNG.integers(len(routeB) + 1))
+            if (dayB, cohortB) != (dayA, cohortA) or not start <= indexB <= start + length:
+                break
+
+        reverse = length > 1 and bool(self.RNG.integers(2))
+
+        return OrOptMove(solution.RoutePlan, dayA, cohortA, start, length, dayB, cohortB, indexB, reverse)
+
+class TwoOptStarMove(BaseMove):
+    """ Represents the exchange of the tails RouteA[IndexA:] and RouteB[IndexB:] of two routes of different cohorts on the same day. """
+
+    __slots__ = ('RouteA', 'RouteB', '_routeDayCohortA', '_routeDayCohortB', 'CohortA', 'CohortB', 'indexA', 'indexB')
+
+    def __init__(self, initialRoutePlan, day:int, cohortA:int, indexA:int, cohortB:int, indexB:int):
+        self.RouteA = initialRoutePlan[day][cohortA]
+        self.RouteB = initialRoutePlan[day][cohortB] # no copies, the changed routes are built lazily
+        self._routeDayCohortA = None
+        self._routeDayCohortB = None
+        self.Day = day
+        self.CohortA = cohortA
+        self.CohortB = cohortB
+        self.indexA = indexA
+        self.indexB = indexB
+
+    @property
+    def RouteDayCohortA(self) -> list[int]:
+        ''' Copy of route A with the tail of route B, built on first access'''
+        if self._routeDayCohortA is None:
+            self._routeDayCohortA = self.RouteA[:self.indexA] + self.RouteB[self.indexB:]
+        return self._routeDayCohortA
+
+    @property
+    def RouteDayCohortB(self) -> list[int]:
+        ''' Copy of route B with the tail of route A, built on first access'''
+        if self._routeDayCohortB is None:
+            self._routeDayCohortB = self.RouteB[:self.indexB] + self.RouteA[self.indexA:]
+        return self._routeDayCohortB
+
+    def ChangedRoutes(self) -> list[tuple[int, int]]:
+        ''' Returns the (day, cohort) keys of both changed routes'''
+        return [(self.Day, self.CohortA), (self.Day, self.CohortB)]
+
+    def Apply(self, solution:Solution) -> None:
+        routeA, routeB = self.ReplaceRoute(solution, self.Day, self.CohortA), self.ReplaceRoute(solution, self.Day, self.CohortB)
+        routeA[self.indexA:], routeB[self.indexB:] = routeB[self.indexB:], routeA[self.indexA:]
+
+class TwoOptStarNeighborhood(DeltaNeighborhood):
+    """ Contains all tail exchanges (2-opt*) between two routes of different cohorts on the same day.
+        The main tasks stay with their cohort, so the tails only contain the optional tasks after the last main task of a route.
+        Large amounts of waiting time can be moved from one cohort to another with a single move.
+    """
+
+    def __init__(self, inputData:InputData, evaluationLogic:EvaluationLogic, solutionPool:SolutionPool, rng):
+        super().__init__(inputData, evaluationLogic, solutionPool, rng)
+        self.Type = 'TwoOptStar'
+
+    def FirstCut(self, route:list[int]) -> int:
+        ''' First position of a route where the tail contains no main task'''
+        for index in range(len(route) - 1, -1, -1):
+            if route[index] > 1000:
+                return index + 1
+        return 0
+
+    def DiscoverMoves(self):
+        """ Lazily generate all tail exchanges in a random order """
+
+        self.Moves = self.GenerateMoves()
+
+    def GenerateMoves(self):
+        """ Yields the tail exchanges of all (route pair, cut A, cut B) combinations in a random order """
+
+        # Pairs of routes of the same day with the possible cuts of both routes
+        route_pairs = []
+        for day in range(len(self.RoutePlan)):
+            cuts = [range(self.FirstCut(route), len(route) + 1) for route in self.RoutePlan[day]]
+            for cohortA, cohortB in itertools.combinations(range(len(self.RoutePlan[day])), 2):
+                route_pairs.append((day, cohortA, cuts[cohortA], cohortB, cuts[cohortB]))
+
+        sizes = [len(cutsA) * len(cutsB) for day, cohortA, cutsA, cohortB, cutsB in route_pairs]
+
+        for pair, position in self.RandomPositions(sizes):
+            day, cohortA, cutsA, cohortB, cutsB = route_pairs[pair]
+            indexA, indexB = cutsA[position // len(cutsB)], cutsB[position % len(cutsB)]
+
+            # Exchanging two empty tails does not change the routes
+            if indexA == len(self.RoutePlan[day][cohortA]) and indexB == len(self.RoutePlan[day][cohortB]):
+                continue
+
+            yield TwoOptStarMove(self.RoutePlan, day, cohortA, indexA, cohortB, indexB)
+
+    def constructCompleteRoute(self, move:TwoOptStarMove, solution = None) -> dict: 
+        ''' Constructs the comlete Route from the Move and the BaseMove'''
+        adapted_Route_Plan = CopyRoutePlan(solution.RoutePlan if solution else self.RoutePlan)
+
+        adapted_Route_Plan[move.Day][move.CohortA] = move.RouteDayCohortA
+        adapted_Route_Plan[move.Day][move.CohortB] = move.RouteDayCohortB
+
+        return adapted_Route_Plan
+
+    def EvaluateMove(self, move:TwoOptStarMove) -> None:
+
+        #Update the Delta of the Move
+        move.setDelta(self.EvaluationLogic.CalculateTwoOptStarDelta(move))
+
+    def MoveFeasibilityCheck(self, move:TwoOptStarMove, routePlan:dict = None) -> bool:
+        ''' O(1) feasibility check with the slack of both routes
+            The heads keep their main tasks and times, so only the new return times to the depot have to be checked
+        '''
+
+        scheduleA = self.GetRouteSchedule(move.Day, move.CohortA, routePlan)
+        scheduleB = self.GetRouteSchedule(move.Day, move.CohortB, routePlan)
+        if (not (scheduleA.Feasible and scheduleB.Feasible) or scheduleA.ContainsMainTask(move.indexA, len(move.RouteA) - 1)
+                or scheduleB.ContainsMainTask(move.indexB, len(move.RouteB) - 1)):
+            return self.SingleRouteFeasibilityCheck(move.RouteDayCohortA) and self.SingleRouteFeasibilityCheck(move.RouteDayCohortB)
+
+        return scheduleA.TailExchangeFeasible(move.indexA, scheduleB, move.indexB) and scheduleB.TailExchangeFeasible(move.indexB, scheduleA, move.indexA)
+
+    def MakeOneMove(self, solution:Solution) -> TwoOptStarMove:
+
+        day = self.RNG.integers(0, len(solution.RoutePlan))
+        cohortA, cohortB = self.RNG.choice(len(solution.RoutePlan[day]), size=2, replace=False)
+        routeA, routeB = solution.RoutePlan[day][cohortA], solution.RoutePlan[day][cohortB]
+
+        indexA = int(self.RNG.integers(self.FirstCut(routeA), len(routeA) + 1))
+        indexB = int(self.RNG.integers(self.FirstCut(routeB), len(routeB) + 1))
+
+        return TwoOptStarMove(solution.RoutePlan, day, int(cohortA), indexA, int(cohortB), indexB)
     
 class TwoEdgeExchangeMove(BaseMove):
     """ Represents the swap of the element at IndexA with the element at IndexB for a given permutation (= solution). """
 
-    def __init__(self, initialRoutePlan, waiting_time_old_route:int, day:int, cohort:int, taskA:int, taskB:int):
-        self.RouteDayCohort = initialRoutePlan.copy()  # Create a copy for RouteDayCohort
+    __slots__ = ('OldWaitingTime', 'TaskA', 'TaskB', 'indexA', 'indexB')
+
+    def __init__(self, initialRoutePlan, waiting_time_old_route:int, day:int, cohort:int, taskA:int, taskB:int, indexA:int = None, indexB:int = None):
+        self.Route = initialRoutePlan  # no copy, the reversed route is built lazily
+        self._routeDayCohort = None
         self.OldWaitingTime = waiting_time_old_route  # Waiting Time of old route
         self.Day = day
         self.Cohort = cohort
@@ -613,14 +1355,25 @@ class TwoEdgeExchangeMove(BaseMove):
         self.TaskB = taskB
 
         # Get the indices
-        self.indexA, self.indexB = self.RouteDayCohort.index(self.TaskA), self.RouteDayCohort.index(self.TaskB)
+        self.indexA = indexA if indexA is not None else self.Route.index(self.TaskA)
+        self.indexB = indexB if indexB is not None else self.Route.index(self.TaskB)
+
+    def BuildRoute(self) -> list[int]:
+        route = self.Route.copy()  # Create a copy for RouteDayCohort
 
         # Reverse the necessary portion of the list in place (slice assignment)
         if self.indexA < self.indexB:
-            self.RouteDayCohort[self.indexA:self.indexB+1] = reversed(self.RouteDayCohort[self.indexA:self.indexB+1])
+            route[self.indexA:self.indexB+1] = reversed(route[self.indexA:self.indexB+1])
         else:
             # If indexA is after indexB, still reverse, but handle the indices correctly
-            self.RouteDayCohort[self.indexB:self.indexA+1] = reversed(self.RouteDayCohort[self.indexB:self.indexA+1])
+            route[self.indexB:self.indexA+1] = reversed(route[self.indexB:self.indexA+1])
+
+        return route
+
+    def Apply(self, solution:Solution) -> None:
+        route = self.ReplaceRoute(solution, self.Day, self.Cohort)
+        start, end = min(self.indexA, self.indexB), max(self.indexA, self.indexB)
+        route[start:end+1] = route[start:end+1][::-1]
 
 class TwoEdgeExchangeNeighborhood(DeltaNeighborhood):         
 
@@ -630,37 +1383,81 @@ class TwoEdgeExchangeNeighborhood(DeltaNeighborhood):
         super().__init__(inputData,  evaluationLogic, solutionPool, rng)
 
         self.Type = 'TwoEdgeExchange'
+        self.WaitingTimes = None
 
     def DiscoverMoves(self, waiting_times):
-        """ Generate all $n choose 2$ moves. """
+        """ Lazily generate all $n choose 2$ moves in a random order """
+
+        self.WaitingTimes = waiting_times
+        self.Moves = self.GenerateMoves(waiting_times)
 
+    def GenerateMoves(self, waiting_times):
+        """ Yields the two edge exchange moves one by one, the move objects are only created when they are examined """
 
+        routes = []
         for day in range(len(self.RoutePlan)):
             for cohort in range(len(self.RoutePlan[day])):
                 # Get the cohort once
                 cohort_tasks = self.RoutePlan[day][cohort]
                 
-                # Filter tasks that are <= 1000 to reduce unnecessary checks
-                valid_tasks = {task for task in cohort_tasks if task <= 1000}
+                # Filter positions of tasks that are <= 1000 to reduce unnecessary checks
+                valid_indices = [index for index, task in enumerate(cohort_tasks) if task <= 1000]
+                routes.append((day, cohort, cohort_tasks, valid_indices, waiting_times[day,cohort]))
 
-                waiting_time_old_route = waiting_times[day,cohort]
+        # Iterate over pairs of task indices (i, j) such that i < j
+        for r, i, j in self.RandomPairs([len(route[3]) for route in routes]):
+            day, cohort, cohort_tasks, valid_indices, waiting_time_old_route = routes[r]
+            index_i, index_j = valid_indices[i], valid_indices[j]
+            # Create the move
+            yield TwoEdgeExchangeMove(cohort_tasks, waiting_time_old_route, day, cohort, cohort_tasks[index_i], cohort_tasks[index_j], index_i, index_j)
 
-                # Iterate over combinations of task indices (i, j) such that i < j
-                for task_i, task_j in itertools.combinations(valid_tasks, 2):
-                        
-                    # Create the move
-                    self.Moves.append(TwoEdgeExchangeMove(self.RoutePlan[day][cohort], waiting_time_old_route, day, cohort, task_i, task_j))
 
-        
-        #Shuffles the Moves
-        self.RNG.shuffle(self.Moves)
+    def EvaluateMovesBestImprovement(self) -> None:
+        """ Calculates the deltas of all 2-opt moves of a route at once and only keeps the improving moves """
 
+        if not self.EvaluationLogic.SupportsVectorizedDeltas:
+            return super().EvaluateMovesBestImprovement()
+
+        for day in range(len(self.RoutePlan)):
+            for cohort in range(len(self.RoutePlan[day])):
+                cohort_tasks = self.RoutePlan[day][cohort]
+                indicesA, indicesB, deltas = self.EvaluationLogic.CalculateTwoEdgeExchangeDeltas(cohort_tasks)
+
+                # Only improving moves can be chosen by the local search, the others are never created
+                for k in numpy.flatnonzero(deltas < 0):
+                    index_i, index_j = int(indicesA[k]), int(indicesB[k])
+                    move = TwoEdgeExchangeMove(cohort_tasks, self.WaitingTimes[day, cohort], day, cohort, cohort_tasks[index_i], cohort_tasks[index_j], index_i, index_j)
+                    move.setDelta(int(deltas[k]))
+                    self.MoveSolutions.append(move)
+
+        # Random order of moves with the same delta, like the shuffled move list
+        self.RNG.shuffle(self.MoveSolutions)
 
     def EvaluateMove(self, move) -> None:
         ''' Calculates the MakeSpan of thr certain move - adds to recent Solution'''
 
         #Update the Delta of the Move
-        move.setDelta(self.EvaluationLogic.WaitingTimeDifferenceOneRoute(move))
+        move.setDelta(self.CalculateDelta(move))
+
+    def CalculateDelta(self, move:TwoEdgeExchangeMove) -> int:
+        ''' O(1) edge exchange delta for symmetric travel times, otherwise the reversed segment has to be walked'''
+
+        if self.EvaluationLogic.SymmetricDistances:
+            return self.EvaluationLogic.CalculateTwoEdgeExchangeDelta(move)
+
+        return self.EvaluationLogic.WaitingTimeDifferenceOneRoute(move)
+
+    def MoveFeasibilityCheck(self, move:TwoEdgeExchangeMove, routePlan:dict = None) -> bool:
+        ''' O(1) feasibility check with the forward slack of the route
+            A reversed segment with a main task changes the arrival at the main task, these moves are checked on the complete route
+        '''
+
+        schedule = self.GetRouteSchedule(move.Day, move.Cohort, routePlan)
+        start, end = min(move.indexA, move.indexB), max(move.indexA, move.indexB)
+        if not schedule.Feasible or schedule.ContainsMainTask(start, end):
+            return self.SingleRouteFeasibilityCheck(move.RouteDayCohort)
+
+        return schedule.ReverseFeasible(start, end, self.CalculateDelta(move))
     
     def MakeOneMove(self, solution:Solution) -> TwoEdgeExchangeMove:
 
@@ -682,7 +1479,7 @@ class TwoEdgeExchangeNeighborhood(DeltaNeighborhood):
         ''' Own Definition to avoid string comparisons'''
 
         hasSolutionImproved = True
-        bestNeighborhoodSolution = Solution(solution.RoutePlan, self.InputData)
+        bestNeighborhoodSolution = Solution(CopyRoutePlan(solution.RoutePlan), self.InputData, solution.ReleaseUnusedTasks())
         self.EvaluationLogic.evaluateSolution(bestNeighborhoodSolution)
 
         while hasSolutionImproved:# and iterator < 50:
@@ -695,9 +1492,15 @@ class TwoEdgeExchangeNeighborhood(DeltaNeighborhood):
 
             if bestNeighborhoodMove is not None and bestNeighborhoodMove.Delta < 0:
 
+                previousSolution = bestNeighborhoodSolution
+
+                # The unused tasks are handed over and only changed by the move instead of being rebuilt
+                unusedTasks = previousSolution.ReleaseUnusedTasks()
+                bestNeighborhoodMove.UpdateUnusedTasks(unusedTasks)
+
                 completeRoute = self.constructCompleteRoute(bestNeighborhoodMove)
-                bestNeighborhoodSolution = Solution(completeRoute, self.InputData)
-                self.EvaluationLogic.evaluateSolution(bestNeighborhoodSolution)
+                bestNeighborhoodSolution = Solution(completeRoute, self.InputData, unusedTasks)
+                self.EvaluationLogic.evaluateRoutes(bestNeighborhoodSolution, bestNeighborhoodMove.ChangedRoutes(), previousSolution)
 
                 self.SolutionPool.AddSolution(bestNeighborhoodSolution)
             else:
@@ -708,7 +1511,10 @@ class TwoEdgeExchangeNeighborhood(DeltaNeighborhood):
 
 
 class ReplaceMove(BaseMove):
-    def __init__(self, initialRoutePlan, day:int, cohort:int, taskInRoute:int, unusedTask:int, deltaProfit:int):
+
+    __slots__ = ('TaskInRoute', 'UnusedTask', 'ProfitDelta', 'indexInRoute')
+
+    def __init__(self, initialRoutePlan, day:int, cohort:int, taskInRoute:int, unusedTask:int, deltaProfit:int, indexInRoute:int = None):
         """
         Initializes the SwapExtMove instance.
 
@@ -718,8 +1524,10 @@ class ReplaceMove(BaseMove):
             cohort (int): The cohort that drives the route.
             taskInRoute (int): The task currently in the route.
             unusedTask (int): The unused task to be swapped in.
+            indexInRoute (int): The index of the task in the route, looked up if not given.
         """
-        self.RouteDayCohort = initialRoutePlan.copy()  # create a copy of the route plan
+        self.Route = initialRoutePlan  # no copy, the changed route is built lazily
+        self._routeDayCohort = None
         self.TaskInRoute = taskInRoute
         self.UnusedTask = unusedTask
         self.Day = day
@@ -727,10 +1535,24 @@ class ReplaceMove(BaseMove):
         self.ProfitDelta = deltaProfit
 
         # Get the index of the task in the route
-        self.indexInRoute = self.RouteDayCohort.index(self.TaskInRoute)
+        self.indexInRoute = indexInRoute if indexInRoute is not None else self.Route.index(self.TaskInRoute)
+
+    def BuildRoute(self) -> list[int]:
+        route = self.Route.copy()  # create a copy of the route plan
 
         # Perform the swap: replace the task in the route with the unused task
-        self.RouteDayCohort[self.indexInRoute] = self.UnusedTask
+        route[self.indexInRoute] = self.UnusedTask
+
+        return route
+
+    def UpdateUnusedTasks(self, unusedTasks) -> None:
+        unusedTasks.Remove(self.UnusedTask)
+        unusedTasks.Add(self.TaskInRoute)
+
+    def Apply(self, solution:Solution) -> None:
+        # The unused tasks are changed first, they may still have to be created from the unchanged route plan
+        self.UpdateUnusedTasks(solution.UnusedTaskSet)
+        self.ReplaceRoute(solution, self.Day, self.Cohort)[self.indexInRoute] = self.UnusedTask
 
 class ReplaceDeltaNeighborhood(DeltaNeighborhood):
 
@@ -746,40 +1568,19 @@ class ReplaceDeltaNeighborhood(DeltaNeighborhood):
 
         # Only consider a subset of all unused tasks to reduce the number of moves
         max_number_to_consider = 100
+        sample = None
         if len(unusedTasks) > max_number_to_consider:
-            unusedTasks = self.RNG.choice(unusedTasks, max_number_to_consider, replace = False)
+            sample = set(self.RNG.choice(unusedTasks, max_number_to_consider, replace = False).tolist())
             
-         # Precompute profits for unused tasks to avoid repeated lookups
-        unused_task_profits = {task: self.InputData.allTasks[task].profit for task in unusedTasks}
-
-        # Iterate through the route plan
-        for day in range(len(self.RoutePlan)):
-            for cohort in range(len(self.RoutePlan[day])):
-                waiting_time = actual_Solution.WaitingTimes[day, cohort]
-                for taskInRoute in self.RoutePlan[day][cohort]:
-                    if taskInRoute > 1000:
-                        continue
-                    route_task_service_time = self.InputData.allTasks[taskInRoute].service_time
-                    route_task_profit = self.InputData.allTasks[taskInRoute].profit  # Access once
-                    # Filter unused tasks based on matching profit
-                    for unusedTask, unused_profit in unused_task_profits.items():
-                        if route_task_profit > unused_profit: #TODO Addede here smaller elkse
-                            continue
-                        if waiting_time < self.InputData.allTasks[unusedTask].service_time - route_task_service_time:
-                            continue
-                        # If profit matches, create a swap move
-                        delta_profit = unused_profit-route_task_profit
-                        self.Moves.append(ReplaceMove(self.RoutePlan[day][cohort], day, cohort, taskInRoute, unusedTask, delta_profit))
-                
-        #Shuffles the Moves
-        self.RNG.shuffle(self.Moves)
+        # Equal profits are allowed, the move only has to reduce the waiting time
+        self.Moves = self.GenerateReplaceMoves(actual_Solution, allowEqualProfit = True, sample = sample)
 
 
     def LocalSearch(self, neighborhoodEvaluationStrategy: str, solution: Solution) -> Solution:
         ''' Own Definition to avoid string comparisons'''
 
         hasSolutionImproved = True
-        bestNeighborhoodSolution = Solution(solution.RoutePlan, self.InputData)
+        bestNeighborhoodSolution = Solution(CopyRoutePlan(solution.RoutePlan), self.InputData, solution.ReleaseUnusedTasks())
         self.EvaluationLogic.evaluateSolution(bestNeighborhoodSolution)
 
         while hasSolutionImproved:# and iterator < 50:
@@ -794,9 +1595,14 @@ class ReplaceDeltaNeighborhood(DeltaNeighborhood):
                 #print(f"\nIteration: {iterator} in neighborhood {self.Type}")
                 #print("New best solution has been found!")
                 #print("Time Delta:" , bestNeighborhoodMove.Delta)
+                previousSolution = bestNeighborhoodSolution
+                # The unused tasks are handed over and only changed by the move instead of being rebuilt
+                unusedTasks = previousSolution.ReleaseUnusedTasks()
+                bestNeighborhoodMove.UpdateUnusedTasks(unusedTasks)
+
                 completeRoute = self.constructCompleteRoute(bestNeighborhoodMove)
-                bestNeighborhoodSolution = Solution(completeRoute, self.InputData)
-                self.EvaluationLogic.evaluateSolution(bestNeighborhoodSolution)
+                bestNeighborhoodSolution = Solution(completeRoute, self.InputData, unusedTasks)
+                self.EvaluationLogic.evaluateRoutes(bestNeighborhoodSolution, bestNeighborhoodMove.ChangedRoutes(), previousSolution)
                 #print("New Waiting Time:" , bestNeighborhoodSolution.WaitingTime)
                 self.SolutionPool.AddSolution(bestNeighborhoodSolution)
             else:
@@ -811,6 +1617,10 @@ class ReplaceDeltaNeighborhood(DeltaNeighborhood):
         #Update the Delta of the Move! 
         move.setDelta(self.EvaluationLogic.CalculateReplaceDelta(move))
 
+    def MoveFeasibilityCheck(self, move:ReplaceMove, routePlan:dict = None) -> bool:
+        ''' O(1) feasibility check with the forward slack of the route'''
+        return self.ReplaceFeasibilityCheck(move, routePlan)
+
 
     def MakeOneMove(self, solution:Solution) -> ReplaceMove:
 
@@ -829,13 +1639,13 @@ class ReplaceDeltaNeighborhood(DeltaNeighborhood):
         while taskInRoute is None:
             day, cohort = self.RNG.choice(list(valid_tasks_by_day_and_cohort.keys()))
             unusedTask = self.RNG.choice(unusedTasksList, replace=False)
-            unusedTaskProfit = self.InputData.allTasks[unusedTask].profit
-            unusedTaskServiceTime = self.InputData.allTasks[unusedTask].service_time
+            unusedTaskProfit = self.Profits[unusedTask]
+            unusedTaskServiceTime = self.ServiceTimes[unusedTask]
 
             for task in valid_tasks_by_day_and_cohort[(day, cohort)]:
-                task_profit = self.InputData.allTasks[task].profit
+                task_profit = self.Profits[task]
                 if task_profit <= unusedTaskProfit:
-                    if solution.WaitingTimes[day, cohort] >= unusedTaskServiceTime - self.InputData.allTasks[task].service_time:
+                    if solution.WaitingTimes[day, cohort] >= unusedTaskServiceTime - self.ServiceTimes[task]:
                         taskInRoute = task
                         profit_delta = task_profit - unusedTaskProfit
                         break
@@ -862,8 +1672,8 @@ class ReplaceDeltaNeighborhood(DeltaNeighborhood):
 
         while True:
             if (solution.WaitingTimes[day, cohort] >=
-                (self.InputData.allTasks[unusedTask].service_time - self.InputData.allTasks[taskInRoute].service_time) and
-                self.InputData.allTasks[taskInRoute].profit == self.InputData.allTasks[unusedTask].profit):
+                (self.ServiceTimes[unusedTask] - self.ServiceTimes[taskInRoute]) and
+                self.Profits[taskInRoute] == self.Profits[unusedTask]):
                 break
 
             day = self.RNG.integers(0, len(solution.RoutePlan))
@@ -887,9 +1697,11 @@ class InsertMove(BaseMove):
     Represents a move that inserts a task into various positions within a route.
 
     Attributes:
-        Route (dict): A deep copy of the initial route plan after attempting to insert the task.
+        Route (list): The route the task is inserted into, the changed copy is only built on access.
     """
 
+    __slots__ = ('Task', 'Index', 'Profit')
+
     def __init__(self, initialRoutePlan, task: int, day:int, cohort:int, index: int, profit:int):
         """
         Initializes the InsertMove instance by attempting to insert the given task into the route.
@@ -899,14 +1711,28 @@ class InsertMove(BaseMove):
             task (int): The task to be inserted.
             inputData: Additional input data required for feasibility checks.
         """
-        self.RouteDayCohort = initialRoutePlan.copy()
+        self.Route = initialRoutePlan  # no copy, the route with the inserted task is built lazily
+        self._routeDayCohort = None
+        self.ExtraTime = None # already known for moves from the insertion cache
         self.Task = task
         self.Day = day
         self.Cohort = cohort
         self.Index = index
         self.Profit = profit
 
-        self.RouteDayCohort.insert(index, task)
+    def BuildRoute(self) -> list[int]:
+        route = self.Route.copy()
+        route.insert(self.Index, self.Task)
+
+        return route
+
+    def UpdateUnusedTasks(self, unusedTasks) -> None:
+        unusedTasks.Remove(self.Task)
+
+    def Apply(self, solution:Solution) -> None:
+        # The unused tasks are changed first, they may still have to be created from the unchanged route plan
+        self.UpdateUnusedTasks(solution.UnusedTaskSet)
+        self.ReplaceRoute(solution, self.Day, self.Cohort).insert(self.Index, self.Task)
 
 class InsertNeighborhood(ProfitNeighborhood):
     """
@@ -932,6 +1758,10 @@ class InsertNeighborhood(ProfitNeighborhood):
 
         self.Type = 'Insert'
 
+        # Cheapest feasible insertion (extra time, index) per route and unused task, kept as long as the route is unchanged
+        # (day, cohort) -> (route the insertions belong to, {task: (extraTime, index) or None}), routes are never changed in place
+        self.InsertionCache = {}
+
     def DiscoverMoves(self, actual_Solution:Solution):
         """
         Discovers all possible insert moves for unused tasks in the current solution.
@@ -951,18 +1781,76 @@ class InsertNeighborhood(ProfitNeighborhood):
            unusedTasks = self.RNG.choice(unusedTasks, max_number_to_consider, replace=False)
         
         
-        for task in unusedTasks:
-            service_time_unused_task = self.InputData.allTasks[task].service_time
-            profit_unused_task = self.InputData.allTasks[task].profit
-            for day in range(len(self.RoutePlan)):
-                for cohort in range(len(self.RoutePlan[day])):
-                    for index in range(len(self.RoutePlan[day][cohort]) + 1):
-                        if service_time_unused_task < actual_Solution.WaitingTimes[day, cohort]:
-                            self.Moves.append(InsertMove(self.RoutePlan[day][cohort], task, day, cohort, index, profit_unused_task))
+        self.Moves = self.GenerateMoves(actual_Solution, list(unusedTasks))
 
-        
-        #Shuffles the Moves
-        self.RNG.shuffle(self.Moves)
+    def GenerateMoves(self, actual_Solution:Solution, unusedTasks:list[int]):
+        """ Yields the cheapest feasible insert move of all (unused task, route) pairs in a random order
+            The insertions are taken from the cache, only the routes changed since the last discovery are recalculated
+        """
+
+        routes = []
+        for day in range(len(self.RoutePlan)):
+            for cohort in range(len(self.RoutePlan[day])):
+                route = self.RoutePlan[day][cohort]
+
+                # Drop the cached insertions of changed routes
+                cached = self.InsertionCache.get((day, cohort))
+                if cached is None or cached[0] is not route:
+                    cached = (route, {})
+                    self.InsertionCache[(day, cohort)] = cached
+
+                routes.append((day, cohort, route, actual_Solution.WaitingTimes[day, cohort], cached[1]))
+
+        # The (unused task, route) pairs are visited in a random order
+        number_routes = len(routes)
+        for g in self.RandomOrder(len(unusedTasks) * number_routes):
+            task = unusedTasks[g // number_routes]
+            day, cohort, route, waiting_time, insertions = routes[g % number_routes]
+
+            if self.ServiceTimes[task] >= waiting_time:
+                continue
+
+            if task not in insertions:
+                insertions[task] = self.CheapestInsertion(task, day, cohort)
+            if insertions[task] is None:
+                continue
+
+            extraTime, index = insertions[task]
+            move = InsertMove(route, task, day, cohort, index, self.Profits[task])
+            move.setExtraTime(extraTime)
+            yield move
+
+    def CheapestInsertion(self, task:int, day:int, cohort:int):
+        ''' Returns (extra time, index) of the cheapest feasible insertion of the task into the route, None if there is none'''
+
+        candidateLists = self.InputData.candidateLists
+        candidates = candidateLists[task] if candidateLists is not None else None
+        route = self.RoutePlan[day][cohort]
+        schedule = self.GetRouteSchedule(day, cohort)
+        service_time = self.ServiceTimes[task]
+
+        best = None
+        for index in range(len(route) + 1):
+            # Granular neighborhood: only insert the task next to one of its candidates
+            if candidates is not None:
+                predecessor = route[index - 1] if index > 0 else 0
+                successor = route[index] if index < len(route) else 0
+                if predecessor not in candidates and successor not in candidates:
+                    continue
+
+            extraTime = self.EvaluationLogic.CalculateInsertionDelta(route, index, task) + service_time
+            if best is not None and extraTime >= best[0]:
+                continue
+
+            if schedule.Feasible and task <= 1000:
+                feasible = schedule.InsertFeasible(index, task)
+            else:
+                feasible = self.SingleRouteFeasibilityCheck(route[:index] + [task] + route[index:])
+
+            if feasible:
+                best = (extraTime, index)
+
+        return best
 
 
     def sort_move_solutions(self):
@@ -972,8 +1860,18 @@ class InsertNeighborhood(ProfitNeighborhood):
 
     def EvaluateMove(self, move) -> None:
 
-        #Update the Parameter of the Move
-        move.setExtraTime(self.EvaluationLogic.CalculateInsertExtraTime(move))
+        #Update the Parameter of the Move, unless it is already known from the insertion cache
+        if move.ExtraTime is None:
+            move.setExtraTime(self.EvaluationLogic.CalculateInsertExtraTime(move))
+
+    def MoveFeasibilityCheck(self, move:InsertMove, routePlan:dict = None) -> bool:
+        ''' O(1) feasibility check with the forward slack of the route'''
+
+        schedule = self.GetRouteSchedule(move.Day, move.Cohort, routePlan)
+        if not schedule.Feasible or move.Task > 1000:
+            return self.SingleRouteFeasibilityCheck(move.RouteDayCohort)
+
+        return schedule.InsertFeasible(move.Index, move.Task)
     
 
 class ReplaceProfitNeighborhood(ProfitNeighborhood):
@@ -1016,37 +1914,18 @@ class ReplaceProfitNeighborhood(ProfitNeighborhood):
             None
         """
 
-        unusedTasks = actual_Solution.UnusedTasks
-
-        # Precompute profits for unused tasks to avoid repeated lookups
-        unused_task_profits = {task: self.InputData.allTasks[task].profit for task in unusedTasks}
-
-        for day in range(len(self.RoutePlan)):
-            for cohort in range(len(self.RoutePlan[day])):
-                waiting_time = actual_Solution.WaitingTimes[day, cohort]
-                for taskInRoute in self.RoutePlan[day][cohort]:
-                    if taskInRoute > 1000:
-                        continue
-                    route_task_profit = self.InputData.allTasks[taskInRoute].profit  # Access once
-                    route_task_service_time = self.InputData.allTasks[taskInRoute].service_time
-                    # Filter unused tasks based on matching profit
-                    for unusedTask, unused_profit in unused_task_profits.items():
-                        if route_task_profit >= unused_profit: #TODO Addede here smaller elkse
-                            continue
-                        if waiting_time < self.InputData.allTasks[unusedTask].service_time - route_task_service_time:
-                            continue
-                        # If profit matches, create a swap move
-                        delta_profit = unused_profit-route_task_profit
-                        self.Moves.append(ReplaceMove(self.RoutePlan[day][cohort], day, cohort, taskInRoute, unusedTask, delta_profit))
-        
-        #Shuffles the Moves
-        self.RNG.shuffle(self.Moves)
+        # Only moves that increase the profit
+        self.Moves = self.GenerateReplaceMoves(actual_Solution, allowEqualProfit = False)
 
     def EvaluateMove(self, move) -> None:
 
         #Updates the Parameter
         move.setDelta(self.EvaluationLogic.CalculateReplaceDelta(move))
 
+    def MoveFeasibilityCheck(self, move:ReplaceMove, routePlan:dict = None) -> bool:
+        ''' O(1) feasibility check with the forward slack of the route'''
+        return self.ReplaceFeasibilityCheck(move, routePlan)
+
 
     def MakeOneMove(self, solution:Solution) -> ReplaceMove:
 
@@ -1,23 +1,111 @@
 import json
 from InputData import *
 import os
+import bisect
+import heapq
+import math
 import numpy as np
 
 
+def CopyRoutePlan(route_plan:dict) -> dict:
+    ''' Copies only the day -> cohort spine of the route plan, the route lists are shared with the original
+        Routes are never changed in place (copy on write), so the copy is safe and costs O(days * cohorts)
+    '''
+    return {day: list(cohorts) for day, cohorts in route_plan.items()}
+
+
+class UnusedTaskSet:
+    ''' Unused tasks of a solution, kept up to date by the moves instead of being rebuilt for every solution
+        Dense list for random sampling, the position of every task in the list for O(1) lookups and removals
+        and buckets by profit sorted by service time for binary searches
+    '''
+
+    def __init__(self, tasks:list[int], data:InputData):
+        self._data = data
+        self._tasks = list(tasks)
+        self._positions = {task: position for position, task in enumerate(self._tasks)}
+
+        tasks = np.array(self._tasks, dtype=np.int64)
+        service_times = data.taskTable.service_time[tasks]
+        order = np.lexsort((tasks, service_times))
+
+        self._byProfit = {}
+        for task, profit, service_time in zip(tasks[order].tolist(), data.taskTable.profit[tasks[order]].tolist(), service_times[order].tolist()):
+            self._byProfit.setdefault(profit, []).append((service_time, task))
+
+    def __contains__(self, task:int) -> bool:
+        return task in self._positions
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def _ProfitAndServiceTime(self, task:int) -> tuple[int, int]:
+        return int(self._data.taskTable.profit[task]), int(self._data.taskTable.service_time[task])
+
+    def Add(self, task:int) -> None:
+        ''' Adds the task in O(log n), tasks which are already unused are ignored'''
+        if task in self._positions:
+            return
+
+        self._positions[task] = len(self._tasks)
+        self._tasks.append(task)
+
+        profit, service_time = self._ProfitAndServiceTime(task)
+        bisect.insort(self._byProfit.setdefault(profit, []), (service_time, task))
+
+    def Remove(self, task:int) -> None:
+        ''' Removes the task in O(log n), the last task of the dense list takes its position'''
+        position = self._positions.pop(task)
+        last = self._tasks.pop()
+        if position < len(self._tasks):
+            self._tasks[position] = last
+            self._positions[last] = position
+
+        profit, service_time = self._ProfitAndServiceTime(task)
+        bucket = self._byProfit[profit]
+        del bucket[bisect.bisect_left(bucket, (service_time, task))]
+
+    def Within(self, minProfit:int, maxServiceTime:int) -> list[int]:
+        ''' Returns the unused tasks with a profit of at least minProfit and a service time of at most maxServiceTime
+            Every profit bucket is cut with a binary search, only the matching tasks are visited
+        '''
+
+        tasks = []
+        for profit, bucket in self._byProfit.items():
+            if profit >= minProfit:
+                end = bisect.bisect_right(bucket, (maxServiceTime, math.inf))
+                tasks.extend(task for service_time, task in bucket[:end])
+
+        return tasks
+
+    @property
+    def Tasks(self) -> list[int]:
+        ''' Dense list of the unused tasks (unordered), used for random sampling'''
+        return self._tasks
+
+
 class Solution:
-    ''' 
+    ''' Every solution owns its day -> cohort spine, the routes may be shared with other solutions
+        A changed route is therefore always replaced by a changed copy and never changed in place
     '''
 
-    def __init__(self, route_plan:dict, data:InputData):
-        ''' Define the attributes for solution'''
+    def __init__(self, route_plan:dict, data:InputData, unusedTasks:UnusedTaskSet = None):
+        ''' Define the attributes for solution
+            The unused tasks can be handed over from the previous solution of a local search, otherwise they are created on first access
+        '''
 
         self._totalProfit = -1
         self._totalTasks = -1
         self._route_plan = route_plan
-        self._create_StartEndTimes(data)
+        self._data = data
+        self._startTimes = None # start and end times are only calculated on first access
+        self._endTimes = None
+        self._routePlanHash = None # only calculated on first access
         self._waitingTime = -1
         self._waitingTimes = np.zeros((data.days, data.cohort_no))
-        self._create_unused_tasks(data)
+        self._routeProfits = np.zeros((data.days, data.cohort_no), dtype=np.int64)
+        self._routeTasks = np.zeros((data.days, data.cohort_no), dtype=np.int64)
+        self._unusedTasks = unusedTasks
 
     def __str__(self):
         '''Base Function for printing out the results'''
@@ -70,34 +158,50 @@ class Solution:
     def add_unused_Task(self, task_id:int) -> None:
         '''Adds one task id to the set of unused tasks'''
 
-        self._unusedTasks.add(task_id)    
+        self.UnusedTaskSet.Add(task_id)
 
     def remove_unused_Task(self, task_id:int) -> None:
         '''Remove one task id to the set of unused tasks'''
 
-        self._unusedTasks.remove(task_id)      
+        self.UnusedTaskSet.Remove(task_id)
+
+    def ReleaseUnusedTasks(self) -> UnusedTaskSet:
+        ''' Hands the unused tasks over to the next solution of a local search, they are recreated if this solution needs them again'''
+
+        unusedTasks = self.UnusedTaskSet
+        self._unusedTasks = None
+
+        return unusedTasks
+
+    def InvalidateRouteCaches(self) -> None:
+        ''' Drops the start and end times and the hash of the route plan after a route has changed, they are recalculated on the next access'''
+        self._startTimes = None
+        self._endTimes = None
+        self._routePlanHash = None
 
     def setRoutePlan(self, route_plan, data:InputData) -> None:
         ''' Sets a new route plan to the given solution'''
         self._route_plan = route_plan
+        self.InvalidateRouteCaches()
 
     def setRoutePlanNewUnusedTasks(self, route_plan, data:InputData) -> None:
         ''' Sets a new route plan to the given solution'''
         self._route_plan = route_plan
+        self.InvalidateRouteCaches()
         self._create_unused_tasks(data)
 
     def _create_unused_tasks(self, data: InputData) -> None:
-        ''' Create an initial list of all unused tasks '''
-        
-        # Create a list of all task numbers
-        self._unusedTasks = [task.no for task in data.allTasks]
+        ''' Create the unused tasks from the route plan in O(number of tasks) '''
         
-        # Iterate through the route plan and remove used tasks
-        for day, cohorts in self._route_plan.items():
-            for cohort in cohorts:
-                for task in cohort:
-                    if task in self._unusedTasks:
-                        self._unusedTasks.remove(task)  # Remove the task from the list if it's in the unused list
+        # Set of all routed task numbers
+        routed = {task for cohorts in self._route_plan.values() for cohort in cohorts for task in cohort}
+
+        self._unusedTasks = UnusedTaskSet([task.no for task in data.allTasks if task.no not in routed], data)
+
+    def UnusedTasksWithin(self, minProfit:int, maxServiceTime:int) -> list[int]:
+        ''' Returns the unused tasks with a profit of at least minProfit and a service time of at most maxServiceTime'''
+
+        return self.UnusedTaskSet.Within(minProfit, maxServiceTime)
 
     def setTotalProfit(self, new_profit) -> None:
         ''' Sets a new profit to the given solution'''
@@ -111,11 +215,26 @@ class Solution:
         ''' Sets a new waiting time to the given solution'''
         self._waitingTime = new_waiting_time
 
+    def Snapshot(self):
+        ''' Returns an independent copy of the solution for the best known solution, the routes are shared instead of deep copied'''
+        snapshot = Solution(CopyRoutePlan(self._route_plan), self._data)
+        snapshot.copyEvaluation(self)
+
+        return snapshot
+
+    def copyEvaluation(self, other_solution) -> None:
+        ''' Copies the totals and the values of every route from another solution, base for the incremental evaluation'''
+        self._totalProfit = other_solution.TotalProfit
+        self._totalTasks = other_solution.TotalTasks
+        self._waitingTime = other_solution.WaitingTime
+        self._waitingTimes = other_solution.WaitingTimes.copy()
+        self._routeProfits = other_solution.RouteProfits.copy()
+        self._routeTasks = other_solution.RouteTasks.copy()
+
     
     def WriteSolToJson(self, file_path:str, inputData: InputData, main_tasks:bool) -> None:
         ''' Write the solution to a json file'''
 
-        self._create_StartEndTimes(inputData)
         days = dict()
         
         for day in range(inputData.days):
@@ -185,11 +304,29 @@ class Solution:
 
 
     @property
-    def UnusedTasks(self) -> set[int]: 
-        ''' Returns the set of unused tasks'''
+    def UnusedTaskSet(self) -> UnusedTaskSet: 
+        ''' Returns the unused tasks, they are created on first access'''
+
+        if self._unusedTasks is None:
+            self._create_unused_tasks(self._data)
 
         return self._unusedTasks
 
+    @property
+    def UnusedTasks(self) -> list[int]: 
+        ''' Returns the dense list of unused tasks'''
+
+        return self.UnusedTaskSet.Tasks
+
+    @property
+    def RoutePlanHash(self) -> int: 
+        ''' Returns the hash of the route plan, calculated on first access'''
+
+        if self._routePlanHash is None:
+            self._routePlanHash = hash(tuple(tuple(route) for day in sorted(self._route_plan) for route in self._route_plan[day]))
+
+        return self._routePlanHash
+
     @property
     def TotalProfit(self) -> int: 
         ''' Returns Total Profit of Tour'''
@@ -204,7 +341,10 @@ class Solution:
     
     @property
     def StartTimes(self) -> dict[str, list[list[int]]]: 
-        ''' Returns Total Start Times of Tour'''
+        ''' Returns Total Start Times of Tour, calculated on first access'''
+
+        if self._startTimes is None:
+            self._create_StartEndTimes(self._data)
 
         return self._startTimes
     
@@ -220,9 +360,24 @@ class Solution:
 
         return self._waitingTimes
     
+    @property
+    def RouteProfits(self) -> np.ndarray: 
+        """Returns the profit of each route of the solution"""
+
+        return self._routeProfits
+    
+    @property
+    def RouteTasks(self) -> np.ndarray: 
+        """Returns the number of tasks of each route of the solution"""
+
+        return self._routeTasks
+    
     @property
     def EndTimes(self) -> dict[str, list[list[int]]]: 
-        ''' Returns Total End Times of Tour'''
+        ''' Returns Total End Times of Tour, calculated on first access'''
+
+        if self._endTimes is None:
+            self._create_StartEndTimes(self._data)
 
         return self._endTimes
     
@@ -234,25 +389,69 @@ class Solution:
 
 
 class SolutionPool:
-    ''' Class for creating lits objects containing solution objects'''
+    ''' Bounded pool of the elite solutions ranked by (profit, waiting time)
+        A min-heap keeps the worst solution on top for the eviction in O(log k), the incumbent is kept separately for O(1) lookups
+        Solutions with the same route plan as a pooled solution are rejected, so equally ranked solutions are only kept if they differ
+        Only the hash of every route plan is kept, the route plans are compared only if the hashes are equal
+    '''
 
-    def __init__(self):
-        ''' Create an empty list for the solutions'''
-        self.Solutions = []
-        
+    def __init__(self, maxSize:int = 100):
+        ''' Create an empty pool for at most maxSize solutions'''
+        if maxSize < 1:
+            raise Exception('The solution pool needs space for at least one solution.')
+
+        self.MaxSize = maxSize
+        self._heap = [] # entries (profit, waiting time, insertion number, route plan hash, solution)
+        self._byHash = {} # route plan hash -> pooled solutions
+        self._best = None
+        self._insertions = 0
 
     def AddSolution(self, newSolution:Solution) -> None:
-        ''' Add a new solution to the solution pool'''
-        self.Solutions.append(newSolution)
+        ''' Add a new solution to the solution pool, the worst solution is evicted if the pool is full
+            Ties in the ranking are broken by age, the oldest of equally ranked solutions is evicted first
+        '''
+
+        rank = (newSolution.TotalProfit, newSolution.WaitingTime)
+
+        # Not better than the worst pooled solution
+        if len(self._heap) >= self.MaxSize and rank <= self._heap[0][:2]:
+            return
+
+        # Duplicate of a pooled solution, the route plans are only compared on equal hashes
+        routePlanHash = newSolution.RoutePlanHash
+        sameHash = self._byHash.setdefault(routePlanHash, [])
+        if any(solution.RoutePlan == newSolution.RoutePlan for solution in sameHash):
+            return
+
+        self._insertions += 1
+        entry = (*rank, self._insertions, routePlanHash, newSolution)
+        sameHash.append(newSolution)
+
+        if len(self._heap) < self.MaxSize:
+            heapq.heappush(self._heap, entry)
+        else:
+            evicted = heapq.heapreplace(self._heap, entry)
+            evictedSameHash = self._byHash[evicted[3]]
+            evictedSameHash.remove(evicted[4])
+            if not evictedSameHash:
+                del self._byHash[evicted[3]]
+
+        # The first solution of the best rank stays the incumbent
+        if self._best is None or rank > (self._best.TotalProfit, self._best.WaitingTime):
+            self._best = newSolution
 
     def GetHighestProfitSolution(self) -> Solution:
-        ''' Sort all the solutions in regard to their makespan and return the solution with the lowest makespan'''
-        self.Solutions.sort(key=lambda solution: (solution.TotalProfit, solution.WaitingTime), reverse=True) # sort solutions according to Profit and waiting time
+        ''' Return the solution with the highest profit, ties are broken by the highest waiting time'''
 
-        return self.Solutions[0]
+        return self._best
     
     def GetHighestWaitingTimeSolution(self) -> Solution:
-        ''' Sort all the solutions in regard to their makespan and return the solution with the lowest makespan'''
-        self.Solutions.sort(key=lambda solution: (solution.WaitingTime), reverse=True) # sort solutions according to Profit and waiting time
+        ''' Return the pooled solution with the highest waiting time'''
+
+        return max(self.Solutions, key=lambda solution: solution.WaitingTime)
+
+    @property
+    def Solutions(self) -> list[Solution]:
+        ''' Returns the pooled solutions (unordered)'''
 
-        return self.Solutions[0]
+        return [entry[-1] for entry in self._heap]
@@ -10,12 +10,12 @@ import time
 class Solver:
     ''' Orchestrates all single pieces to form one strong algorithm to solve flowshop problems
     '''
-    def __init__(self, inputData:InputData, seed:int):
+    def __init__(self, inputData:InputData, seed:int, poolSize:int = 100):
         self.InputData = inputData
         self.Seed = seed
         self.RNG = numpy.random.default_rng(self.Seed)
         self.EvaluationLogic = EvaluationLogic(inputData)
-        self.SolutionPool = SolutionPool()
+        self.SolutionPool = SolutionPool(poolSize)
         self.runTime = {}
         
         self.ConstructiveHeuristic = ConstructiveHeuristics(self.SolutionPool, self.EvaluationLogic)      
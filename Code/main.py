@@ -47,11 +47,14 @@ profile_function = False
 # Main function for the project
 def main():
 
+    # Optional task distances are only calculated once for all instances
+    instanceFamily = InstanceFamily()
+
     # Run the algorithm for all chosen instances
     for i in instances:
 
         print("Instance: ", i)
-        data = InputData("Instance"+i+".json")
+        data = instanceFamily.LoadInstance("Instance"+i+".json")
 
         # Initialize the solver
         solver = Solver(data, 1008)
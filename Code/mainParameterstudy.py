@@ -5,6 +5,7 @@ from Solver import *
 import time
 import pstats
 import pandas as pd
+import concurrent.futures
 
 
 
@@ -13,6 +14,7 @@ def main_parameterstudy_ILS():
     runTimePerParameterCombination = 60*6
      
     results = []
+    instanceFamily = InstanceFamily() # Optional task distances are only calculated once for all instances
     sublists_to_modify_list = [2]
     consecutive_to_remove_list = [3]
     threshold_list = [3]
@@ -37,7 +39,7 @@ def main_parameterstudy_ILS():
                                     print("Consecutive to remove: ", consecutive)
                                     print("Threshold: ", threshold)
 
-                                    data = InputData("Instance"+i+".json")
+                                    data = instanceFamily.LoadInstance("Instance"+i+".json")
                                     solver = Solver(data, 1008)
 
                                     neighborhoodLocalSearch = IterativeImprovement(inputData=data,
@@ -101,6 +103,7 @@ def main_parameterstudy_SAILS():
     instances = ['7_2_1', '7_5_1', '7_8_1']
     # Full parameter study
     results = []
+    instanceFamily = InstanceFamily() # Optional task distances are only calculated once for all instances
     sublists_to_modify_list = [2]
     consecutive_to_remove_list = [3]
     start_temperature_list = [1000]
@@ -130,7 +133,7 @@ def main_parameterstudy_SAILS():
                                 print("Max Inner Loop: ", maxInnerLoop)
                                 print("Max Iterations Without Improvement: ", maxIterationsWithoutImprovement)
 
-                                data = InputData("Instance"+i+".json")
+                                data = instanceFamily.LoadInstance("Instance"+i+".json")
                                 solver = Solver(data, 1008)
 
                                 SAILS_algorithm = SAILS(
@@ -191,6 +194,7 @@ def main_parameterstudy_Adaptive_SAILS():
     runTimePerParameterCombination = 60*15
     
     results = []
+    instanceFamily = InstanceFamily() # Optional task distances are only calculated once for all instances
     sublists_to_modify_list = [2]
     consecutive_to_remove_list = [3]
     start_temperature_list = [1000]
@@ -220,7 +224,7 @@ def main_parameterstudy_Adaptive_SAILS():
                                 print("Max Inner Loop: ", maxInnerLoop)
                                 print("Max Iterations Without Improvement: ", maxIterationsWithoutImprovement)
 
-                                data = InputData("Instance"+i+".json")
+                                data = instanceFamily.LoadInstance("Instance"+i+".json")
                                 solver = Solver(data, 1008)
 
                                 Adaptive_SAILS_algorithm = Adaptive_SAILS(
@@ -283,6 +287,7 @@ def main_parameterstudy_SAILS5():
     runTimePerParameterCombination = 60*6
     
     results = []
+    instanceFamily = InstanceFamily() # Optional task distances are only calculated once for all instances
     sublists_to_modify_list = [1,2,3]
     consecutive_to_remove_list = [2,3,4]
     start_temperature_list = [100]
@@ -334,7 +339,7 @@ def main_parameterstudy_SAILS5():
                                 print("Temp decrease factor: ", temp_decrease)
                                 print("Max Inner Loop: ", maxInnerLoop)
                                 print("Max Iterations Without Improvement: ", maxIterationsWithoutImprovement)
-                                data = InputData("Instance"+i+".json")
+                                data = instanceFamily.LoadInstance("Instance"+i+".json")
                                 solver = Solver(data, 1008)
 
                                 SAILS_algorithm = SAILS(
@@ -389,7 +394,10 @@ def main_parameterstudy_SAILS5():
 
     df.to_csv('sails_results5.csv', index=False)
 
-def main_parameterstudy_SA_LS(pair_index):
+def main_parameterstudy_SA_LS(pair_index, sharedHandles:dict = None):
+    ''' Runs one of the four parts of the SA_LS parameter study
+        With the handles of main_parameterstudy_SA_LS_parallel the input data is attached from shared memory instead of loaded
+    '''
 
     instances = ['7_2_1', '7_5_1', '7_8_1']
     start_temperature_list = [100,1000,10000]
@@ -422,11 +430,15 @@ def main_parameterstudy_SA_LS(pair_index):
     print(f"Running part {pair_index}, {len(combinations)} combinations.")
     print(Path.cwd().parent)
     results = []
+    instanceFamily = InstanceFamily() # Optional task distances are only calculated once for all instances
 
     for instance,temp, minTemp,factor, maxMoves in combinations:
 
         print("Instance: ", instance)
-        data = InputData("Instance"+instance+".json")
+        if sharedHandles is not None:
+            data = SharedInputData.Attach(sharedHandles[instance])
+        else:
+            data = instanceFamily.LoadInstance("Instance"+instance+".json")
 
         solver = Solver(data, 1008)
 
@@ -473,6 +485,29 @@ def main_parameterstudy_SA_LS(pair_index):
 
     df.to_csv(f'sa_ls_results_{pair_index}.csv', index=False)
 
+def main_parameterstudy_SA_LS_parallel():
+    ''' Runs all four parts of the SA_LS parameter study in parallel worker processes
+        Every instance is loaded once, the workers attach to its arrays in shared memory
+    '''
+
+    instances = ['7_2_1', '7_5_1', '7_8_1']
+    instanceFamily = InstanceFamily()
+
+    sharedData = {}
+    try:
+        for instance in instances:
+            sharedData[instance] = SharedInputData(instanceFamily.LoadInstance("Instance"+instance+".json"))
+
+        sharedHandles = {instance: shared.handle for instance, shared in sharedData.items()}
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=4) as executor:
+            # list() re-raises the exceptions of the workers
+            list(executor.map(main_parameterstudy_SA_LS, range(4), [sharedHandles] * 4))
+    finally:
+        # The shared memory blocks are only released after all workers are finished
+        for shared in sharedData.values():
+            shared.Close()
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run parameter study scripts.")
@@ -486,14 +521,25 @@ if __name__ == "__main__":
         "--index", 
         type=int, 
         choices=range(0, 4), 
-        required=True, 
         help="Specify the part index (0-3) to run the parameter study."
     )
+    parser.add_argument(
+        "--parallel", 
+        action="store_true", 
+        help="Run all four parts of SA_LS in parallel worker processes that share the input data."
+    )
 
     args = parser.parse_args()
 
+    if args.parallel and args.function != "SA_LS":
+        parser.error("--parallel is only available for SA_LS")
+    if not args.parallel and args.index is None:
+        parser.error("--index is required without --parallel")
+
     if args.function == "SAILS":
         main_parameterstudy_SAILS(args.index)
-    elif args.function == "SA_LS":
+    elif args.parallel:
+        main_parameterstudy_SA_LS_parallel()
+    else:
         main_parameterstudy_SA_LS(args.index)
 
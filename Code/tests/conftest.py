@@ -0,0 +1,71 @@
+''' Shared fixtures of the regression tests
+    The modules are imported like the scripts import them, with "Code" as working directory (the default paths of InputData depend on it)
+'''
+
+import os
+import sys
+import contextlib
+import io
+from pathlib import Path
+
+CODE_DIRECTORY = Path(__file__).resolve().parent.parent
+os.chdir(CODE_DIRECTORY)
+sys.path.insert(0, str(CODE_DIRECTORY))
+
+import numpy
+import pytest
+
+from Solver import *
+
+INSTANCE = "Instance7_2_1.json"
+
+
+@pytest.fixture(scope='session')
+def distanceCachePath(tmp_path_factory) -> str:
+    ''' Temporary cache directory, the tests never write into Data/DistanceCache'''
+    return str(tmp_path_factory.mktemp('DistanceCache'))
+
+
+@pytest.fixture(scope='session')
+def data(distanceCachePath) -> InputData:
+    return InputData(INSTANCE, distance_cache_path = distanceCachePath)
+
+
+@pytest.fixture(scope='session')
+def evaluationLogic(data) -> EvaluationLogic:
+    return EvaluationLogic(data)
+
+
+@pytest.fixture(scope='session')
+def improvedSolution(data) -> Solution:
+    ''' Constructive solution improved by a short local search, the routes are tight enough to contain infeasible moves'''
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        solver = Solver(data, 1008)
+        localSearch = IterativeImprovement(inputData = data, neighborhoodTypes = ['SwapIntraRoute', 'Insert', 'ReplaceProfit'])
+        solver.RunAlgorithm(numberParameterCombination = 1, main_tasks = True, algorithm = localSearch)
+
+    return solver.SolutionPool.GetHighestProfitSolution()
+
+
+@pytest.fixture
+def solution(improvedSolution) -> Solution:
+    ''' Independent evaluated copy of the improved solution for every test'''
+    return improvedSolution.Snapshot()
+
+
+@pytest.fixture
+def slackSolution(data, evaluationLogic, improvedSolution) -> Solution:
+    ''' Improved solution with every third optional task removed, so there are feasible insert moves again'''
+
+    routePlan = {day: [[task for index, task in enumerate(route) if task > 1000 or index % 3 != 1] for route in cohorts]
+                 for day, cohorts in improvedSolution.RoutePlan.items()}
+    solution = Solution(routePlan, data)
+    evaluationLogic.evaluateSolution(solution)
+
+    return solution
+
+
+@pytest.fixture
+def rng() -> numpy.random.Generator:
+    return numpy.random.default_rng(1008)
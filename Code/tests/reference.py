@@ -0,0 +1,98 @@
+''' Baseline implementations the fast paths are compared with, they follow the original full evaluation'''
+
+import inspect
+import itertools
+from copy import deepcopy
+
+from InputData import InputData
+from OutputData import Solution
+from EvaluationLogic import EvaluationLogic
+
+
+def route_travel_time(data:InputData, route:list[int]) -> int:
+    ''' Travel time of a route from the depot through all tasks back to the depot'''
+
+    travel_time = 0
+    previous = 0
+    for task in route:
+        travel_time += data.distances[previous][task]
+        previous = task
+
+    return travel_time + data.distances[previous][0]
+
+
+def route_feasible(data:InputData, route:list[int]) -> bool:
+    ''' Full feasibility check of a route: every main task is reached in time and the route ends within the maximum duration'''
+
+    duration = 0
+    previous = 0
+    for task in route:
+        duration += data.distances[previous][task]
+        if task > 1000:
+            if duration > data.allTasks[task].start_time:
+                return False
+            duration = data.allTasks[task].start_time
+        duration += data.allTasks[task].service_time
+        previous = task
+
+    return duration + data.distances[previous][0] <= data.maxRouteDuration
+
+
+def evaluated(routePlan:dict, data:InputData, evaluationLogic:EvaluationLogic) -> Solution:
+    ''' New solution of a deep copy of the route plan, evaluated from scratch'''
+
+    solution = Solution(deepcopy(routePlan), data)
+    evaluationLogic.evaluateSolution(solution)
+
+    return solution
+
+
+def unused_tasks(routePlan:dict, data:InputData) -> set[int]:
+    ''' All tasks which are not part of any route'''
+
+    routed = {task for cohorts in routePlan.values() for route in cohorts for task in route}
+
+    return {task.no for task in data.allTasks if task.no not in routed}
+
+
+def evaluation(solution:Solution) -> tuple:
+    ''' Totals and values of every route of an evaluated solution, for comparisons'''
+
+    return (solution.TotalProfit, solution.TotalTasks, solution.WaitingTime,
+            solution.RouteProfits.tolist(), solution.RouteTasks.tolist(), solution.WaitingTimes.tolist())
+
+
+def discovered_moves(neighborhood, solution:Solution, number:int) -> list:
+    ''' Updates the neighborhood to the solution and returns up to number of its moves
+        DiscoverMoves takes the solution, its waiting times or nothing depending on the neighborhood
+    '''
+
+    neighborhood.Update(solution.RoutePlan)
+
+    parameters = inspect.signature(neighborhood.DiscoverMoves).parameters
+    if 'waiting_times' in parameters:
+        neighborhood.DiscoverMoves(solution.WaitingTimes)
+    elif parameters:
+        neighborhood.DiscoverMoves(solution)
+    else:
+        neighborhood.DiscoverMoves()
+
+    return list(itertools.islice(neighborhood.Moves, number))
+
+
+def changed_routes(move) -> list[list[int]]:
+    ''' The changed copies of all routes of a move'''
+
+    if hasattr(move, 'RouteDayCohortA'):
+        return [move.RouteDayCohortA, move.RouteDayCohortB]
+
+    return [move.RouteDayCohort]
+
+
+def travel_time_delta(data:InputData, neighborhood, move, solution:Solution) -> int:
+    ''' Change of the travel time of all routes changed by a move, from the complete route plans'''
+
+    routePlan = neighborhood.constructCompleteRoute(move, solution)
+
+    return sum(route_travel_time(data, routePlan[day][cohort]) - route_travel_time(data, solution.RoutePlan[day][cohort])
+               for day, cohort in move.ChangedRoutes())
@@ -0,0 +1,54 @@
+''' Regression tests for the in-place Apply of the compact moves'''
+
+import copy
+
+import pytest
+
+from Neighborhood import (SwapIntraRouteNeighborhood, SwapInterRouteNeighborhood, RelocateInterRouteNeighborhood, OrOptNeighborhood,
+                          TwoOptStarNeighborhood, TwoEdgeExchangeNeighborhood, InsertNeighborhood, ReplaceDeltaNeighborhood,
+                          ReplaceProfitNeighborhood)
+from OutputData import SolutionPool
+
+from reference import unused_tasks, discovered_moves
+
+
+NEIGHBORHOODS = [SwapIntraRouteNeighborhood, SwapInterRouteNeighborhood, RelocateInterRouteNeighborhood, OrOptNeighborhood,
+                 TwoOptStarNeighborhood, TwoEdgeExchangeNeighborhood, InsertNeighborhood, ReplaceDeltaNeighborhood,
+                 ReplaceProfitNeighborhood]
+
+
+@pytest.mark.parametrize('neighborhoodClass', NEIGHBORHOODS)
+@pytest.mark.parametrize('createUnusedTasks', [True, False])
+def test_apply_matches_constructed_route_plan(data, evaluationLogic, slackSolution, rng, neighborhoodClass, createUnusedTasks):
+    neighborhood = neighborhoodClass(data, evaluationLogic, SolutionPool(), rng)
+    moves = discovered_moves(neighborhood, slackSolution, 200)
+    routePlan = copy.deepcopy(slackSolution.RoutePlan)
+    assert moves
+
+    for move in moves:
+        solution = slackSolution.Snapshot()
+        if createUnusedTasks:
+            solution.UnusedTaskSet # otherwise the unused tasks are created lazily from the changed route plan
+
+        move.Apply(solution)
+
+        assert solution.RoutePlan == neighborhood.constructCompleteRoute(move, slackSolution)
+        assert set(solution.UnusedTasks) == unused_tasks(solution.RoutePlan, data)
+        assert slackSolution.RoutePlan == routePlan
+
+
+@pytest.mark.parametrize('neighborhoodClass', NEIGHBORHOODS)
+def test_chain_of_applied_moves(data, evaluationLogic, slackSolution, rng, neighborhoodClass):
+    solution = slackSolution.Snapshot()
+
+    for _ in range(10):
+        neighborhood = neighborhoodClass(data, evaluationLogic, SolutionPool(), rng)
+        moves = discovered_moves(neighborhood, solution, 1)
+        if not moves:
+            break
+
+        expected = neighborhood.constructCompleteRoute(moves[0], solution)
+        moves[0].Apply(solution)
+
+        assert solution.RoutePlan == expected
+        assert set(solution.UnusedTasks) == unused_tasks(solution.RoutePlan, data)
@@ -0,0 +1,45 @@
+''' Regression tests for the candidate neighbour lists of the granular insert and replace neighborhoods'''
+
+import itertools
+
+import numpy
+
+from Neighborhood import InsertNeighborhood, ReplaceProfitNeighborhood, ReplaceDeltaNeighborhood
+from OutputData import SolutionPool
+
+
+def test_candidate_lists_are_the_nearest_tasks(data):
+    k_neighbors = data.candidate_neighbors
+
+    for task, candidates in enumerate(data.candidateLists):
+        assert len(candidates) == k_neighbors
+        assert task not in candidates
+
+        others = numpy.delete(data.distanceMatrix[task], [task] + list(candidates))
+        assert max(data.distances[task][candidate] for candidate in candidates) <= others.min()
+
+
+def test_insert_moves_stay_next_to_candidates(data, evaluationLogic, slackSolution, rng):
+    neighborhood = InsertNeighborhood(data, evaluationLogic, SolutionPool(), rng)
+    neighborhood.Update(slackSolution.RoutePlan)
+    neighborhood.DiscoverMoves(slackSolution)
+
+    moves = list(itertools.islice(neighborhood.Moves, 2000))
+    assert moves
+    for move in moves:
+        predecessor = move.Route[move.Index - 1] if move.Index > 0 else 0
+        successor = move.Route[move.Index] if move.Index < len(move.Route) else 0
+        assert predecessor in data.candidateLists[move.Task] or successor in data.candidateLists[move.Task]
+
+
+def test_replace_moves_stay_next_to_candidates(data, evaluationLogic, solution, rng):
+    for neighborhoodClass in (ReplaceProfitNeighborhood, ReplaceDeltaNeighborhood):
+        neighborhood = neighborhoodClass(data, evaluationLogic, SolutionPool(), rng)
+        neighborhood.Update(solution.RoutePlan)
+        neighborhood.DiscoverMoves(solution)
+
+        moves = list(itertools.islice(neighborhood.Moves, 2000))
+        assert moves
+        for move in moves:
+            predecessor, successor = evaluationLogic.get_predecessor_and_succesor(move.Route, move.indexInRoute)
+            assert predecessor in data.candidateLists[move.UnusedTask] or successor in data.candidateLists[move.UnusedTask]
@@ -0,0 +1,81 @@
+''' Regression tests for the routes shared between solutions (copy on write)'''
+
+import contextlib
+import copy
+import io
+
+import pytest
+
+from ImprovementAlgorithm import SimulatedAnnealingLocalSearch
+from Neighborhood import (SwapIntraRouteNeighborhood, SwapInterRouteNeighborhood, RelocateInterRouteNeighborhood, OrOptNeighborhood,
+                          TwoOptStarNeighborhood, TwoEdgeExchangeNeighborhood, ReplaceDeltaNeighborhood)
+from OutputData import SolutionPool, CopyRoutePlan
+from Solver import Solver
+
+from reference import evaluated, evaluation, discovered_moves
+
+
+DELTA_NEIGHBORHOODS = [SwapIntraRouteNeighborhood, SwapInterRouteNeighborhood, RelocateInterRouteNeighborhood, OrOptNeighborhood,
+                       TwoOptStarNeighborhood, TwoEdgeExchangeNeighborhood, ReplaceDeltaNeighborhood]
+
+
+def test_copy_route_plan_shares_the_routes(solution):
+    routePlan = CopyRoutePlan(solution.RoutePlan)
+
+    assert routePlan == solution.RoutePlan
+    assert all(routePlan[day] is not cohorts for day, cohorts in solution.RoutePlan.items())
+    assert all(route is original for day, cohorts in solution.RoutePlan.items() for route, original in zip(routePlan[day], cohorts))
+
+
+@pytest.mark.parametrize('neighborhoodClass', DELTA_NEIGHBORHOODS)
+def test_snapshots_stay_unchanged_by_applied_moves(data, evaluationLogic, slackSolution, rng, neighborhoodClass):
+    neighborhood = neighborhoodClass(data, evaluationLogic, SolutionPool(), rng)
+    currentSolution = slackSolution.Snapshot()
+    snapshots = []
+
+    # Like the simulated annealing: random feasible moves are applied in place, the best known solutions are snapshots
+    for _ in range(30):
+        snapshots.append((currentSolution.Snapshot(), copy.deepcopy(currentSolution.RoutePlan)))
+        neighborhood.Update(currentSolution.RoutePlan)
+        move = neighborhood.SingleMove(currentSolution, 100)
+        if move is None:
+            continue
+
+        move.Apply(currentSolution)
+        evaluationLogic.evaluateRoutes(currentSolution, move.ChangedRoutes())
+
+    assert evaluation(currentSolution) == evaluation(evaluated(currentSolution.RoutePlan, data, evaluationLogic))
+    assert currentSolution.RoutePlan != snapshots[0][1]
+    for snapshot, routePlan in snapshots:
+        assert snapshot.RoutePlan == routePlan
+        assert evaluation(snapshot) == evaluation(evaluated(routePlan, data, evaluationLogic))
+
+
+@pytest.mark.parametrize('neighborhoodClass', DELTA_NEIGHBORHOODS)
+def test_constructed_route_plan_only_copies_changed_routes(data, evaluationLogic, slackSolution, rng, neighborhoodClass):
+    neighborhood = neighborhoodClass(data, evaluationLogic, SolutionPool(), rng)
+    routePlan = copy.deepcopy(slackSolution.RoutePlan)
+
+    for move in discovered_moves(neighborhood, slackSolution, 50):
+        newRoutePlan = neighborhood.constructCompleteRoute(move, slackSolution)
+        changed = set(move.ChangedRoutes())
+
+        for day, cohorts in slackSolution.RoutePlan.items():
+            for cohort, route in enumerate(cohorts):
+                assert (newRoutePlan[day][cohort] is route) == ((day, cohort) not in changed)
+
+    assert slackSolution.RoutePlan == routePlan
+
+
+def test_pooled_solutions_stay_unchanged_by_simulated_annealing(data, slackSolution):
+    with contextlib.redirect_stdout(io.StringIO()):
+        solver = Solver(data, 1008)
+        algorithm = SimulatedAnnealingLocalSearch(inputData = data, start_temperature = 100, min_temperature = 1, temp_decrease_factor = 0.95,
+                                                  maxRunTime = 1, maxRandomMoves = 100)
+        solver.SolutionPool.AddSolution(slackSolution.Snapshot())
+        bestSolution = solver.ImprovementPhase(slackSolution.Snapshot(), algorithm)
+
+    assert len(solver.SolutionPool.Solutions) > 1
+    assert evaluation(bestSolution) == evaluation(evaluated(bestSolution.RoutePlan, data, solver.EvaluationLogic))
+    for pooled in solver.SolutionPool.Solutions:
+        assert evaluation(pooled) == evaluation(evaluated(pooled.RoutePlan, data, solver.EvaluationLogic))
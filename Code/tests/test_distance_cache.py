@@ -0,0 +1,38 @@
+''' Regression tests for the memory-mapped distance cache'''
+
+from pathlib import Path
+
+import numpy
+
+from InputData import InputData
+
+from conftest import INSTANCE
+
+
+def test_cached_matrix_matches_calculated_matrix(data, distanceCachePath):
+    uncached = InputData(INSTANCE, distance_cache_path = None)
+    cache_files = list(Path(distanceCachePath).glob('distances_*.npy'))
+
+    assert len(cache_files) == 1
+    assert isinstance(data.distanceMatrix, numpy.memmap)
+    assert numpy.array_equal(data.distanceMatrix, uncached.distanceMatrix)
+
+    # A second load maps the same file instead of calculating the matrix again
+    reloaded = InputData(INSTANCE, distance_cache_path = distanceCachePath)
+    assert Path(reloaded.distanceMatrix.filename) == cache_files[0].resolve()
+    assert list(Path(distanceCachePath).glob('*.tmp')) == []
+
+
+def test_changed_tasks_file_gets_a_new_cache_entry(data, tmp_path):
+    # Move the first optional task after the depot, the cached matrix of the original file must not be used
+    lines = Path(data.optional_tasks_path).read_text(encoding='utf-8').splitlines(keepends=True)
+    lines[2] = lines[2].replace('51.0209137', '51.0309137')
+    changed_tasks_path = tmp_path / 'OptionalTasks.csv'
+    changed_tasks_path.write_text(''.join(lines), encoding='utf-8')
+
+    original = InputData(INSTANCE, distance_cache_path = str(tmp_path))
+    changed = InputData(INSTANCE, optional_tasks_path = str(changed_tasks_path), distance_cache_path = str(tmp_path))
+
+    assert len(list(tmp_path.glob('distances_*.npy'))) == 2
+    assert not numpy.array_equal(original.distanceMatrix, changed.distanceMatrix)
+    assert changed.distances[1][0] == changed._CalculateDistance(changed.allTasks[1], changed.allTasks[0])
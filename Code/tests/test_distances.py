@@ -0,0 +1,29 @@
+''' Regression tests for the broadcasted travel time matrix and its row views'''
+
+import numpy
+
+from InputData import calculate_travel_times
+
+
+def test_matrix_matches_scalar_formula(data, rng):
+    tasks = data.allTasks
+    for task_1, task_2 in rng.integers(len(tasks), size=(2000, 2)).tolist():
+        assert data.distanceMatrix[task_1, task_2] == data._CalculateDistance(tasks[task_1], tasks[task_2])
+
+
+def test_rows_are_views_with_python_ints(data, rng):
+    assert len(data.distances) == len(data.allTasks)
+    for task_1, task_2 in rng.integers(len(data.allTasks), size=(2000, 2)).tolist():
+        distance = data.distances[task_1][task_2]
+        assert type(distance) is int
+        assert distance == data.distanceMatrix[task_1, task_2]
+
+    # The rows share the memory of the matrix instead of copying it
+    assert numpy.shares_memory(numpy.asarray(data.distances[5]), data.distanceMatrix)
+
+
+def test_calculate_travel_times_of_subsets(data):
+    tasks_from, tasks_to = data.allTasks[:7], data.allTasks[-5:]
+    expected = [[data._CalculateDistance(task_1, task_2) for task_2 in tasks_to] for task_1 in tasks_from]
+
+    assert calculate_travel_times(tasks_from, tasks_to).tolist() == expected
@@ -0,0 +1,42 @@
+''' Regression tests for the incremental evaluation of the changed routes'''
+
+from Neighborhood import SwapInterRouteNeighborhood, InsertNeighborhood, ReplaceProfitNeighborhood
+from OutputData import Solution, SolutionPool
+
+from reference import evaluated, evaluation, discovered_moves
+
+
+NEIGHBORHOODS = (SwapInterRouteNeighborhood, InsertNeighborhood, ReplaceProfitNeighborhood)
+
+
+def _Moves(neighborhoodClass, data, evaluationLogic, solution, rng, number):
+    neighborhood = neighborhoodClass(data, evaluationLogic, SolutionPool(), rng)
+    return neighborhood, discovered_moves(neighborhood, solution, number)
+
+
+def test_changed_routes_of_a_new_solution(data, evaluationLogic, slackSolution, rng):
+    for neighborhoodClass in NEIGHBORHOODS:
+        neighborhood, moves = _Moves(neighborhoodClass, data, evaluationLogic, slackSolution, rng, 50)
+        assert moves
+
+        for move in moves:
+            newSolution = Solution(neighborhood.constructCompleteRoute(move, slackSolution), data)
+            evaluationLogic.evaluateRoutes(newSolution, move.ChangedRoutes(), slackSolution)
+
+            assert evaluation(newSolution) == evaluation(evaluated(newSolution.RoutePlan, data, evaluationLogic))
+
+
+def test_changed_routes_of_a_solution_changed_in_place(data, evaluationLogic, slackSolution, rng):
+    for neighborhoodClass in NEIGHBORHOODS:
+        solution = slackSolution.Snapshot()
+        _, moves = _Moves(neighborhoodClass, data, evaluationLogic, solution, rng, 1)
+
+        # Apply a chain of moves, every move is discovered on the already changed solution
+        for _ in range(10):
+            if not moves:
+                break
+            moves[0].Apply(solution)
+            evaluationLogic.evaluateRoutes(solution, moves[0].ChangedRoutes())
+
+            assert evaluation(solution) == evaluation(evaluated(solution.RoutePlan, data, evaluationLogic))
+            _, moves = _Moves(neighborhoodClass, data, evaluationLogic, solution, rng, 1)
@@ -0,0 +1,62 @@
+''' Regression tests for the cached cheapest insertions of the Insert neighborhood'''
+
+from Neighborhood import InsertNeighborhood
+from OutputData import SolutionPool
+
+from reference import route_travel_time, route_feasible, discovered_moves
+
+
+def _CheapestInsertion(data, route, task):
+    ''' First position with the minimal extra time among all feasible positions next to a candidate of the task'''
+
+    best = None
+    for index in range(len(route) + 1):
+        predecessor = route[index - 1] if index > 0 else 0
+        successor = route[index] if index < len(route) else 0
+        if predecessor not in data.candidateLists[task] and successor not in data.candidateLists[task]:
+            continue
+
+        changed = route[:index] + [task] + route[index:]
+        extraTime = route_travel_time(data, changed) - route_travel_time(data, route) + data.allTasks[task].service_time
+        if route_feasible(data, changed) and (best is None or extraTime < best[0]):
+            best = (extraTime, index)
+
+    return best
+
+
+def test_cheapest_insertion_matches_brute_force(data, evaluationLogic, solution, slackSolution, rng):
+    found = set()
+    for startSolution in (solution, slackSolution):
+        neighborhood = InsertNeighborhood(data, evaluationLogic, SolutionPool(), rng)
+        neighborhood.Update(startSolution.RoutePlan)
+        tasks = rng.choice(startSolution.UnusedTasks, 40, replace=False).tolist()
+
+        for day, cohorts in startSolution.RoutePlan.items():
+            for cohort, route in enumerate(cohorts):
+                for task in tasks:
+                    expected = _CheapestInsertion(data, route, task)
+                    assert neighborhood.CheapestInsertion(task, day, cohort) == expected
+                    found.add(expected is None)
+
+    assert found == {True, False}
+
+
+def test_cache_is_kept_for_unchanged_routes_only(data, evaluationLogic, slackSolution, rng):
+    solution = slackSolution.Snapshot()
+    neighborhood = InsertNeighborhood(data, evaluationLogic, SolutionPool(), rng)
+    move = discovered_moves(neighborhood, solution, 1)[0]
+    list(neighborhood.Moves)
+    cache = {key: (route, insertions) for key, (route, insertions) in neighborhood.InsertionCache.items()}
+
+    move.Apply(solution)
+    evaluationLogic.evaluateRoutes(solution, move.ChangedRoutes())
+    moves = discovered_moves(neighborhood, solution, None)
+    assert moves
+
+    for key, (route, insertions) in neighborhood.InsertionCache.items():
+        assert route is solution.RoutePlan[key[0]][key[1]]
+        assert (insertions is cache[key][1]) == (key != (move.Day, move.Cohort))
+
+    # The moves of the cached and the recalculated routes are the cheapest insertions into the changed solution
+    for move in moves:
+        assert (move.ExtraTime, move.Index) == _CheapestInsertion(data, solution.RoutePlan[move.Day][move.Cohort], move.Task)
@@ -0,0 +1,31 @@
+''' Regression tests for the optional task block shared by an InstanceFamily'''
+
+import numpy
+
+from InputData import InputData, InstanceFamily
+
+
+def test_family_matrices_match_standalone_instances(tmp_path):
+    family = InstanceFamily(distance_cache_path = str(tmp_path))
+
+    for instance in ("Instance7_2_1.json", "Instance7_5_1.json"):
+        familyData = family.LoadInstance(instance)
+        standalone = InputData(instance, distance_cache_path = None)
+
+        assert numpy.array_equal(familyData.distanceMatrix, standalone.distanceMatrix)
+        assert familyData.candidateLists == standalone.candidateLists
+
+
+def test_family_block_goes_through_the_disk_cache(tmp_path):
+    InstanceFamily(distance_cache_path = str(tmp_path)).LoadInstance("Instance7_2_1.json")
+
+    assert len(list(tmp_path.glob('optional_distances_*.npy'))) == 1
+    assert len(list(tmp_path.glob('distances_*.npy'))) == 1
+
+    # A new family (e.g. another process) maps the cached block for a new instance instead of calculating it
+    family = InstanceFamily(distance_cache_path = str(tmp_path))
+    familyData = family.LoadInstance("Instance7_8_1.json")
+
+    assert isinstance(family._optionalDistanceMatrix, numpy.memmap)
+    assert len(list(tmp_path.glob('optional_distances_*.npy'))) == 1
+    assert numpy.array_equal(familyData.distanceMatrix, InputData("Instance7_8_1.json", distance_cache_path = None).distanceMatrix)
@@ -0,0 +1,50 @@
+''' Regression tests for the Or-opt moves of segments of consecutive optional tasks'''
+
+from Neighborhood import OrOptNeighborhood
+from OutputData import SolutionPool
+
+from reference import route_feasible, discovered_moves, changed_routes, travel_time_delta
+
+
+def _Moves(neighborhood, solution, number):
+    return discovered_moves(neighborhood, solution, number) + [neighborhood.MakeOneMove(solution) for _ in range(number // 10)]
+
+
+def test_moves_are_valid_segment_moves(data, evaluationLogic, slackSolution, rng):
+    neighborhood = OrOptNeighborhood(data, evaluationLogic, SolutionPool(), rng)
+    moves = discovered_moves(neighborhood, slackSolution, None)
+
+    kinds = set()
+    for move in moves:
+        first, last = (move.Segment[-1], move.Segment[0]) if move.Reverse else (move.Segment[0], move.Segment[-1])
+        route = move.RouteB
+        precessor = route[move.indexB - 1] if move.indexB > 0 else 0
+        successor = route[move.indexB] if move.indexB < len(route) else 0
+
+        assert 1 <= len(move.Segment) <= neighborhood.MaxSegmentLength
+        assert all(task <= 1000 for task in move.Segment)
+        assert len(move.Segment) > 1 or not move.Reverse
+        assert precessor in data.candidateLists[first] or successor in data.candidateLists[last]
+        if move.IntraRoute:
+            assert not move.indexA <= move.indexB <= move.indexA + len(move.Segment)
+            assert sorted(move.RouteDayCohortA) == sorted(move.RouteA)
+
+        kinds.add((move.IntraRoute, move.Reverse))
+
+    assert kinds == {(False, False), (False, True), (True, False), (True, True)}
+
+
+def test_delta_and_feasibility_match_full_evaluation(data, evaluationLogic, solution, slackSolution, rng):
+    results = set()
+    for startSolution in (solution, slackSolution):
+        neighborhood = OrOptNeighborhood(data, evaluationLogic, SolutionPool(), rng)
+
+        for move in _Moves(neighborhood, startSolution, 5000):
+            neighborhood.EvaluateMove(move)
+            expected = all(route_feasible(data, route) for route in changed_routes(move))
+
+            assert move.Delta == travel_time_delta(data, neighborhood, move, startSolution)
+            assert neighborhood.MoveFeasibilityCheck(move) == expected
+            results.add((move.IntraRoute, expected))
+
+    assert results == {(False, True), (False, False), (True, True), (True, False)}
@@ -0,0 +1,49 @@
+''' Regression tests for the lazy random enumeration of the neighborhoods'''
+
+import collections
+import itertools
+
+import pytest
+
+from Neighborhood import SwapIntraRouteNeighborhood
+from OutputData import SolutionPool
+
+
+@pytest.fixture
+def neighborhood(data, evaluationLogic, rng):
+    return SwapIntraRouteNeighborhood(data, evaluationLogic, SolutionPool(), rng)
+
+
+@pytest.mark.parametrize('n', [0, 1, 2, 3, 16, 17, 100, 1000])
+def test_random_order_is_a_permutation(neighborhood, n):
+    assert sorted(neighborhood.RandomOrder(n)) == list(range(n))
+
+
+def test_random_order_is_uniform(neighborhood):
+    draws = 24000
+    counts = collections.Counter(tuple(neighborhood.RandomOrder(4)) for _ in range(draws))
+
+    assert len(counts) == 24
+    assert all(abs(count - draws / 24) < 200 for count in counts.values())
+
+
+def test_random_order_differs_between_calls(neighborhood):
+    orders = {tuple(neighborhood.RandomOrder(50)) for _ in range(10)}
+
+    assert len(orders) == 10
+
+
+def test_random_order_can_stop_early(neighborhood):
+    prefix = list(itertools.islice(neighborhood.RandomOrder(10**9), 100))
+
+    assert len(set(prefix)) == 100
+    assert all(0 <= value < 10**9 for value in prefix)
+
+
+def test_random_pairs_and_positions_enumerate_everything(neighborhood):
+    sizes = [0, 1, 2, 5, 7]
+
+    assert sorted(neighborhood.RandomPairs(sizes)) == [(block, i, j) for block, size in enumerate(sizes)
+                                                       for i in range(size) for j in range(i + 1, size)]
+    assert sorted(neighborhood.RandomPositions(sizes)) == [(block, position) for block, size in enumerate(sizes)
+                                                           for position in range(size)]
@@ -0,0 +1,44 @@
+''' Regression tests for the relocation of single tasks between routes'''
+
+from Neighborhood import RelocateInterRouteNeighborhood
+from OutputData import SolutionPool
+
+from reference import route_feasible, discovered_moves, changed_routes, travel_time_delta
+
+
+def _Moves(neighborhood, solution, number):
+    return discovered_moves(neighborhood, solution, number) + [neighborhood.MakeOneMove(solution) for _ in range(number // 10)]
+
+
+def test_moves_relocate_optional_tasks_next_to_candidates(data, evaluationLogic, slackSolution, rng):
+    neighborhood = RelocateInterRouteNeighborhood(data, evaluationLogic, SolutionPool(), rng)
+    moves = discovered_moves(neighborhood, slackSolution, None)
+    assert moves
+
+    keys = set()
+    for move in moves:
+        route = move.RouteB
+        neighbors = {route[move.indexB - 1] if move.indexB > 0 else 0, route[move.indexB] if move.indexB < len(route) else 0}
+
+        assert move.Task <= 1000
+        assert (move.DayA, move.CohortA) != (move.DayB, move.CohortB)
+        assert neighbors & data.candidateLists[move.Task]
+        keys.add((move.DayA, move.CohortA, move.indexA, move.DayB, move.CohortB, move.indexB))
+
+    assert len(keys) == len(moves)
+
+
+def test_delta_and_feasibility_match_full_evaluation(data, evaluationLogic, solution, slackSolution, rng):
+    results = set()
+    for startSolution in (solution, slackSolution):
+        neighborhood = RelocateInterRouteNeighborhood(data, evaluationLogic, SolutionPool(), rng)
+
+        for move in _Moves(neighborhood, startSolution, 3000):
+            neighborhood.EvaluateMove(move)
+            expected = all(route_feasible(data, route) for route in changed_routes(move))
+
+            assert move.Delta == travel_time_delta(data, neighborhood, move, startSolution)
+            assert neighborhood.MoveFeasibilityCheck(move) == expected
+            results.add(expected)
+
+    assert results == {True, False}
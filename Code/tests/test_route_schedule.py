@@ -0,0 +1,42 @@
+''' Regression tests for the O(1) feasibility checks with the cached route schedules'''
+
+import pytest
+
+from Neighborhood import (SwapIntraRouteNeighborhood, SwapInterRouteNeighborhood, TwoEdgeExchangeNeighborhood,
+                          InsertNeighborhood, ReplaceDeltaNeighborhood, ReplaceProfitNeighborhood)
+from OutputData import SolutionPool
+
+from reference import route_feasible, discovered_moves, changed_routes
+
+
+@pytest.mark.parametrize('neighborhoodClass', [SwapIntraRouteNeighborhood, SwapInterRouteNeighborhood, TwoEdgeExchangeNeighborhood,
+                                               InsertNeighborhood, ReplaceDeltaNeighborhood, ReplaceProfitNeighborhood])
+def test_fast_feasibility_matches_full_check(data, evaluationLogic, solution, slackSolution, rng, neighborhoodClass):
+    results = []
+    for startSolution in (solution, slackSolution):
+        neighborhood = neighborhoodClass(data, evaluationLogic, SolutionPool(), rng)
+        for move in discovered_moves(neighborhood, startSolution, 3000):
+            expected = all(route_feasible(data, route) for route in changed_routes(move))
+            assert neighborhood.MoveFeasibilityCheck(move) == expected
+            results.append(expected)
+
+    assert results
+
+
+def test_fast_feasibility_sees_feasible_and_infeasible_moves(data, evaluationLogic, solution, rng):
+    neighborhood = SwapInterRouteNeighborhood(data, evaluationLogic, SolutionPool(), rng)
+    results = {neighborhood.MoveFeasibilityCheck(move) for move in discovered_moves(neighborhood, solution, 3000)}
+
+    assert results == {True, False}
+
+
+def test_schedule_is_rebuilt_for_a_changed_route(data, evaluationLogic, slackSolution, rng):
+    neighborhood = InsertNeighborhood(data, evaluationLogic, SolutionPool(), rng)
+    move = discovered_moves(neighborhood, slackSolution, 1)[0]
+    schedule = neighborhood.GetRouteSchedule(move.Day, move.Cohort)
+
+    solution = slackSolution.Snapshot()
+    move.Apply(solution)
+
+    assert neighborhood.GetRouteSchedule(move.Day, move.Cohort, solution.RoutePlan) is not schedule
+    assert neighborhood.GetRouteSchedule(move.Day, move.Cohort, solution.RoutePlan).Route == move.RouteDayCohort
@@ -0,0 +1,14 @@
+''' Regression tests for the scoreboard built with the spatial grid'''
+
+import pytest
+
+
+@pytest.mark.parametrize('radius, min_profit', [(180, 3), (400, 2)])
+def test_grid_scoreboard_matches_brute_force(data, radius, min_profit):
+    scoreboard = data._CreateScoreboard(radius, min_profit)
+
+    # Baseline: compare every pair of optional tasks
+    for task in data.optionalTasks:
+        expected = [other.no for other in data.optionalTasks
+                    if other.no != task.no and other.profit >= min_profit and data.distances[other.no][task.no] < radius]
+        assert scoreboard[task.no] == expected
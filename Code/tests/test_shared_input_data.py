@@ -0,0 +1,52 @@
+''' Regression tests for publishing InputData in shared memory'''
+
+import concurrent.futures
+
+import numpy
+import pytest
+
+from InputData import SharedInputData
+from EvaluationLogic import EvaluationLogic
+
+from reference import evaluated
+
+
+@pytest.fixture
+def sharedData(data):
+    shared = SharedInputData(data)
+    yield shared
+    shared.Close()
+
+
+def _EvaluateInWorker(handle, routePlan):
+    ''' Worker process: attach to the shared data and evaluate a route plan'''
+    workerData = SharedInputData.Attach(handle)
+    solution = evaluated(routePlan, workerData, EvaluationLogic(workerData))
+    return solution.TotalProfit, solution.WaitingTime, type(workerData.distances[1][2]).__name__
+
+
+def test_attached_data_matches_published_data(data, sharedData, rng):
+    attached = SharedInputData.Attach(sharedData.handle)
+
+    assert numpy.array_equal(attached.distanceMatrix, data.distanceMatrix)
+    assert attached.candidateLists == data.candidateLists
+    assert attached.symmetricDistances == data.symmetricDistances
+    assert (attached.instance_ID, attached.days, attached.cohort_no, attached.maxRouteDuration) == (data.instance_ID, data.days, data.cohort_no, data.maxRouteDuration)
+    assert [task.ID for task in attached.allTasks] == [task.ID for task in data.allTasks]
+    for name, array in data.taskTable.arrays.items():
+        assert numpy.array_equal(attached.taskTable.arrays[name], array)
+
+    # Zero copy, but the lookups are Python ints like in the publishing process
+    assert not attached.distanceMatrix.flags.writeable
+    for task_1, task_2 in rng.integers(len(data.allTasks), size=(1000, 2)).tolist():
+        assert type(attached.distances[task_1][task_2]) is int
+        assert attached.distances[task_1][task_2] == data.distances[task_1][task_2]
+
+
+def test_worker_process_evaluates_like_the_publisher(data, evaluationLogic, sharedData, solution):
+    expected = evaluated(solution.RoutePlan, data, evaluationLogic)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers = 1) as executor:
+        profit, waitingTime, distanceType = executor.submit(_EvaluateInWorker, sharedData.handle, solution.RoutePlan).result()
+
+    assert (profit, waitingTime, distanceType) == (expected.TotalProfit, expected.WaitingTime, 'int')
@@ -0,0 +1,86 @@
+''' Regression tests for the bounded elite solution pool'''
+
+import pytest
+
+from OutputData import Solution, SolutionPool
+
+
+def _Solution(data, routePlanNumber, profit, waitingTime):
+    solution = Solution({0: [[routePlanNumber]]}, data)
+    solution.setTotalProfit(profit)
+    solution.setWaitingTime(waitingTime)
+    return solution
+
+
+def _ExpectedPool(solutions, maxSize):
+    ''' Pool simulated with full route plan comparisons and sorting instead of hashes and the heap'''
+
+    pool = []
+    for number, solution in enumerate(solutions):
+        rank = (solution.TotalProfit, solution.WaitingTime)
+        if any(pooled.RoutePlan == solution.RoutePlan for _, pooled in pool):
+            continue
+        if len(pool) >= maxSize and rank <= min((pooled.TotalProfit, pooled.WaitingTime) for _, pooled in pool):
+            continue
+
+        pool.append((number, solution))
+        if len(pool) > maxSize:
+            pool.remove(min(pool, key=lambda entry: (entry[1].TotalProfit, entry[1].WaitingTime, entry[0])))
+
+    return [solution for _, solution in pool]
+
+
+def _Solutions(data, rng, number):
+    # Few distinct route plans and ranks, so there are many duplicates and ties
+    return [_Solution(data, int(rng.integers(60)), int(rng.integers(10)), int(rng.integers(3))) for _ in range(number)]
+
+
+@pytest.mark.parametrize('maxSize', [1, 5, 20])
+def test_pool_keeps_the_best_distinct_solutions(data, rng, maxSize):
+    solutions = _Solutions(data, rng, 500)
+    solutionPool = SolutionPool(maxSize)
+    for solution in solutions:
+        solutionPool.AddSolution(solution)
+
+    expected = _ExpectedPool(solutions, maxSize)
+    best = max(expected, key=lambda solution: (solution.TotalProfit, solution.WaitingTime))
+
+    assert len(solutionPool.Solutions) == maxSize
+    assert {id(solution) for solution in solutionPool.Solutions} == {id(solution) for solution in expected}
+    assert solutionPool.GetHighestProfitSolution() is best
+    assert solutionPool.GetHighestWaitingTimeSolution().WaitingTime == max(solution.WaitingTime for solution in expected)
+
+
+def test_duplicates_are_rejected(data):
+    solutionPool = SolutionPool()
+    solutionPool.AddSolution(_Solution(data, 7, 10, 1))
+    solutionPool.AddSolution(_Solution(data, 7, 10, 1))
+    solutionPool.AddSolution(_Solution(data, 8, 10, 1))
+
+    assert sorted(solution.RoutePlan[0][0][0] for solution in solutionPool.Solutions) == [7, 8]
+
+
+def test_hash_collisions_compare_the_route_plans(data, rng, monkeypatch):
+    monkeypatch.setattr(Solution, 'RoutePlanHash', property(lambda solution: 0))
+    solutions = _Solutions(data, rng, 500)
+    solutionPool = SolutionPool(20)
+    for solution in solutions:
+        solutionPool.AddSolution(solution)
+
+    assert {id(solution) for solution in solutionPool.Solutions} == {id(solution) for solution in _ExpectedPool(solutions, 20)}
+    # Evicted solutions are removed from the buckets of their hash
+    assert {id(solution) for solution in solutionPool._byHash[0]} == {id(solution) for solution in solutionPool.Solutions}
+
+
+def test_pool_stores_only_the_hash_of_the_route_plans(data, rng):
+    solutionPool = SolutionPool(10)
+    for solution in _Solutions(data, rng, 100):
+        solutionPool.AddSolution(solution)
+
+    assert all(isinstance(entry[3], int) for entry in solutionPool._heap)
+    assert sum(len(bucket) for bucket in solutionPool._byHash.values()) == len(solutionPool.Solutions)
+
+
+def test_pool_needs_space(data):
+    with pytest.raises(Exception):
+        SolutionPool(0)
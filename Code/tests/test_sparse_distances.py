@@ -0,0 +1,45 @@
+''' Regression tests for the sparse k-nearest-neighbour travel times'''
+
+import numpy
+import pytest
+
+from InputData import InputData, SparseDistances
+from EvaluationLogic import EvaluationLogic
+
+from conftest import INSTANCE
+from reference import evaluated
+
+
+@pytest.fixture(scope='module')
+def sparseData() -> InputData:
+    return InputData(INSTANCE, distance_cache_path = None, sparse_neighbors = 20)
+
+
+def test_sparse_lookups_match_dense_matrix(data, sparseData, rng):
+    pairs = rng.integers(len(data.allTasks), size=(5000, 2)).tolist()
+    # Also every stored neighbour pair of some tasks
+    pairs += [(task, neighbor) for task in range(0, len(data.allTasks), 97) for neighbor in sparseData.distances.neighbors[task].tolist()]
+
+    for task_1, task_2 in pairs:
+        assert sparseData.distances[task_1][task_2] == data.distanceMatrix[task_1, task_2]
+
+
+def test_neighbors_are_the_nearest_tasks(data):
+    sparse = SparseDistances(data.allTasks, k_neighbors = 10, chunk_size = 100)
+
+    for task in range(0, len(data.allTasks), 13):
+        neighbors = sparse.neighbors[task].tolist()
+        times = sparse.neighborTimes[task].tolist()
+        others = numpy.delete(data.distanceMatrix[task], [task] + neighbors)
+
+        assert task not in neighbors
+        assert times == sorted(times)
+        assert times == [data.distanceMatrix[task, neighbor] for neighbor in neighbors]
+        assert times[-1] <= others.min()
+
+
+def test_sparse_evaluation_matches_dense_evaluation(data, sparseData, evaluationLogic, solution):
+    dense = evaluated(solution.RoutePlan, data, evaluationLogic)
+    sparse = evaluated(solution.RoutePlan, sparseData, EvaluationLogic(sparseData))
+
+    assert (sparse.TotalProfit, sparse.TotalTasks, sparse.WaitingTime) == (dense.TotalProfit, dense.TotalTasks, dense.WaitingTime)
@@ -0,0 +1,69 @@
+''' Regression tests for the lazily calculated start and end times of a solution'''
+
+import json
+
+from Neighborhood import InsertNeighborhood
+from OutputData import Solution, SolutionPool
+
+from reference import discovered_moves, evaluated
+
+
+def _StartEndTimes(data, routePlan):
+    ''' Start and end times of all tasks calculated eagerly, like the solution did in its constructor'''
+
+    startTimes, endTimes = {}, {}
+    for day, cohorts in enumerate(routePlan.values()):
+        routes = [route for route in cohorts if route]
+        if not routes:
+            continue
+
+        startTimes[day], endTimes[day] = [], []
+        for route in routes:
+            starts, ends = [0], [0]
+            for previous, task in zip(route, route[1:]):
+                start = data.allTasks[task].start_time if task > 1000 else data.distances[previous][task] + ends[-1]
+                starts.append(start)
+                ends.append(start + data.allTasks[task].service_time)
+
+            startTimes[day].append(starts)
+            endTimes[day].append(ends)
+
+    return startTimes, endTimes
+
+
+def test_times_are_only_calculated_on_access(data, solution):
+    newSolution = Solution(solution.RoutePlan, data)
+
+    assert newSolution._startTimes is None and newSolution._endTimes is None
+    assert (newSolution.StartTimes, newSolution.EndTimes) == _StartEndTimes(data, solution.RoutePlan)
+
+
+def test_times_follow_moves_applied_in_place(data, evaluationLogic, slackSolution, rng):
+    solution = slackSolution.Snapshot()
+    assert (solution.StartTimes, solution.EndTimes) == _StartEndTimes(data, solution.RoutePlan)
+    routePlanHash = solution.RoutePlanHash
+
+    neighborhood = InsertNeighborhood(data, evaluationLogic, SolutionPool(), rng)
+    move = discovered_moves(neighborhood, solution, 1)[0]
+    move.Apply(solution)
+    evaluationLogic.evaluateRoutes(solution, move.ChangedRoutes())
+
+    assert (solution.StartTimes, solution.EndTimes) == _StartEndTimes(data, solution.RoutePlan)
+    assert solution.RoutePlanHash != routePlanHash
+
+
+def test_times_follow_a_new_route_plan(data, solution, slackSolution):
+    assert solution.StartTimes != _StartEndTimes(data, slackSolution.RoutePlan)[0]
+
+    solution.setRoutePlan(slackSolution.RoutePlan, data)
+
+    assert (solution.StartTimes, solution.EndTimes) == _StartEndTimes(data, slackSolution.RoutePlan)
+
+
+def test_json_of_a_changed_solution(data, evaluationLogic, slackSolution, tmp_path):
+    slackSolution.WriteSolToJson(str(tmp_path), data, main_tasks = True)
+    results = json.loads(next(tmp_path.iterdir()).read_text())
+
+    assert results['Objective'] == slackSolution.TotalProfit == evaluated(slackSolution.RoutePlan, data, evaluationLogic).TotalProfit
+    assert results['NumberOfAllTasks'] == slackSolution.TotalTasks
+    assert [len(cohort['Route']) for cohort in results['Days']['1']] == [len(route) for route in slackSolution.RoutePlan[0] if route]
@@ -0,0 +1,86 @@
+''' Regression tests for the exhaustive, candidate-pruned SwapInterRoute neighborhood'''
+
+import numpy
+import pytest
+
+from ImprovementAlgorithm import IterativeImprovement
+from Neighborhood import SwapInterRouteNeighborhood
+from OutputData import SolutionPool
+
+from reference import route_feasible, discovered_moves, changed_routes, travel_time_delta
+
+
+def _Neighbors(route, index):
+    return route[index - 1] if index > 0 else 0, route[index + 1] if index + 1 < len(route) else 0
+
+
+def test_moves_are_the_candidate_pairs(data, evaluationLogic, slackSolution, rng):
+    neighborhood = SwapInterRouteNeighborhood(data, evaluationLogic, SolutionPool(), rng, exhaustive = True)
+    moves = discovered_moves(neighborhood, slackSolution, None)
+
+    routed = [(task, day, cohort, index) for day, cohorts in slackSolution.RoutePlan.items() for cohort, route in enumerate(cohorts)
+              for index, task in enumerate(route) if task <= 1000]
+    serviceTimes = {task.no: task.service_time for task in data.allTasks}
+    waitingTimes = slackSolution.WaitingTimes
+
+    def fits(task, day, cohort, index, other):
+        # The other task is a candidate of a neighbour of the position of the task
+        return any(other in data.candidateLists[neighbor] for neighbor in _Neighbors(slackSolution.RoutePlan[day][cohort], index))
+
+    expected = set()
+    for taskA, dayA, cohortA, indexA in routed:
+        for taskB, dayB, cohortB, indexB in routed:
+            if taskA >= taskB or (dayA, cohortA) == (dayB, cohortB):
+                continue
+            if not (fits(taskA, dayA, cohortA, indexA, taskB) or fits(taskB, dayB, cohortB, indexB, taskA)):
+                continue
+            if waitingTimes[dayA, cohortA] < serviceTimes[taskB] - serviceTimes[taskA] or waitingTimes[dayB, cohortB] < serviceTimes[taskA] - serviceTimes[taskB]:
+                continue
+            expected.add((taskA, taskB))
+
+    assert expected
+    assert sorted(tuple(sorted((move.TaskA, move.TaskB))) for move in moves) == sorted(expected)
+
+
+def test_delta_and_feasibility_match_full_evaluation(data, evaluationLogic, solution, slackSolution, rng):
+    results = set()
+    for startSolution in (solution, slackSolution):
+        neighborhood = SwapInterRouteNeighborhood(data, evaluationLogic, SolutionPool(), rng, exhaustive = True)
+
+        for move in discovered_moves(neighborhood, startSolution, None):
+            neighborhood.EvaluateMove(move)
+            expected = all(route_feasible(data, route) for route in changed_routes(move))
+
+            assert move.Delta == travel_time_delta(data, neighborhood, move, startSolution)
+            assert neighborhood.MoveFeasibilityCheck(move) == expected
+            results.add(expected)
+
+    assert results == {True, False}
+
+
+def _BestFeasibleDelta(neighborhood, solution):
+    deltas = []
+    for move in discovered_moves(neighborhood, solution, None):
+        if neighborhood.MoveFeasibilityCheck(move):
+            neighborhood.EvaluateMove(move)
+            deltas.append(move.Delta)
+
+    return min(deltas)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_exhaustive_move_is_at_least_as_good_as_sampled_move(data, evaluationLogic, slackSolution, seed):
+    rng = numpy.random.default_rng(seed)
+    exhaustive = SwapInterRouteNeighborhood(data, evaluationLogic, SolutionPool(), rng, exhaustive = True)
+    sampled = SwapInterRouteNeighborhood(data, evaluationLogic, SolutionPool(), rng)
+
+    assert _BestFeasibleDelta(exhaustive, slackSolution) <= _BestFeasibleDelta(sampled, slackSolution)
+
+
+def test_neighborhood_type_is_registered(data, evaluationLogic, rng):
+    localSearch = IterativeImprovement(inputData = data, neighborhoodTypes = ['SwapInterRouteExhaustive'])
+    localSearch.Initialize(evaluationLogic, SolutionPool(), rng)
+    neighborhood = localSearch.CreateNeighborhood('SwapInterRouteExhaustive')
+
+    assert isinstance(neighborhood, SwapInterRouteNeighborhood)
+    assert neighborhood.Exhaustive and neighborhood.Type == 'SwapInterRouteExhaustive'
@@ -0,0 +1,46 @@
+''' Regression tests for the position-based intra-route swaps and their pruning by waiting time'''
+
+import itertools
+
+from Neighborhood import SwapIntraRouteNeighborhood
+from OutputData import SolutionPool
+
+from reference import route_travel_time, route_feasible, discovered_moves
+
+
+def _Swapped(route, indexA, indexB):
+    swapped = route.copy()
+    swapped[indexA], swapped[indexB] = swapped[indexB], swapped[indexA]
+    return swapped
+
+
+def test_delta_matches_travel_time_difference(data, evaluationLogic, solution):
+    for route in (route for cohorts in solution.RoutePlan.values() for route in cohorts):
+        optional = [index for index, task in enumerate(route) if task <= 1000]
+
+        for indexA, indexB in itertools.permutations(optional, 2):
+            expected = route_travel_time(data, _Swapped(route, indexA, indexB)) - route_travel_time(data, route)
+            assert evaluationLogic.SwapIntraRouteDelta(route, indexA, indexB) == expected
+
+
+def test_only_infeasible_swaps_are_pruned(data, evaluationLogic, solution, slackSolution, rng):
+    pruned = 0
+    for startSolution in (solution, slackSolution):
+        neighborhood = SwapIntraRouteNeighborhood(data, evaluationLogic, SolutionPool(), rng)
+        moves = discovered_moves(neighborhood, startSolution, None)
+        kept = {(move.Day, move.Cohort, move.indexA, move.indexB): move.Delta for move in moves}
+        assert len(kept) == len(moves)
+
+        for day, cohorts in startSolution.RoutePlan.items():
+            for cohort, route in enumerate(cohorts):
+                optional = [index for index, task in enumerate(route) if task <= 1000]
+
+                for indexA, indexB in itertools.combinations(optional, 2):
+                    swapped = _Swapped(route, indexA, indexB)
+                    if (day, cohort, indexA, indexB) in kept:
+                        assert kept[(day, cohort, indexA, indexB)] == route_travel_time(data, swapped) - route_travel_time(data, route)
+                    else:
+                        assert not route_feasible(data, swapped)
+                        pruned += 1
+
+    assert pruned > 0
@@ -0,0 +1,15 @@
+''' Regression tests for the struct of arrays with the task attributes'''
+
+from InputData import MainTask
+
+
+def test_task_table_matches_task_objects(data):
+    table = data.taskTable
+
+    for task in data.allTasks:
+        assert table.profit[task.no] == task.profit
+        assert table.service_time[task.no] == task.service_time
+        assert table.start_time[task.no] == task.start_time
+        assert table.end_time[task.no] == task.end_time
+        assert table.is_main[task.no] == isinstance(task, MainTask)
+        assert table.day[task.no] == (task.day if isinstance(task, MainTask) else 0)
@@ -0,0 +1,50 @@
+''' Regression tests for the O(1) edge exchange delta of the 2-opt moves'''
+
+import itertools
+
+import pytest
+
+from InputData import InputData
+from EvaluationLogic import EvaluationLogic
+from Neighborhood import TwoEdgeExchangeNeighborhood, TwoEdgeExchangeMove
+from OutputData import SolutionPool
+
+from conftest import INSTANCE
+from reference import route_travel_time, route_feasible
+
+
+def _Moves(solution):
+    ''' All 2-opt moves between two optional tasks of a route, with the segment ends in both orders'''
+
+    for day, cohorts in solution.RoutePlan.items():
+        for cohort, route in enumerate(cohorts):
+            optional = [index for index, task in enumerate(route) if task <= 1000]
+            for indexA, indexB in itertools.permutations(optional, 2):
+                yield TwoEdgeExchangeMove(route, solution.WaitingTimes[day, cohort], day, cohort, route[indexA], route[indexB], indexA, indexB)
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_delta_matches_travel_time_difference(data, solution, rng, sparse):
+    inputData = InputData(INSTANCE, distance_cache_path = None, sparse_neighbors = 20) if sparse else data
+    neighborhood = TwoEdgeExchangeNeighborhood(inputData, EvaluationLogic(inputData), SolutionPool(), rng)
+    assert neighborhood.EvaluationLogic.SymmetricDistances
+
+    for move in _Moves(solution):
+        expected = route_travel_time(data, move.RouteDayCohort) - route_travel_time(data, move.Route)
+
+        assert neighborhood.CalculateDelta(move) == expected
+        assert neighborhood.EvaluationLogic.WaitingTimeDifferenceOneRoute(move) == expected
+
+
+def test_feasibility_with_both_index_orders(data, evaluationLogic, solution, slackSolution, rng):
+    results = set()
+    for startSolution in (solution, slackSolution):
+        neighborhood = TwoEdgeExchangeNeighborhood(data, evaluationLogic, SolutionPool(), rng)
+        neighborhood.Update(startSolution.RoutePlan)
+
+        for move in _Moves(startSolution):
+            expected = route_feasible(data, move.RouteDayCohort)
+            assert neighborhood.MoveFeasibilityCheck(move) == expected
+            results.add(expected)
+
+    assert results == {True, False}
@@ -0,0 +1,40 @@
+''' Regression tests for the tail exchanges (2-opt*) between two routes of the same day'''
+
+from Neighborhood import TwoOptStarNeighborhood
+from OutputData import SolutionPool
+
+from reference import route_feasible, discovered_moves, changed_routes, travel_time_delta
+
+
+def _Moves(neighborhood, solution, number):
+    return discovered_moves(neighborhood, solution, number) + [neighborhood.MakeOneMove(solution) for _ in range(number // 10)]
+
+
+def test_main_tasks_stay_with_their_cohort(data, evaluationLogic, slackSolution, rng):
+    neighborhood = TwoOptStarNeighborhood(data, evaluationLogic, SolutionPool(), rng)
+    moves = discovered_moves(neighborhood, slackSolution, 3000)
+    assert moves
+
+    for move in moves:
+        assert (move.indexA, move.indexB) != (len(move.RouteA), len(move.RouteB))
+
+    for move in moves + [neighborhood.MakeOneMove(slackSolution) for _ in range(300)]:
+        assert move.CohortA != move.CohortB
+        assert [task for task in move.RouteDayCohortA if task > 1000] == [task for task in move.RouteA if task > 1000]
+        assert [task for task in move.RouteDayCohortB if task > 1000] == [task for task in move.RouteB if task > 1000]
+
+
+def test_delta_and_feasibility_match_full_evaluation(data, evaluationLogic, solution, slackSolution, rng):
+    results = set()
+    for startSolution in (solution, slackSolution):
+        neighborhood = TwoOptStarNeighborhood(data, evaluationLogic, SolutionPool(), rng)
+
+        for move in _Moves(neighborhood, startSolution, 3000):
+            neighborhood.EvaluateMove(move)
+            expected = all(route_feasible(data, route) for route in changed_routes(move))
+
+            assert move.Delta == travel_time_delta(data, neighborhood, move, startSolution)
+            assert neighborhood.MoveFeasibilityCheck(move) == expected
+            results.add(expected)
+
+    assert results == {True, False}
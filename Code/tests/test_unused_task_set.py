@@ -0,0 +1,69 @@
+''' Regression tests for the unused tasks indexed by profit and service time'''
+
+import pytest
+
+from Neighborhood import ReplaceDeltaNeighborhood
+from OutputData import SolutionPool, UnusedTaskSet
+
+
+def _Within(data, tasks, minProfit, maxServiceTime):
+    return sorted(task for task in tasks if data.allTasks[task].profit >= minProfit and data.allTasks[task].service_time <= maxServiceTime)
+
+
+def test_within_matches_brute_force_after_adds_and_removes(data, solution, rng):
+    unused = set(solution.UnusedTasks)
+    unusedTasks = UnusedTaskSet(list(unused), data)
+    routed = [task for cohorts in solution.RoutePlan.values() for route in cohorts for task in route if task <= 1000]
+    profits = sorted({task.profit for task in data.allTasks})
+    serviceTimes = [task.service_time for task in data.allTasks]
+
+    for step in range(300):
+        if step % 2 == 0 and routed:
+            task = routed.pop(int(rng.integers(len(routed))))
+            unusedTasks.Add(task)
+            unused.add(task)
+        else:
+            task = list(unused)[int(rng.integers(len(unused)))]
+            unusedTasks.Remove(task)
+            unused.discard(task)
+
+        assert len(unusedTasks) == len(unused) and set(unusedTasks.Tasks) == unused
+        assert task in unusedTasks if task in unused else task not in unusedTasks
+
+        minProfit = profits[int(rng.integers(len(profits)))]
+        maxServiceTime = int(rng.integers(min(serviceTimes), max(serviceTimes) + 1))
+        assert sorted(unusedTasks.Within(minProfit, maxServiceTime)) == _Within(data, unused, minProfit, maxServiceTime)
+
+
+def test_adding_an_unused_task_twice_is_ignored(data, solution):
+    unusedTasks = UnusedTaskSet(solution.UnusedTasks, data)
+    task = solution.UnusedTasks[0]
+    unusedTasks.Add(task)
+
+    assert len(unusedTasks) == len(solution.UnusedTasks)
+    assert sorted(unusedTasks.Within(0, 10**9)) == sorted(solution.UnusedTasks)
+
+
+@pytest.mark.parametrize('allowEqualProfit', [True, False])
+@pytest.mark.parametrize('sampleSize', [None, 50])
+def test_replace_moves_match_brute_force(data, evaluationLogic, slackSolution, rng, allowEqualProfit, sampleSize):
+    neighborhood = ReplaceDeltaNeighborhood(data, evaluationLogic, SolutionPool(), rng)
+    neighborhood.Update(slackSolution.RoutePlan)
+    sample = None if sampleSize is None else set(rng.choice(slackSolution.UnusedTasks, sampleSize, replace=False).tolist())
+    moves = list(neighborhood.GenerateReplaceMoves(slackSolution, allowEqualProfit, sample))
+
+    expected = []
+    for day, cohorts in slackSolution.RoutePlan.items():
+        for cohort, route in enumerate(cohorts):
+            for index, taskInRoute in enumerate(route):
+                if taskInRoute > 1000:
+                    continue
+                neighbors = {route[index - 1] if index > 0 else 0, route[index + 1] if index + 1 < len(route) else 0}
+                minProfit = data.allTasks[taskInRoute].profit + (0 if allowEqualProfit else 1)
+                maxServiceTime = slackSolution.WaitingTimes[day, cohort] + data.allTasks[taskInRoute].service_time
+                for unusedTask in _Within(data, slackSolution.UnusedTasks if sample is None else sample, minProfit, maxServiceTime):
+                    if neighbors & data.candidateLists[unusedTask]:
+                        expected.append((day, cohort, index, unusedTask))
+
+    assert expected
+    assert sorted((move.Day, move.Cohort, move.indexInRoute, move.UnusedTask) for move in moves) == sorted(expected)
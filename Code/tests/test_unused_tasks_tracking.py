@@ -0,0 +1,39 @@
+''' Regression tests for the unused tasks kept up to date by the moves'''
+
+import pytest
+
+from Neighborhood import InsertNeighborhood, ReplaceProfitNeighborhood, ReplaceDeltaNeighborhood, SwapInterRouteNeighborhood
+from OutputData import SolutionPool
+
+from reference import unused_tasks, evaluated, evaluation
+
+
+@pytest.mark.parametrize('neighborhoodClass', [InsertNeighborhood, ReplaceProfitNeighborhood, ReplaceDeltaNeighborhood, SwapInterRouteNeighborhood])
+@pytest.mark.parametrize('strategy', ['BestImprovement', 'FirstImprovement'])
+def test_unused_tasks_after_local_search(data, evaluationLogic, slackSolution, rng, neighborhoodClass, strategy):
+    solutionPool = SolutionPool()
+    neighborhood = neighborhoodClass(data, evaluationLogic, solutionPool, rng)
+    startSolution = slackSolution.Snapshot()
+    startPlan = unused_tasks(startSolution.RoutePlan, data)
+
+    result = neighborhood.LocalSearch(strategy, startSolution)
+
+    assert set(result.UnusedTasks) == unused_tasks(result.RoutePlan, data)
+    assert evaluation(result) == evaluation(evaluated(result.RoutePlan, data, evaluationLogic))
+
+    assert solutionPool.Solutions
+
+    # Solutions which handed their unused tasks over recreate them from their own route plan
+    assert set(startSolution.UnusedTasks) == startPlan
+    for pooled in solutionPool.Solutions:
+        assert set(pooled.UnusedTasks) == unused_tasks(pooled.RoutePlan, data)
+
+
+def test_release_hands_the_unused_tasks_over(data, solution):
+    unusedTasks = solution.UnusedTaskSet
+    released = solution.ReleaseUnusedTasks()
+    released.Add(next(task for task in solution.RoutePlan[0][0] if task <= 1000))
+
+    assert released is unusedTasks
+    assert solution.UnusedTaskSet is not released
+    assert set(solution.UnusedTasks) == unused_tasks(solution.RoutePlan, data)
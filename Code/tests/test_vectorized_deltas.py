@@ -0,0 +1,61 @@
+''' Regression tests for the vectorized swap and 2-opt deltas of a whole route'''
+
+import itertools
+
+import pytest
+
+from Neighborhood import SwapIntraRouteNeighborhood, TwoEdgeExchangeNeighborhood, SwapIntraRouteMove, TwoEdgeExchangeMove
+from OutputData import SolutionPool
+
+from reference import route_travel_time, discovered_moves
+
+
+def _Routes(solution):
+    return [(day, cohort, route) for day, cohorts in solution.RoutePlan.items() for cohort, route in enumerate(cohorts)]
+
+
+def _OptionalPairs(route):
+    return list(itertools.combinations([index for index, task in enumerate(route) if task <= 1000], 2))
+
+
+@pytest.mark.parametrize('kernel, moveClass', [('CalculateSwapIntraRouteDeltas', SwapIntraRouteMove),
+                                               ('CalculateTwoEdgeExchangeDeltas', TwoEdgeExchangeMove)])
+def test_deltas_match_travel_time_difference(data, evaluationLogic, solution, kernel, moveClass):
+    assert evaluationLogic.SupportsVectorizedDeltas
+
+    for day, cohort, route in _Routes(solution):
+        indicesA, indicesB, deltas = getattr(evaluationLogic, kernel)(route)
+        pairs = list(zip(indicesA.tolist(), indicesB.tolist()))
+        assert sorted(pairs) == _OptionalPairs(route)
+
+        for (indexA, indexB), delta in zip(pairs, deltas.tolist()):
+            if moveClass is SwapIntraRouteMove:
+                move = SwapIntraRouteMove(route, day, cohort, route[indexA], route[indexB], indexA, indexB)
+            else:
+                move = TwoEdgeExchangeMove(route, 0, day, cohort, route[indexA], route[indexB], indexA, indexB)
+
+            assert delta == route_travel_time(data, move.RouteDayCohort) - route_travel_time(data, route)
+
+
+@pytest.mark.parametrize('neighborhoodClass', [SwapIntraRouteNeighborhood, TwoEdgeExchangeNeighborhood])
+def test_best_improvement_keeps_exactly_the_improving_moves(data, evaluationLogic, slackSolution, rng, neighborhoodClass):
+    neighborhood = neighborhoodClass(data, evaluationLogic, SolutionPool(), rng)
+    discovered_moves(neighborhood, slackSolution, 0)
+    neighborhood.EvaluateMovesBestImprovement()
+
+    kept = {(move.Day, move.Cohort, move.indexA, move.indexB): move.Delta for move in neighborhood.MoveSolutions}
+    expected = {}
+    for day, cohort, route in _Routes(slackSolution):
+        for indexA, indexB in _OptionalPairs(route):
+            if neighborhoodClass is SwapIntraRouteNeighborhood:
+                changed = route.copy()
+                changed[indexA], changed[indexB] = changed[indexB], changed[indexA]
+            else:
+                changed = route[:indexA] + route[indexA:indexB + 1][::-1] + route[indexB + 1:]
+
+            delta = route_travel_time(data, changed) - route_travel_time(data, route)
+            if delta < 0:
+                expected[(day, cohort, indexA, indexB)] = delta
+
+    assert expected
+    assert kept == expected